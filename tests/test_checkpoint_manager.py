@@ -0,0 +1,77 @@
+"""
+CheckpointManager 测试
+
+任务日志由后台线程逐条追加，中断后可恢复已完成任务
+"""
+
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ue5_kb.utils.checkpoint_manager import CheckpointManager
+
+
+class TestCheckpointManager:
+    def test_resume_completed_tasks(self, tmp_path):
+        manager = CheckpointManager(tmp_path, "analyze")
+        manager.save_completed("Core", {"classes_count": 2, "functions_count": 5})
+        manager.save_completed("Engine", {"classes_count": 1})
+        manager.save_failed("Broken", "boom", "ValueError")
+        manager.close()
+
+        restored = CheckpointManager(tmp_path, "analyze")
+        assert restored.get_completed_tasks() == {"Core", "Engine"}
+        assert restored.get_failed_tasks() == [
+            {"task_id": "Broken", "error": "boom", "error_type": "ValueError"}
+        ]
+        assert restored.load()["results"]["Core"]["summary"] == {
+            "classes": 2, "functions": 5, "files": 0
+        }
+
+    def test_truncated_last_line_ignored(self, tmp_path):
+        manager = CheckpointManager(tmp_path, "analyze")
+        manager.save_completed("Core", {})
+        manager.flush()
+        with open(manager.journal_file, "ab") as f:
+            f.write(b'{"task_id": "Eng')
+
+        assert manager.get_completed_tasks() == {"Core"}
+
+    def test_legacy_checkpoint_merged(self, tmp_path):
+        manager = CheckpointManager(tmp_path, "analyze")
+        manager.checkpoint_file.write_text(json.dumps({
+            "completed": ["Core"], "failed": [],
+            "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00",
+        }), encoding="utf-8")
+        manager.save_completed("Engine", {})
+
+        assert manager.get_completed_tasks() == {"Core", "Engine"}
+        assert manager.load()["created_at"] == "2024-01-01T00:00:00"
+
+        manager.clear()
+        assert manager.get_completed_tasks() == set()
+
+    def test_many_records_written_in_order(self, tmp_path):
+        manager = CheckpointManager(tmp_path, "analyze")
+        for i in range(100):
+            manager.save_completed(f"Module{i}", {})
+        manager.close()
+        manager.close()
+
+        lines = manager.journal_file.read_bytes().splitlines()
+        assert [json.loads(line)["task_id"] for line in lines] == [f"Module{i}" for i in range(100)]
+
+    def test_writer_error_raised_to_caller(self, tmp_path, monkeypatch):
+        def fail_fsync(fd):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "fsync", fail_fsync)
+        manager = CheckpointManager(tmp_path, "analyze")
+        manager.save_completed("Module1", {})
+        with pytest.raises(OSError, match="disk full"):
+            manager.flush()
+        manager.close()
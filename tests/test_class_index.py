@@ -0,0 +1,216 @@
+"""
+ClassIndex 测试
+
+批量写入、查询以及二级索引的延迟创建
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ue5_kb.core.class_index import ClassIndex
+
+
+def _index_names(idx):
+    rows = idx.conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+class TestClassIndex:
+    def _sample(self):
+        return [
+            {'name': 'AActor', 'module': 'Engine', 'parent_classes': ['UObject'],
+             'interfaces': ['INetworkPredictionInterface', 'IActorInterface'],
+             'is_uclass': True, 'is_blueprintable': True, 'file_path': 'Actor.h', 'line_number': 10},
+            {'name': 'APawn', 'module': 'Engine', 'parent_classes': ['AActor'],
+             'is_uclass': True, 'file_path': 'Pawn.h', 'line_number': 20},
+            {'name': 'FVector', 'module': 'Core', 'is_struct': True,
+             'file_path': 'Vector.h', 'line_number': 5},
+        ]
+
+    def test_batch_and_queries(self, tmp_path):
+        idx = ClassIndex(str(tmp_path / "class_index.db"))
+        idx.add_classes_batch(self._sample())
+
+        assert [c['name'] for c in idx.query_by_name('AActor')] == ['AActor']
+        assert idx.query_by_name('AActor')[0]['parent_classes'] == ['UObject']
+        # 接口列表保持声明顺序
+        assert idx.query_by_name('AActor')[0]['interfaces'] == [
+            'INetworkPredictionInterface', 'IActorInterface'
+        ]
+        assert idx.query_by_name('FVector')[0]['interfaces'] == []
+        assert [c['name'] for c in idx.query_by_parent('AActor')] == ['APawn']
+        assert {c['name'] for c in idx.search_by_keyword('Pawn')} == {'APawn'}
+        assert {c['name'] for c in idx.search_by_keyword('actor')} == {'AActor'}
+        # 少于 3 个字符的关键字不走 trigram 全文索引
+        assert {c['name'] for c in idx.search_by_keyword('Pa')} == {'APawn'}
+        assert {c['name'] for c in idx.query_by_module('Engine')} == {'AActor', 'APawn'}
+        assert [c['name'] for c in idx.query_blueprintable()] == ['AActor']
+
+        stats = idx.get_statistics()
+        assert stats['total_classes'] == 3
+        assert stats['uclass_count'] == 2
+        assert stats['struct_count'] == 1
+        assert stats['blueprintable_count'] == 1
+        assert stats['top_modules'][0] == {'module': 'Engine', 'count': 2}
+        idx.close()
+
+    def test_indexes_created_after_load(self, tmp_path):
+        db_path = tmp_path / "class_index.db"
+        idx = ClassIndex(str(db_path))
+        idx.add_classes_batch(self._sample())
+        assert _index_names(idx) == set()
+
+        idx.create_indexes()
+        assert 'idx_class_name' in _index_names(idx)
+        # create_indexes 之后已有规划器统计信息
+        assert idx.conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        idx.close()
+
+        reopened = ClassIndex(str(db_path))
+        assert reopened._indexes_built
+        reopened.close()
+
+    def test_query_does_not_build_indexes(self, tmp_path):
+        idx = ClassIndex(str(tmp_path / "class_index.db"))
+        idx.add_classes_batch(self._sample())
+
+        # 查询路径从不写入：未建索引时查询仍可用，关键字搜索直接 LIKE
+        assert len(idx.query_by_name('FVector')) == 1
+        assert {c['name'] for c in idx.search_by_keyword('Pawn')} == {'APawn'}
+        assert _index_names(idx) == set()
+        assert not idx._indexes_built
+        idx.close()
+
+    def test_legacy_db_indexed_at_open_and_queried_from_thread(self, tmp_path):
+        db_path = tmp_path / "class_index.db"
+        idx = ClassIndex(str(db_path))
+        idx.add_classes_batch(self._sample())
+        idx.create_indexes()
+        # 模拟旧版本的库：已有索引但没有 indexes_built 标记
+        idx.conn.execute("DELETE FROM meta WHERE key = 'indexes_built'")
+        idx.close()
+
+        reopened = ClassIndex(str(db_path))
+        assert reopened._indexes_built
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            parents = pool.submit(reopened.query_by_parent, 'AActor').result()
+            found = pool.submit(reopened.search_by_keyword, 'Pawn').result()
+        assert [c['name'] for c in parents] == ['APawn']
+        assert [c['name'] for c in found] == ['APawn']
+        reopened.close()
+
+    def test_query_by_parent_exact_and_after_replace(self, tmp_path):
+        idx = ClassIndex(str(tmp_path / "class_index.db"))
+        idx.add_classes_batch(self._sample() + [
+            {'name': 'AActorSub', 'module': 'Game', 'parent_classes': ['AActorBase'],
+             'file_path': 'Sub.h', 'line_number': 1},
+        ])
+        assert [c['name'] for c in idx.query_by_parent('AActor')] == ['APawn']
+
+        # 同一唯一键重新写入（父类变化）后，旧继承边不再命中
+        idx.add_classes_batch([
+            {'name': 'APawn', 'module': 'Engine', 'parent_classes': ['UObject'],
+             'is_uclass': True, 'file_path': 'Pawn.h', 'line_number': 20},
+        ])
+        idx.create_indexes()
+        assert idx.query_by_parent('AActor') == []
+        assert {c['name'] for c in idx.query_by_parent('UObject')} == {'AActor', 'APawn'}
+        idx.close()
+
+    def test_upsert_keeps_id_and_syncs_keyword_search(self, tmp_path):
+        idx = ClassIndex(str(tmp_path / "class_index.db"))
+        idx.add_classes_batch(self._sample())
+        idx.create_indexes()
+        pawn_id = idx.query_by_name('APawn')[0]['id']
+
+        # 已建索引后的增量写入：已有类就地更新，新类立即可被关键字搜索命中
+        idx.add_classes_batch([
+            {'name': 'APawn', 'module': 'Engine', 'parent_classes': ['AActor'],
+             'is_uclass': True, 'method_count': 7, 'file_path': 'Pawn.h', 'line_number': 20},
+            {'name': 'ACharacter', 'module': 'Engine', 'parent_classes': ['APawn'],
+             'file_path': 'Character.h', 'line_number': 30},
+        ])
+        pawn = idx.query_by_name('APawn')[0]
+        assert pawn['id'] == pawn_id
+        assert pawn['method_count'] == 7
+        assert pawn['parent_classes'] == ['AActor']
+        assert [c['name'] for c in idx.search_by_keyword('Pawn')] == ['APawn']
+        assert [c['name'] for c in idx.search_by_keyword('Character')] == ['ACharacter']
+        idx.close()
+
+    def test_duplicate_key_in_batch_last_wins(self, tmp_path):
+        idx = ClassIndex(str(tmp_path / "class_index.db"))
+        first = {'name': 'A', 'module': 'Game', 'parent_classes': ['P1'],
+                 'interfaces': ['I1'], 'file_path': 'A.h', 'line_number': 1}
+        second = {'name': 'A', 'module': 'Game', 'parent_classes': ['P2'],
+                  'method_count': 3, 'file_path': 'A.h', 'line_number': 1}
+
+        idx.add_classes_batch([first, second])
+        # 经由 add_class 缓冲进入同一批时同样以最后一次为准
+        idx.add_class(second)
+        idx.add_class(first)
+        idx.commit()
+        idx.create_indexes()
+
+        (a,) = idx.query_by_name('A')
+        assert a['parent_classes'] == ['P1']
+        assert a['interfaces'] == ['I1']
+        assert [c['name'] for c in idx.query_by_parent('P1')] == ['A']
+        assert idx.query_by_parent('P2') == []
+
+        idx.add_classes_batch([first, second])
+        (a,) = idx.query_by_name('A')
+        assert a['parent_classes'] == ['P2'] and a['interfaces'] == []
+        assert a['method_count'] == 3
+        assert idx.query_by_parent('P1') == []
+        idx.close()
+
+    def test_add_class_buffered_until_commit(self, tmp_path):
+        idx = ClassIndex(str(tmp_path / "class_index.db"))
+        idx._pending_limit = 2
+        sample = self._sample()
+
+        idx.add_class(sample[0])
+        assert idx.query_by_name('AActor') == []
+
+        # 达到缓冲上限时自动批量写入
+        idx.add_class(sample[1])
+        assert len(idx.query_by_name('APawn')) == 1
+
+        idx.add_class(sample[2])
+        idx.commit()
+        assert idx.get_statistics()['total_classes'] == 3
+        idx.close()
+
+    def test_in_memory_build_saved_to_disk(self, tmp_path):
+        db_path = tmp_path / "class_index.db"
+        idx = ClassIndex(str(db_path))
+        idx.add_classes_batch(self._sample()[:1])
+        idx.close()
+
+        # 未调用 save() 的内存构建不会写回文件
+        idx = ClassIndex(str(db_path), in_memory=True)
+        idx.add_classes_batch(self._sample()[1:])
+        idx.close()
+        reopened = ClassIndex(str(db_path))
+        assert reopened.get_statistics()['total_classes'] == 1
+        reopened.close()
+
+        # 内存模式在已有数据上继续写入，save() 时整体写回文件
+        idx = ClassIndex(str(db_path), in_memory=True)
+        idx.add_classes_batch(self._sample()[1:])
+        idx.create_indexes()
+        assert idx.get_statistics()['total_classes'] == 3
+        idx.save()
+        idx.close()
+
+        reopened = ClassIndex(str(db_path))
+        assert reopened._indexes_built
+        assert [c['name'] for c in reopened.query_by_parent('AActor')] == ['APawn']
+        assert {c['name'] for c in reopened.search_by_keyword('Actor')} == {'AActor'}
+        reopened.close()
@@ -0,0 +1,44 @@
+"""
+Config 测试
+
+点分隔键查找（带缓存）以及 set() 后的缓存失效
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ue5_kb.core.config import Config
+
+
+class TestConfig:
+    def test_get_and_defaults(self, tmp_path):
+        config = Config(base_path=str(tmp_path))
+
+        assert config.storage_base_path == str(tmp_path)
+        assert config.get('parallel.workers') == 0
+        assert config.get('project.plugin_name', 'none') == 'none'
+        assert config.get('missing.key', 42) == 42
+        # 中间节点不是字典时返回默认值
+        assert config.get('project.name.extra', 'x') == 'x'
+
+    def test_set_invalidates_cache(self, tmp_path):
+        config = Config(base_path=str(tmp_path))
+        assert config.engine_path == ''
+
+        config.set('project.engine_path', '/UE5')
+        assert config.engine_path == '/UE5'
+
+        config.set('new.section.value', 1)
+        assert config.get('new.section') == {'value': 1}
+
+    def test_storage_paths_absolute(self, tmp_path):
+        config = Config(base_path=str(tmp_path))
+
+        assert config.global_index_path == str(tmp_path / 'global_index')
+        assert config.storage_path('global_index') == tmp_path / 'global_index'
+        assert config.storage_path('base_path') == tmp_path
+
+        config.set('storage.cache', str(tmp_path / 'other'))
+        assert config.storage_path('cache') == tmp_path / 'other'
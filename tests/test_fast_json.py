@@ -0,0 +1,38 @@
+"""
+fast_json 序列化工具测试
+
+orjson 与标准库回退路径需输出等价的 JSON
+"""
+
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ue5_kb.utils import fast_json
+from ue5_kb.utils.fast_json import json_dumps, json_loads
+
+
+SAMPLE = {'name': 'Core', 'category': '运行时', 'deps': ['CoreUObject'], 'count': 3}
+
+
+class TestFastJson:
+    def test_roundtrip(self):
+        assert json_loads(json_dumps(SAMPLE)) == SAMPLE
+
+    def test_non_ascii_kept_raw(self):
+        assert '运行时'.encode('utf-8') in json_dumps(SAMPLE, indent=True)
+
+    def test_accepts_bytes_and_str(self):
+        assert json_loads(b'{"a": 1}') == json_loads('{"a": 1}') == {'a': 1}
+
+    def test_utf8_bom_stripped(self):
+        assert json_loads(b'\xef\xbb\xbf{"a": 1}') == {'a': 1}
+
+    def test_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setattr(fast_json, 'HAS_ORJSON', False)
+        compact = json_dumps(SAMPLE)
+        assert b', ' not in compact and b': ' not in compact
+        assert json.loads(compact) == SAMPLE
+        assert json.loads(json_dumps(SAMPLE, indent=True)) == SAMPLE
@@ -0,0 +1,199 @@
+"""
+FunctionIndex 测试
+
+批量写入事务、写入缓冲以及查询
+"""
+
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ue5_kb.core.function_index import FunctionIndex
+
+
+class TestFunctionIndex:
+    def _sample(self):
+        return [
+            {'name': 'BeginPlay', 'module': 'Engine', 'class_name': 'AActor',
+             'parameters': [{'type': 'float', 'name': 'DeltaTime'}],
+             'is_virtual': True, 'is_blueprint_callable': True,
+             'ufunction_specifiers': {'Category': 'Actor'},
+             'file_path': 'Actor.h', 'line_number': 10},
+            {'name': 'Tick', 'module': 'Engine', 'class_name': 'AActor',
+             'file_path': 'Actor.h', 'line_number': 20},
+            {'name': 'Normalize', 'module': 'Core', 'class_name': 'FVector',
+             'is_const': True, 'file_path': 'Vector.h', 'line_number': 5},
+        ]
+
+    def test_bulk_and_queries(self, tmp_path):
+        db_path = tmp_path / "function_index.db"
+        idx = FunctionIndex(str(db_path))
+        idx.begin_bulk()
+        idx.add_functions_batch(self._sample()[:2])
+        idx.add_functions_batch(self._sample()[2:])
+        idx.end_bulk()
+        idx.close()
+
+        idx = FunctionIndex(str(db_path))
+        begin_play = idx.query_by_name('BeginPlay')[0]
+        assert begin_play['parameters'] == [{'type': 'float', 'name': 'DeltaTime'}]
+        assert begin_play['ufunction_specifiers'] == {'Category': 'Actor'}
+        assert begin_play['is_virtual'] and begin_play['is_blueprint_callable']
+        assert {f['name'] for f in idx.query_by_module('Engine')} == {'BeginPlay', 'Tick'}
+        assert [f['name'] for f in idx.search_by_keyword('Norm')] == ['Normalize']
+        assert [f['name'] for f in idx.query_blueprint_callable()] == ['BeginPlay']
+
+        stats = idx.get_statistics()
+        assert stats['total_functions'] == 3
+        assert stats['blueprint_callable'] == 1
+        idx.close()
+
+    def test_add_function_buffered_until_commit(self, tmp_path):
+        idx = FunctionIndex(str(tmp_path / "function_index.db"))
+        idx._pending_limit = 2
+        sample = self._sample()
+
+        idx.add_function(sample[0])
+        assert idx.query_by_name('BeginPlay') == []
+
+        # 达到缓冲上限时自动批量写入
+        idx.add_function(sample[1])
+        assert len(idx.query_by_name('Tick')) == 1
+
+        idx.add_function(sample[2])
+        idx.commit()
+        assert idx.get_statistics()['total_functions'] == 3
+        idx.close()
+
+    def test_bulk_load_rebuilds_secondary_indexes(self, tmp_path):
+        db_path = tmp_path / "function_index.db"
+        idx = FunctionIndex(str(db_path))
+
+        def index_names():
+            rows = idx.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_func_%'"
+            ).fetchall()
+            return {row[0] for row in rows}
+
+        assert 'idx_func_name' in index_names()
+        idx.prepare_bulk_load()
+        assert index_names() == set()
+
+        idx.begin_bulk()
+        idx.add_functions_batch(self._sample())
+        idx.end_bulk()
+        idx.finalize_bulk_load()
+        assert 'idx_func_name' in index_names()
+        assert len(idx.query_by_name('Tick')) == 1
+        idx.close()
+
+        # 导入中断（未 finalize）：重新打开时不补建，由下次导入的 finalize_bulk_load 重建
+        idx = FunctionIndex(str(db_path))
+        idx.prepare_bulk_load()
+        idx.close()
+        idx = FunctionIndex(str(db_path))
+        assert index_names() == set()
+        assert len(idx.query_by_name('Tick')) == 1
+        idx.prepare_bulk_load()
+        idx.finalize_bulk_load()
+        assert 'idx_func_module' in index_names()
+        idx.close()
+
+    def test_batch_spanning_multi_row_chunks(self, tmp_path):
+        idx = FunctionIndex(str(tmp_path / "function_index.db"))
+        # 两个整块加不足一块的尾部，最后一行与第一行唯一键相同
+        funcs = [{'name': f'Func{i}', 'module': 'Engine', 'class_name': 'AActor',
+                  'file_path': 'Actor.h', 'line_number': i} for i in range(70)]
+        funcs.append({'name': 'Func0', 'module': 'Engine', 'class_name': 'AActor',
+                      'return_type': 'int32', 'file_path': 'Actor.h', 'line_number': 0})
+        idx.add_functions_batch(funcs)
+        idx.commit()
+
+        assert idx.get_statistics()['total_functions'] == 70
+        assert idx.query_by_name('Func69')[0]['line_number'] == 69
+        assert idx.query_by_name('Func0')[0]['return_type'] == 'int32'
+        idx.close()
+
+    def test_batch_transaction_boundaries(self, tmp_path):
+        db_path = tmp_path / "function_index.db"
+        idx = FunctionIndex(str(db_path))
+        other = sqlite3.connect(str(db_path))
+
+        def committed():
+            return other.execute("SELECT COUNT(*) FROM function_index").fetchone()[0]
+
+        # 批量事务之外：整批独立提交，其他连接立即可见
+        idx.add_functions_batch(self._sample()[:1])
+        assert not idx.conn.in_transaction
+        assert committed() == 1
+
+        # 批量事务之内：end_bulk() 之前其他连接看不到
+        idx.begin_bulk()
+        idx.add_functions_batch(self._sample()[1:])
+        assert idx.conn.in_transaction
+        assert committed() == 1
+        idx.end_bulk()
+        assert committed() == 3
+
+        other.close()
+        idx.close()
+
+    def test_queries_use_per_thread_read_connections(self, tmp_path):
+        idx = FunctionIndex(str(tmp_path / "function_index.db"))
+        idx.add_functions_batch(self._sample()[:2])
+
+        # 未提交的批量写入对查询不可见
+        idx.begin_bulk()
+        idx.add_functions_batch(self._sample()[2:])
+        assert idx.query_by_name('Normalize') == []
+        idx.end_bulk()
+        assert len(idx.query_by_name('Normalize')) == 1
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda name: idx.query_by_name(name), ['BeginPlay', 'Tick'] * 4))
+        assert all(len(r) == 1 for r in results)
+        assert idx._read_conn() is not idx.conn
+        idx.close()
+        idx.close()
+
+    def test_open_during_bulk_load_does_not_take_write_lock(self, tmp_path):
+        db_path = tmp_path / "function_index.db"
+        writer = FunctionIndex(str(db_path))
+        writer.add_functions_batch(self._sample()[:1])
+        writer.prepare_bulk_load()
+        writer.begin_bulk()
+        writer.add_functions_batch(self._sample()[1:2])
+
+        def index_names(idx):
+            rows = idx.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_func_%'"
+            ).fetchall()
+            return {row[0] for row in rows}
+
+        # 导入事务持有写锁：另一个实例仍可立即打开，并查询已提交的数据
+        reader = FunctionIndex(str(db_path))
+        assert not reader.conn.in_transaction
+        assert len(reader.query_by_name('BeginPlay')) == 1
+        assert reader.query_by_name('Tick') == []
+        reader.close()
+
+        # 两次提交之间打开也不会中途补建索引
+        writer.end_bulk()
+        reader = FunctionIndex(str(db_path))
+        assert index_names(reader) == set()
+        reader.close()
+
+        writer.begin_bulk()
+        writer.add_functions_batch(self._sample()[2:])
+        writer.end_bulk()
+        writer.finalize_bulk_load()
+        assert 'idx_func_name' in index_names(writer)
+        assert not writer._bulk_load_flagged()
+        writer.close()
+
+        reopened = FunctionIndex(str(db_path))
+        assert reopened.get_statistics()['total_functions'] == 3
+        reopened.close()
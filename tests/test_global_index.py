@@ -0,0 +1,50 @@
+"""
+GlobalIndex 测试
+
+反向依赖查询、依赖图 / 分层分析缓存及其在 add_module 后的失效
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ue5_kb.core.config import Config
+from ue5_kb.core.global_index import GlobalIndex
+
+
+class TestGlobalIndex:
+    def _index(self, tmp_path):
+        index = GlobalIndex(Config(base_path=str(tmp_path)))
+        index.add_module('Engine', {'category': 'Runtime', 'dependencies': ['Core', 'CoreUObject']})
+        index.add_module('CoreUObject', {'category': 'Runtime', 'dependencies': ['Core', 'Core']})
+        index.add_module('Core', {'category': 'Runtime', 'dependencies': []})
+        return index
+
+    def test_get_dependents(self, tmp_path):
+        index = self._index(tmp_path)
+
+        assert index.get_dependents('Core') == ['Engine', 'CoreUObject']
+        assert index.get_dependents('Engine') == []
+        # 未收录的模块同样可以查询依赖方
+        index.add_module('MyPlugin', {'category': 'Plugins', 'dependencies': ['Slate']})
+        assert index.get_dependents('Slate') == ['MyPlugin']
+
+        # 新增模块后反向依赖表重建
+        index.add_module('UnrealEd', {'category': 'Editor', 'dependencies': ['Engine']})
+        assert index.get_dependents('Engine') == ['UnrealEd']
+
+    def test_layers_cached_until_add_module(self, tmp_path):
+        index = self._index(tmp_path)
+
+        layers = index.analyze_layers()
+        assert layers['bottom_layer'] == ['Engine']
+        assert layers['top_layer'] == ['Core']
+        assert layers['middle_layer'] == ['CoreUObject']
+        assert index.analyze_layers() is layers
+
+        index.add_module('UnrealEd', {'category': 'Editor', 'dependencies': ['Engine']})
+        layers = index.analyze_layers()
+        assert layers['bottom_layer'] == ['UnrealEd']
+        assert layers['middle_layer'] == ['CoreUObject', 'Engine']
+        assert layers['total_dependencies'] == 4
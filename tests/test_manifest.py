@@ -0,0 +1,84 @@
+"""
+Manifest / Hasher 测试
+
+文件哈希、模块哈希以及基于 (大小, 修改时间) 的哈希复用
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ue5_kb.core.manifest import FileInfo, Hasher, ModuleManifest
+
+
+class TestHasher:
+    def test_compute_sha256_matches_hashlib(self, tmp_path):
+        # 空文件、小文件以及跨多个读取块的大文件
+        for name, data in [('empty.h', b''), ('small.h', b'#pragma once\n'),
+                           ('large.cpp', os.urandom((1 << 20) * 2 + 123))]:
+            path = tmp_path / name
+            path.write_bytes(data)
+            assert Hasher.compute_sha256(path) == hashlib.sha256(data).hexdigest()
+
+    def test_compute_module_hash_order_independent(self, tmp_path):
+        build_cs = tmp_path / 'Core.Build.cs'
+        build_cs.write_bytes(b'public class Core : ModuleRules {}')
+        a = tmp_path / 'A.h'
+        b = tmp_path / 'B.cpp'
+        a.write_bytes(b'class A;')
+        b.write_bytes(b'void B() {}')
+
+        expected = hashlib.sha256(build_cs.read_bytes() + a.read_bytes() + b.read_bytes()).hexdigest()
+        assert Hasher.compute_module_hash(build_cs, [b, a]) == expected
+        assert Hasher.compute_module_hash(build_cs, [a, b]) == expected
+
+    def _file_info(self, path, base):
+        stat = path.stat()
+        return FileInfo(path=str(path.relative_to(base)), sha256=Hasher.compute_sha256(path),
+                        size=stat.st_size, mtime=stat.st_mtime)
+
+    def test_compute_sha256_cached(self, tmp_path):
+        path = tmp_path / 'A.h'
+        path.write_bytes(b'class A;')
+        prev = FileInfo(path='A.h', sha256='recorded', size=path.stat().st_size,
+                        mtime=path.stat().st_mtime)
+
+        # 大小与修改时间未变：直接返回记录的哈希
+        assert Hasher.compute_sha256_cached(path, prev) == 'recorded'
+        assert Hasher.compute_sha256_cached(path, None) == Hasher.compute_sha256(path)
+
+        os.utime(path, (prev.mtime + 5, prev.mtime + 5))
+        assert Hasher.compute_sha256_cached(path, prev) == Hasher.compute_sha256(path)
+
+    def test_module_hash_reused_from_manifest(self, tmp_path):
+        build_cs = tmp_path / 'Core.Build.cs'
+        build_cs.write_bytes(b'public class Core : ModuleRules {}')
+        source = tmp_path / 'A.h'
+        source.write_bytes(b'class A;')
+
+        manifest = ModuleManifest(
+            module_name='Core', build_cs_path='Core.Build.cs', category='Runtime',
+            files={'A.h': self._file_info(source, tmp_path)},
+            module_hash='recorded', build_cs=self._file_info(build_cs, tmp_path)
+        )
+        manifest_file = tmp_path / 'module_manifest.json'
+        manifest_file.write_text(json.dumps(manifest.to_dict()), encoding='utf-8')
+        loaded = ModuleManifest.load(manifest_file)
+        assert loaded.build_cs == manifest.build_cs
+
+        assert Hasher.compute_module_hash(build_cs, [source], loaded, tmp_path) == 'recorded'
+
+        # 文件集合变化或内容变化时重新计算
+        extra = tmp_path / 'B.h'
+        extra.write_bytes(b'class B;')
+        assert Hasher.compute_module_hash(build_cs, [source, extra], loaded, tmp_path) != 'recorded'
+        source.write_bytes(b'class A {};')
+        assert Hasher.compute_module_hash(build_cs, [source], loaded, tmp_path) == \
+            Hasher.compute_module_hash(build_cs, [source])
+
+        # 旧清单没有 Build.cs 记录时不复用
+        loaded.build_cs = None
+        assert Hasher.compute_module_hash(build_cs, [source], loaded, tmp_path) != 'recorded'
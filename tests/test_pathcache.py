@@ -0,0 +1,80 @@
+"""
+PathCache 测试
+
+目录未变化时命中缓存，任一目录内容变化后重新遍历
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ue5_kb.pipeline.pathcache import PathCache
+from ue5_kb.utils.fast_json import json_loads
+
+
+def _walk(module_dir, patterns):
+    files = []
+    for pattern in patterns:
+        files.extend(module_dir.rglob(pattern))
+    return files
+
+
+class TestPathCache:
+    def _make_module(self, root):
+        (root / "Public" / "Sub").mkdir(parents=True)
+        (root / "Private").mkdir()
+        (root / "Public" / "A.h").write_text("")
+        (root / "Public" / "Sub" / "B.h").write_text("")
+        (root / "Private" / "A.cpp").write_text("")
+        (root / "Private" / "notes.txt").write_text("")
+        return root
+
+    def test_matches_rglob_and_hits_cache(self, tmp_path):
+        module_dir = self._make_module(tmp_path / "Core")
+        cache = PathCache(tmp_path / "cache.db")
+        patterns = ("*.h", "*.cpp")
+
+        assert cache.source_files(module_dir, patterns) == _walk(module_dir, patterns)
+
+        reopened = PathCache(tmp_path / "cache.db")
+        row = reopened.conn.execute("SELECT COUNT(*) FROM paths").fetchone()
+        assert row[0] == 1
+        assert reopened.source_files(module_dir, patterns) == _walk(module_dir, patterns)
+
+    def test_nested_change_invalidates(self, tmp_path):
+        module_dir = self._make_module(tmp_path / "Core")
+        cache = PathCache(tmp_path / "cache.db")
+        patterns = ("*.h",)
+        cache.source_files(module_dir, patterns)
+
+        new_file = module_dir / "Public" / "Sub" / "C.h"
+        new_file.write_text("")
+        # 保证 mtime 变化（部分文件系统时间精度较粗）
+        sub_dir = module_dir / "Public" / "Sub"
+        stat = sub_dir.stat()
+        os.utime(sub_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert new_file in cache.source_files(module_dir, patterns)
+
+    def test_symlink_loop_not_followed(self, tmp_path):
+        module_dir = self._make_module(tmp_path / "Core")
+        # 指向上级目录的符号链接：跟随会无限递归
+        os.symlink("..", module_dir / "Public" / "Up")
+        os.symlink("..", module_dir / "Private" / "Up")
+        cache = PathCache(tmp_path / "cache.db")
+        patterns = ("*.h", "*.cpp")
+
+        assert cache.source_files(module_dir, patterns) == _walk(module_dir, patterns)
+        (dirs,) = cache.conn.execute("SELECT dirs FROM paths").fetchone()
+        # 快照只包含真实目录：Core、Public、Public/Sub、Private
+        assert len(json_loads(dirs)) == 4
+
+    def test_missing_module_dir_not_cached(self, tmp_path):
+        cache = PathCache(tmp_path / "cache.db")
+        module_dir = tmp_path / "Missing"
+
+        assert cache.source_files(module_dir, ("*.h",)) == []
+
+        self._make_module(module_dir)
+        assert len(cache.source_files(module_dir, ("*.h",))) == 2
@@ -50,13 +50,15 @@ class GlobalIndexBuilder:
         Returns:
             构建好的全局索引
         """
-        print("=" * 60)
-        print("UE5 知识库系统 - 全局索引构建")
-        print("=" * 60)
-        print(f"引擎路径: {self.config.engine_path}")
-        print(f"存储路径: {self.config.storage_base_path}")
-        print(f"恢复模式: {resume}")
-        print("-" * 60)
+        print("\n".join([
+            "=" * 60,
+            "UE5 知识库系统 - 全局索引构建",
+            "=" * 60,
+            f"引擎路径: {self.config.engine_path}",
+            f"存储路径: {self.config.storage_base_path}",
+            f"恢复模式: {resume}",
+            "-" * 60,
+        ]))
 
         # 统一扫描: 直接搜索所有 .Build.cs 文件
         engine_path = os.path.join(self.config.engine_path, "Engine")
@@ -86,19 +88,22 @@ class GlobalIndexBuilder:
         stats = self.global_index.get_statistics()
         verification = self.global_index.verify_coverage()
 
-        print("\n" + "=" * 60)
-        print("构建完成!")
-        print("=" * 60)
-        print(f"总模块数: {stats['total_modules']}")
-        print(f"总文件数: {stats['total_files']}")
-        print(f"预估代码行数: {stats['total_estimated_lines']}")
-        print(f"覆盖率: {verification['coverage_percent']:.2f}%")
-        print(f"验证通过: {verification['verification_passed']}")
+        # 每个区块拼接后一次输出，减少终端刷新次数
+        print("\n".join([
+            "\n" + "=" * 60,
+            "构建完成!",
+            "=" * 60,
+            f"总模块数: {stats['total_modules']}",
+            f"总文件数: {stats['total_files']}",
+            f"预估代码行数: {stats['total_estimated_lines']}",
+            f"覆盖率: {verification['coverage_percent']:.2f}%",
+            f"验证通过: {verification['verification_passed']}",
+        ]))
 
         # 按分类统计
-        print("\n模块分类统计:")
-        for category, count in sorted(stats['categories'].items()):
-            print(f"  {category}: {count} 个模块")
+        lines = ["\n模块分类统计:"]
+        lines.extend(f"  {category}: {count} 个模块" for category, count in sorted(stats['categories'].items()))
+        print("\n".join(lines))
 
         return self.global_index
 
@@ -319,8 +324,8 @@ class GlobalIndexBuilder:
                 'timestamp': datetime.now().isoformat()
             }, f, indent=2)
 
-        # 同时保存完整索引
-        self.global_index.save()
+        # 同时保存完整索引（JSON 视图在构建结束时的 save() 中写出）
+        self.global_index.save(debug_json=False)
 
         print(f"  [检查点] 已处理 {self.processed_count} 个模块")
 
@@ -29,6 +29,9 @@ class ModuleGraphBuilder:
     - 构建代码关系图谱
     """
 
+    # #include 行（逐行匹配，预编译）
+    _INCLUDE_RE = re.compile(r'#include\s+[<"]([^>"]+)[>"]')
+
     def __init__(self, config: Config):
         """
         初始化构建器
@@ -337,7 +340,7 @@ class ModuleGraphBuilder:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
                     line = line.strip()
-                    match = re.match(r'#include\s+[<"]([^>"]+)[>"]', line)
+                    match = self._INCLUDE_RE.match(line)
                     if match:
                         include_path = match.group(1)
                         safe_include = include_path.replace('/', '_').replace('\\', '_')
@@ -4,10 +4,59 @@ UE5 知识库系统 - 分区构建器
 基于 Multi-Agent Context Partitioning 模式的大规模构建支持
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, List, Optional
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
+
+from ..parsers.buildcs_parser import BuildCsParser
+from ..utils.fast_json import json_dumps, json_loads
+
+
+@lru_cache(maxsize=4)
+def _load_discovered_modules(modules_file: str, mtime_ns: int) -> List[Dict]:
+    """
+    读取 discover 阶段的 modules.json（按 路径 + mtime 缓存）
+
+    同一进程内的多个 PartitionedBuilder 共享解析结果；文件被重新生成后
+    mtime 变化，缓存自动失效。返回的列表被共享，调用方不应修改。
+
+    Args:
+        modules_file: modules.json 路径
+        mtime_ns: 文件修改时间（纳秒），仅作为缓存键
+
+    Returns:
+        模块列表
+    """
+    with open(modules_file, 'rb') as f:
+        return json_loads(f.read()).get('modules', [])
+
+
+def _read_build_cs(path: str) -> Optional[bytes]:
+    """读取 .Build.cs 文件字节，文件不存在时返回 None"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _build_partition_worker(args) -> Dict[str, Any]:
+    """
+    子进程入口：处理一个已划分好模块的分区
+
+    Args:
+        args: (engine_path, partition_name, modules, debug)
+
+    Returns:
+        分区处理结果
+    """
+    engine_path, partition_name, modules, debug = args
+    builder = PartitionedBuilder(engine_path, debug=debug)
+    return builder._build_partition_result(partition_name, modules)
 
 
 class PartitionConfig:
@@ -56,28 +105,43 @@ class PartitionedBuilder:
     每个 partition 在隔离的 context 中处理
     """
 
-    def __init__(self, engine_path: Path):
+    # 预读取 .Build.cs 文件的线程数
+    PREFETCH_WORKERS = 8
+
+    def __init__(self, engine_path: Path, debug: bool = False):
         """
         初始化分区构建器
 
         Args:
             engine_path: 引擎根目录
+            debug: 是否以缩进格式输出分区结果（便于人工查看）
         """
         self.engine_path = Path(engine_path)
+        self.debug = debug
         self.partitions_dir = self.engine_path / "data" / "partitions"
         self.partitions_dir.mkdir(parents=True, exist_ok=True)
 
+        # 所有分区共享同一个解析器（分区按顺序处理，parse_file 每次返回新的字典）
+        self._parser = BuildCsParser()
+
+        # 所有分区共享的模块列表缓存（避免每个分区重复读取 modules.json）
+        self._all_modules_cache: Optional[List[Dict]] = None
+        self._modules_by_category: Optional[Dict[str, List[Dict]]] = None
+        self._modules_by_prefix: Optional[Dict[str, List[Dict]]] = None
+
     def build_partitioned(
         self,
         partitions: List[str] = None,
-        parallel: bool = False
+        parallel: bool = False,
+        resume: bool = True
     ) -> Dict[str, Any]:
         """
         使用分区模式构建
 
         Args:
             partitions: 要处理的分区列表（None = 全部）
-            parallel: 是否并行处理（暂未实现）
+            parallel: 是否按分区多进程并行处理
+            resume: 是否复用已完成的分区结果（结果文件比 modules.json 新时跳过）
 
         Returns:
             构建结果
@@ -89,24 +153,40 @@ class PartitionedBuilder:
         print(f"  分区数: {len(partitions)}")
 
         results = {}
+        modules_mtime = self._modules_json_mtime() if resume else None
+        pending = []
 
         for partition_name in partitions:
             if partition_name not in PartitionConfig.PARTITIONS:
                 print(f"  警告: 未知的分区 '{partition_name}'，跳过")
                 continue
 
-            print(f"\n[Partition: {partition_name}] 开始处理...")
+            if modules_mtime is not None:
+                result = self._load_completed_partition(partition_name, modules_mtime)
+                if result is not None:
+                    results[partition_name] = result
+                    print(f"\n[Partition: {partition_name}] 跳过 (已完成)")
+                    continue
 
-            try:
-                result = self._process_partition(partition_name)
-                results[partition_name] = result
+            pending.append(partition_name)
 
-                print(f"[Partition: {partition_name}] 完成！")
-                print(f"  模块数: {result.get('module_count', 0)}")
+        if parallel and len(pending) > 1:
+            results.update(self._process_partitions_parallel(pending))
+        else:
+            for partition_name in pending:
+                print(f"\n[Partition: {partition_name}] 开始处理...")
 
-            except Exception as e:
-                print(f"[Partition: {partition_name}] 失败: {e}")
-                results[partition_name] = {'error': str(e)}
+                try:
+                    result = self._process_partition(partition_name)
+                    results[partition_name] = result
+                    self._print_partition_done(partition_name, result)
+
+                except Exception as e:
+                    print(f"[Partition: {partition_name}] 失败: {e}")
+                    results[partition_name] = {'error': str(e)}
+
+        # 按请求顺序输出各分区结果
+        results = {name: results[name] for name in partitions if name in results}
 
         # 合并所有 partition 的结果
         merged = self._merge_results(results)
@@ -118,6 +198,95 @@ class PartitionedBuilder:
             'successful_partitions': len([r for r in results.values() if 'error' not in r])
         }
 
+    def _modules_json_mtime(self) -> Optional[float]:
+        """获取 discover 阶段 modules.json 的修改时间（不存在时返回 None）"""
+        from ..pipeline.discover import DiscoverStage
+
+        modules_file = DiscoverStage(self.engine_path).get_output_path()
+        try:
+            return modules_file.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _load_completed_partition(self, partition_name: str, modules_mtime: float) -> Optional[Dict[str, Any]]:
+        """
+        加载已完成的分区结果
+
+        Args:
+            partition_name: 分区名称
+            modules_mtime: modules.json 的修改时间
+
+        Returns:
+            分区结果；结果文件不存在、已过期或损坏时返回 None
+        """
+        result_file = self.partitions_dir / f"{partition_name}.json"
+        try:
+            if result_file.stat().st_mtime <= modules_mtime:
+                return None
+            return json_loads(result_file.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _print_partition_done(partition_name: str, result: Dict[str, Any]) -> None:
+        """输出分区完成信息"""
+        print(f"[Partition: {partition_name}] 完成！")
+        print(f"  模块数: {result.get('module_count', 0)}")
+
+    def _process_partitions_parallel(self, partition_names: List[str]) -> Dict[str, Any]:
+        """
+        多进程并行处理多个分区
+
+        主进程先完成模块划分（只读取一次 modules.json），子进程只接收本分区的模块列表；
+        按模块数降序提交，最大的分区最先开始
+
+        Args:
+            partition_names: 待处理的分区名称列表
+
+        Returns:
+            分区名称 -> 分区结果
+        """
+        results = {}
+        tasks = []
+
+        for partition_name in partition_names:
+            config = PartitionConfig.PARTITIONS[partition_name]
+            try:
+                modules = self._discover_partition_modules(partition_name, config['pattern'])
+            except Exception as e:
+                print(f"[Partition: {partition_name}] 失败: {e}")
+                results[partition_name] = {'error': str(e)}
+                continue
+            tasks.append((partition_name, modules))
+
+        tasks.sort(key=lambda task: len(task[1]), reverse=True)
+        if not tasks:
+            return results
+
+        print(f"\n并行处理 {len(tasks)} 个分区: {', '.join(name for name, _ in tasks)}")
+
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            future_to_name = {
+                executor.submit(
+                    _build_partition_worker,
+                    (self.engine_path, partition_name, modules, self.debug),
+                ): partition_name
+                for partition_name, modules in tasks
+            }
+
+            for future in as_completed(future_to_name):
+                partition_name = future_to_name[future]
+                try:
+                    result = future.result()
+                    results[partition_name] = result
+                    self._print_partition_done(partition_name, result)
+                except Exception as e:
+                    print(f"[Partition: {partition_name}] 失败: {e}")
+                    results[partition_name] = {'error': str(e)}
+
+        return results
+
     def _process_partition(self, partition_name: str) -> Dict[str, Any]:
         """
         处理单个分区
@@ -135,11 +304,27 @@ class PartitionedBuilder:
         # 1. 发现该分区的模块
         modules = self._discover_partition_modules(partition_name, config['pattern'])
 
+        return self._build_partition_result(partition_name, modules)
+
+    def _build_partition_result(self, partition_name: str, modules: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        提取已划分模块的依赖并保存分区结果
+
+        Args:
+            partition_name: 分区名称
+            modules: 该分区的模块列表
+
+        Returns:
+            分区处理结果
+        """
+        config = PartitionConfig.PARTITIONS[partition_name]
+
         if not modules:
             return {
                 'partition': partition_name,
                 'module_count': 0,
                 'modules': [],
+                'categories_seen': [],
                 'note': '该分区没有模块'
             }
 
@@ -153,6 +338,7 @@ class PartitionedBuilder:
             'description': config['description'],
             'module_count': len(modules),
             'modules': modules,
+            'categories_seen': sorted({m.get('category') for m in modules}),
             'dependencies': dependencies,
             'processed_at': datetime.now().isoformat()
         }
@@ -173,21 +359,7 @@ class PartitionedBuilder:
         Returns:
             模块列表
         """
-        from ..pipeline.discover import DiscoverStage
-
-        # 使用 discover 阶段的逻辑
-        discover = DiscoverStage(self.engine_path)
-
-        # 扫描所有模块
-        all_modules_result = discover.load_result('modules.json')
-        if not all_modules_result:
-            # 如果 discover 阶段未运行，先运行它
-            all_modules_result = discover.run()
-
-        all_modules = all_modules_result.get('modules', [])
-
-        # 过滤出属于该分区的模块
-        partition_modules = []
+        self._build_category_index()
 
         # 根据 category 过滤
         category_map = {
@@ -201,19 +373,61 @@ class PartitionedBuilder:
 
         target_category = category_map.get(partition_name)
 
-        for module in all_modules:
+        if partition_name in ['plugins', 'platforms']:
+            # 这两个是前缀匹配
+            return list(self._modules_by_prefix.get(target_category, []))
+
+        # 其他是精确匹配
+        return list(self._modules_by_category.get(target_category, []))
+
+    def _load_all_modules(self) -> List[Dict]:
+        """
+        加载 discover 阶段发现的所有模块（同一次构建内只读取一次）
+
+        Returns:
+            模块列表
+        """
+        if self._all_modules_cache is not None:
+            return self._all_modules_cache
+
+        from ..pipeline.discover import DiscoverStage
+
+        # 使用 discover 阶段的逻辑
+        discover = DiscoverStage(self.engine_path)
+        modules_file = discover.get_output_path()
+
+        if not modules_file.exists():
+            # 如果 discover 阶段未运行，先运行它（结果会写入磁盘，供后续进程复用）
+            discover.run()
+
+        self._all_modules_cache = _load_discovered_modules(
+            str(modules_file), modules_file.stat().st_mtime_ns
+        )
+        return self._all_modules_cache
+
+    def _build_category_index(self) -> None:
+        """
+        构建 category 倒排索引（首次调用时单次遍历构建）
+
+        - _modules_by_category: 精确 category -> 模块列表
+        - _modules_by_prefix: 顶层前缀（'Plugins'、'Platforms'）-> 模块列表
+        """
+        if self._modules_by_category is not None:
+            return
+
+        by_category = defaultdict(list)
+        by_prefix = defaultdict(list)
+
+        for module in self._load_all_modules():
             category = module.get('category', '')
+            by_category[category].append(module)
 
-            if partition_name in ['plugins', 'platforms']:
-                # 这两个是前缀匹配
-                if category.startswith(target_category + '.'):
-                    partition_modules.append(module)
-            else:
-                # 其他是精确匹配
-                if category == target_category:
-                    partition_modules.append(module)
+            prefix, sep, _ = category.partition('.')
+            if sep:
+                by_prefix[prefix].append(module)
 
-        return partition_modules
+        self._modules_by_category = dict(by_category)
+        self._modules_by_prefix = dict(by_prefix)
 
     def _extract_partition_dependencies(self, modules: List[Dict[str, str]]) -> Dict[str, Any]:
         """
@@ -225,19 +439,23 @@ class PartitionedBuilder:
         Returns:
             依赖关系字典
         """
-        from ..parsers.buildcs_parser import BuildCsParser
-
-        parser = BuildCsParser()
+        parser = self._parser
         dependencies = {}
 
-        for module in modules:
-            try:
-                # 解析 .Build.cs 文件
-                deps = parser.parse_file(module['absolute_path'])
-                dependencies[module['name']] = deps
-            except Exception as e:
-                print(f"    警告: 解析 {module['name']} 失败: {e}")
-                dependencies[module['name']] = {}
+        # 读取与解析流水线：线程池预读取文件（I/O 期间释放 GIL），
+        # 主线程按顺序解析已读取的内容
+        with ThreadPoolExecutor(max_workers=self.PREFETCH_WORKERS) as pool:
+            futures = [pool.submit(_read_build_cs, module['absolute_path']) for module in modules]
+
+            for module, future in zip(modules, futures):
+                try:
+                    # 解析 .Build.cs 文件（文件不存在时与 parse_file 一致，返回空依赖）
+                    data = future.result()
+                    deps = parser.parse_bytes(data) if data is not None else parser.parse_content('')
+                    dependencies[module['name']] = deps
+                except Exception as e:
+                    print(f"    警告: 解析 {module['name']} 失败: {e}")
+                    dependencies[module['name']] = {}
 
         return dependencies
 
@@ -250,9 +468,13 @@ class PartitionedBuilder:
             result: 结果数据
         """
         output_file = self.partitions_dir / f"{partition_name}.json"
+        tmp_file = output_file.with_suffix('.json.tmp')
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        # orjson 直接输出 UTF-8 字节，避免逐字符的 ensure_ascii 编码开销
+        # 默认紧凑格式；先写临时文件再原子替换，中途崩溃不会留下截断的 JSON
+        with open(tmp_file, 'wb', buffering=65536) as f:
+            f.write(json_dumps(result, indent=self.debug))
+        os.replace(tmp_file, output_file)
 
         print(f"    保存结果: {output_file}")
 
@@ -266,17 +488,12 @@ class PartitionedBuilder:
         Returns:
             合并后的统计数据
         """
-        total_modules = 0
-        all_categories = set()
+        successful = [r for r in results.values() if 'error' not in r]
 
-        for partition_name, result in results.items():
-            if 'error' in result:
-                continue
-
-            total_modules += result.get('module_count', 0)
+        total_modules = sum(r.get('module_count', 0) for r in successful)
 
-            for module in result.get('modules', []):
-                all_categories.add(module.get('category'))
+        # 每个分区只有少量 category，直接合并 categories_seen，无需遍历全部模块
+        all_categories = set().union(*(self._partition_categories(r) for r in successful))
 
         return {
             'total_modules': total_modules,
@@ -285,6 +502,13 @@ class PartitionedBuilder:
             'merged_at': datetime.now().isoformat()
         }
 
+    @staticmethod
+    def _partition_categories(result: Dict[str, Any]) -> List[str]:
+        """获取分区结果中出现过的 category（兼容没有 categories_seen 的旧结果）"""
+        if 'categories_seen' in result:
+            return result['categories_seen']
+        return [m.get('category') for m in result.get('modules', [])]
+
     def get_partition_status(self) -> Dict[str, Any]:
         """
         获取分区状态
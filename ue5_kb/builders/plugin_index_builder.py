@@ -6,6 +6,7 @@ UE5 知识库系统 - 插件索引构建器
 
 import os
 import sys
+from itertools import chain
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
@@ -27,6 +28,12 @@ class PluginIndexBuilder:
     - 统计文件数量和代码行数
     """
 
+    # 计入统计的源文件扩展名
+    SOURCE_EXTENSIONS = frozenset({'h', 'cpp', 'inl'})
+
+    # 预估行数时使用的平均每行字节数（估算值，并非真实行数）
+    AVG_BYTES_PER_LINE = 40
+
     def __init__(self, config: Config):
         """
         初始化构建器
@@ -52,13 +59,15 @@ class PluginIndexBuilder:
         plugin_path = self.config.get('project.plugin_path')
         plugin_name = self.config.get('project.plugin_name', 'Unknown')
 
-        print("=" * 60)
-        print(f"UE5 插件知识库 - {plugin_name}")
-        print("=" * 60)
-        print(f"插件路径: {plugin_path}")
-        print(f"存储路径: {self.config.storage_base_path}")
-        print(f"恢复模式: {resume}")
-        print("-" * 60)
+        print("\n".join([
+            "=" * 60,
+            f"UE5 插件知识库 - {plugin_name}",
+            "=" * 60,
+            f"插件路径: {plugin_path}",
+            f"存储路径: {self.config.storage_base_path}",
+            f"恢复模式: {resume}",
+            "-" * 60,
+        ]))
 
         # 扫描插件目录
         if os.path.exists(plugin_path):
@@ -85,17 +94,20 @@ class PluginIndexBuilder:
         # 输出统计
         stats = self.global_index.get_statistics()
 
-        print("\n" + "=" * 60)
-        print("构建完成!")
-        print("=" * 60)
-        print(f"总模块数: {stats['total_modules']}")
-        print(f"总文件数: {stats['total_files']}")
-        print(f"预估代码行数: {stats['total_estimated_lines']}")
+        # 每个区块拼接后一次输出，减少终端刷新次数
+        print("\n".join([
+            "\n" + "=" * 60,
+            "构建完成!",
+            "=" * 60,
+            f"总模块数: {stats['total_modules']}",
+            f"总文件数: {stats['total_files']}",
+            f"预估代码行数: {stats['total_estimated_lines']}",
+        ]))
 
         # 按分类统计
-        print("\n模块分类统计:")
-        for category, count in sorted(stats['categories'].items()):
-            print(f"  {category}: {count}")
+        lines = ["\n模块分类统计:"]
+        lines.extend(f"  {category}: {count}" for category, count in sorted(stats['categories'].items()))
+        print("\n".join(lines))
 
         return self.global_index
 
@@ -121,17 +133,25 @@ class PluginIndexBuilder:
 
         print(f"找到 {len(build_cs_files)} 个模块")
 
-        # 处理每个模块
-        for i, build_cs_path in enumerate(build_cs_files, 1):
+        from rich.progress import track
+
+        # 处理每个模块（进度条按 ~10Hz 刷新，避免逐模块 print 造成大量终端写入）
+        failures = []
+        for build_cs_path in track(build_cs_files, description="解析模块"):
             try:
                 module_info = self._parse_build_cs_path(build_cs_path)
                 if module_info:
                     self.global_index.add_module(module_info['name'], module_info)
-                    print(f"  [{i}/{len(build_cs_files)}] {module_info['name']} ({module_info['category']})")
             except Exception as e:
-                print(f"  [错误] 解析失败: {build_cs_path}")
-                print(f"    {e}")
-                traceback.print_exc()
+                failures.append((build_cs_path, e))
+
+        print(f"已处理 {len(build_cs_files) - len(failures)}/{len(build_cs_files)} 个模块")
+
+        # 循环结束后统一输出错误
+        for build_cs_path, e in failures:
+            print(f"  [错误] 解析失败: {build_cs_path}")
+            print(f"    {e}")
+            traceback.print_exception(type(e), e, e.__traceback__)
 
     def _parse_build_cs_path(self, build_cs_path: str) -> Optional[Dict[str, Any]]:
         """
@@ -163,8 +183,8 @@ class PluginIndexBuilder:
             parsed_data = self.parser.parse_file(str(build_cs))
             public_dependencies = parsed_data.get('public', [])
             private_dependencies = parsed_data.get('private', [])
-            # 合并所有依赖
-            dependencies = list(set(public_dependencies + private_dependencies))
+            # 合并所有依赖（保持顺序去重，结果可复现）
+            dependencies = list(dict.fromkeys(chain(public_dependencies, private_dependencies)))
         except Exception as e:
             print(f"  警告: 解析 {build_cs.name} 失败: {e}")
 
@@ -176,12 +196,9 @@ class PluginIndexBuilder:
         for subdir in ['Public', 'Private', 'Classes']:
             subdir_path = module_dir / subdir
             if subdir_path.exists():
-                for root, dirs, files in os.walk(subdir_path):
-                    for file in files:
-                        if file.endswith(('.h', '.cpp', '.inl')):
-                            file_count += 1
-                            # 假设每个文件平均 200 行
-                            estimated_lines += 200
+                sub_files, sub_lines = self._count_source_files(str(subdir_path))
+                file_count += sub_files
+                estimated_lines += sub_lines
 
         return {
             'name': module_name,
@@ -196,6 +213,42 @@ class PluginIndexBuilder:
             'indexed_at': datetime.now().isoformat()
         }
 
+    def _count_source_files(self, root: str) -> tuple:
+        """
+        递归统计目录下的源文件数量
+
+        使用 os.scandir 显式栈遍历，DirEntry 自带类型信息。
+        代码行数不逐个读取文件，而是按 文件总字节数 // AVG_BYTES_PER_LINE 估算
+        （Windows 上 DirEntry.stat() 直接复用目录扫描结果，无额外系统调用）。
+
+        Args:
+            root: 目录路径
+
+        Returns:
+            (文件数量, 预估代码行数)
+        """
+        file_count = 0
+        total_bytes = 0
+        stack = [root]
+
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+
+                        _, dot, ext = entry.name.rpartition('.')
+                        if dot and ext in self.SOURCE_EXTENSIONS and entry.is_file():
+                            file_count += 1
+                            total_bytes += entry.stat().st_size
+            except OSError:
+                # 与 os.walk 一致：忽略无法读取的目录
+                continue
+
+        return file_count, total_bytes // self.AVG_BYTES_PER_LINE
+
     def _build_all_module_graphs(self) -> None:
         """构建所有模块的详细知识图谱"""
         from .module_graph_builder import ModuleGraphBuilder
@@ -4,15 +4,155 @@ UE5 Knowledge Base Builder - CLI 接口
 通用工具：为任何版本的 UE5 引擎生成知识库和 Claude Skill
 """
 import click
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from rich.console import Console
-from rich.prompt import Prompt
-from rich.table import Table
+import os
 import re
-import json
-import sys
+from typing import Optional
 
-console = Console()
+
+class _LazyConsole:
+    """rich Console 代理：首次输出时才导入 rich，--help/--version 无需加载"""
+
+    def __init__(self):
+        self._console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
+
+# 从目录名解析引擎版本 (如 UE_5.1.1)
+_ENGINE_VERSION_RE = re.compile(r'(\d+)\.(\d+)\.(\d+)')
+
+# 从目录名解析插件名称和版本 (如 MyPlugin_1.2.3)
+_PLUGIN_NAMEVER_RE = re.compile(r'(.+?)[-_](\d+\.\d+(?:\.\d+)?)')
+
+# CPU 核心数（workers=0 时的自动并行度）
+_CPU_COUNT = os.cpu_count() or 4
+
+# 自动检测模式的显示名称
+_MODE_DISPLAY = {
+    'plugin': '插件模式',
+    'engine': '引擎模式',
+    'engine_subdir': '引擎模式（从子目录检测）'
+}
+
+# 各结果表格的列
+_RESULT_TABLE_COLUMNS = ("阶段", "状态", "详情")
+_STATUS_TABLE_COLUMNS = ("阶段", "已完成", "完成时间", "摘要")
+_PARTITION_RESULT_COLUMNS = ("分区", "状态", "模块数")
+_PARTITION_STATUS_COLUMNS = ("分区", "已完成", "说明")
+
+# PipelineCoordinator 类缓存（导入链较重，仅 pipeline 相关命令需要）
+_coordinator_cls = None
+
+
+def _get_coordinator_cls():
+    """延迟导入并缓存 PipelineCoordinator"""
+    global _coordinator_cls
+    if _coordinator_cls is None:
+        from ue5_kb.pipeline.coordinator import PipelineCoordinator
+        _coordinator_cls = PipelineCoordinator
+    return _coordinator_cls
+
+
+def _is_same_path(a: Path, b: Path) -> bool:
+    """判断两个路径是否指向同一位置（解析符号链接和相对路径，Windows 下忽略大小写）"""
+    return os.path.normcase(a.resolve()) == os.path.normcase(b.resolve())
+
+
+def _replace_dir(src: Path, dst: Path) -> None:
+    """
+    用 src 目录替换 dst 目录
+
+    同一文件系统上只需两次 rename：旧目标先改名为备份，新目录再改名到位，
+    成功后才删除备份；跨设备时回退到 shutil.move（复制），失败则恢复旧目标
+
+    Args:
+        src: 源目录
+        dst: 目标目录
+    """
+    import shutil
+
+    # 目标父目录不存在时 rename 必然失败，先创建以便走 os.replace 快速路径
+    dst.parent.mkdir(parents=True, exist_ok=True)
+
+    backup = None
+    if dst.exists():
+        backup = dst.with_name(dst.name + '.old')
+        if backup.exists():
+            shutil.rmtree(backup)
+        os.replace(dst, backup)
+
+    try:
+        try:
+            os.replace(src, dst)
+        except OSError:
+            # 跨设备，回退到复制
+            shutil.move(str(src), str(dst))
+    except BaseException:
+        if backup is not None:
+            if dst.exists():
+                shutil.rmtree(dst, ignore_errors=True)
+            os.replace(backup, dst)
+        raise
+
+    if backup is not None:
+        shutil.rmtree(backup, ignore_errors=True)
+
+
+def _print_workers_info(workers: int) -> None:
+    """显示并行度配置（workers=0 表示自动检测）"""
+    if workers == 0:
+        console.print(f"[dim]自动检测并行度: {_CPU_COUNT} workers[/dim]\n")
+    else:
+        console.print(f"[dim]并行度: {workers} workers[/dim]\n")
+
+
+def _print_failure(message: str, error: Exception, verbose: bool) -> None:
+    """
+    输出失败信息
+
+    默认只输出异常类型和消息；--verbose 时由 rich 在同一个 console 中渲染完整堆栈
+
+    Args:
+        message: 失败提示（含 rich 样式标记）
+        error: 捕获的异常
+        verbose: 是否输出完整堆栈
+    """
+    console.print(f"\n{message}: {type(error).__name__}: {error}")
+    if verbose:
+        console.print_exception()
+    else:
+        console.print("[dim]使用 --verbose 查看完整堆栈[/dim]")
+
+
+def _failure_exception(message: str, error: Exception, verbose: bool) -> click.ClickException:
+    """
+    构造命令失败异常，交由 Click 输出错误并设置退出码
+
+    --verbose 时先在 console 中渲染完整堆栈（需在 except 块内调用）
+
+    Args:
+        message: 失败提示（纯文本）
+        error: 捕获的异常
+        verbose: 是否输出完整堆栈
+
+    Returns:
+        ClickException 实例
+    """
+    if verbose:
+        console.print_exception()
+        return click.ClickException(f"{message}: {type(error).__name__}: {error}")
+    return click.ClickException(
+        f"{message}: {type(error).__name__}: {error}（使用 --verbose 查看完整堆栈）"
+    )
 
 
 @click.group()
@@ -76,9 +216,9 @@ def cli():
 
 
 @cli.command()
-@click.option('--engine-path', type=click.Path(exists=True),
+@click.option('--engine-path', type=click.Path(),
               help='UE5 引擎路径（与 --plugin-path 二选一，未指定时自动检测）')
-@click.option('--plugin-path', type=click.Path(exists=True),
+@click.option('--plugin-path', type=click.Path(),
               help='插件路径（与 --engine-path 二选一，未指定时自动检测）')
 @click.option('--kb-path', type=click.Path(),
               help='知识库保存路径 (默认: 引擎/插件根目录/KnowledgeBase)')
@@ -92,8 +232,10 @@ def cli():
               help='并行工作线程数（0=自动检测 CPU 核心数，默认: 0）')
 @click.option('--verbose', '-v', is_flag=True,
               help='显示详细输出（用于调试）')
+@click.option('--no-resume', is_flag=True,
+              help='不复用 Analyze 阶段的 checkpoint，重新分析所有模块')
 @click.pass_context
-def init(ctx, engine_path, plugin_path, kb_path, skill_path, force, stage, workers, verbose):
+def init(ctx, engine_path, plugin_path, kb_path, skill_path, force, stage, workers, verbose, no_resume):
     """初始化并生成知识库和 Skill
 
     \b
@@ -126,6 +268,7 @@ def init(ctx, engine_path, plugin_path, kb_path, skill_path, force, stage, worke
     - --stage: 仅运行指定阶段（discover/extract/analyze/build/generate）
     - --workers, -j: 并行工作线程数（0=自动检测 CPU 核心数，默认: 0）
     - --verbose, -v: 显示详细输出（用于调试）
+    - --no-resume: 不从 checkpoint 恢复，重新分析所有模块（默认跳过已分析的模块）
 
     \b
     使用示例：
@@ -173,24 +316,20 @@ def init(ctx, engine_path, plugin_path, kb_path, skill_path, force, stage, worke
             console.print()
             return
 
-        # 显示检测结果
-        console.print("\n[bold cyan]UE5 Knowledge Base Builder[/bold cyan]")
-        console.print("为任何版本的 UE5 引擎生成知识库和 Claude Skill\n")
-        console.print("[bold]自动检测结果:[/bold]\n")
-
-        mode_display = {
-            'plugin': '插件模式',
-            'engine': '引擎模式',
-            'engine_subdir': '引擎模式（从子目录检测）'
-        }
-
-        console.print(f"  检测模式: [cyan]{mode_display.get(detection.mode, detection.mode)}[/cyan]")
-        console.print(f"  检测路径: [yellow]{detection.detected_path}[/yellow]")
-        console.print(f"  检测原因: {detection.reason}")
+        # 显示检测结果（整块一次输出）
+        lines = [
+            "\n[bold cyan]UE5 Knowledge Base Builder[/bold cyan]",
+            "为任何版本的 UE5 引擎生成知识库和 Claude Skill\n",
+            "[bold]自动检测结果:[/bold]\n",
+            f"  检测模式: [cyan]{_MODE_DISPLAY.get(detection.mode, detection.mode)}[/cyan]",
+            f"  检测路径: [yellow]{detection.detected_path}[/yellow]",
+            f"  检测原因: {detection.reason}",
+        ]
         if detection.suggested_name:
             label = "插件名称" if detection.mode == 'plugin' else "引擎版本"
-            console.print(f"  {label}: [cyan]{detection.suggested_name}[/cyan]")
-        console.print()
+            lines.append(f"  {label}: [cyan]{detection.suggested_name}[/cyan]")
+        lines.append("")
+        console.print("\n".join(lines))
 
         # 设置路径
         if detection.mode == 'plugin':
@@ -201,23 +340,27 @@ def init(ctx, engine_path, plugin_path, kb_path, skill_path, force, stage, worke
     # 判断模式
     if plugin_path:
         # 插件模式
-        init_plugin_mode(plugin_path, kb_path, skill_path, force, stage, workers, verbose)
+        init_plugin_mode(plugin_path, kb_path, skill_path, force, stage, workers, verbose, not no_resume)
     else:
         # 引擎模式
-        init_engine_mode(engine_path, kb_path, skill_path, force, stage, workers, verbose)
+        init_engine_mode(engine_path, kb_path, skill_path, force, stage, workers, verbose, not no_resume)
 
 
-def init_engine_mode(engine_path_str, kb_path, skill_path, force, stage, workers, verbose=False):
+def init_engine_mode(engine_path_str, kb_path, skill_path, force, stage, workers, verbose=False, resume=True):
     """引擎模式：为整个 UE5 引擎生成知识库（使用 Pipeline 架构）"""
+    from rich.console import Group
+    from rich.table import Table
+
     console.print("\n[bold cyan]模式: 引擎知识库生成[/bold cyan]\n")
 
     engine_path = Path(engine_path_str) if isinstance(engine_path_str, str) else engine_path_str
-    if not engine_path.exists():
-        console.print(f"[red]错误: 引擎路径不存在: {engine_path}[/red]")
-        return
 
-    # 2. 检测引擎版本
-    engine_version = detect_engine_version(engine_path)
+    # 2. 检测引擎版本（Build.version 读取成功即说明引擎路径存在，省去一次 stat）
+    engine_version = _read_build_version(engine_path)
+    if engine_version is None:
+        if not engine_path.exists():
+            raise click.BadParameter(f"引擎路径不存在: {engine_path}", param_hint="'--engine-path'")
+        engine_version = _engine_version_from_dir_name(engine_path)
     console.print(f"[green]OK[/green] 检测到引擎版本: [bold cyan]{engine_version}[/bold cyan]")
 
     # 3. 计算默认路径
@@ -225,7 +368,6 @@ def init_engine_mode(engine_path_str, kb_path, skill_path, force, stage, workers
     kb_path = Path(kb_path) if kb_path else default_kb_path
 
     # 4. 显示配置摘要
-    console.print("\n[bold]配置摘要:[/bold]\n")
     table = Table(show_header=False)
     table.add_column("项", style="cyan", width=20)
     table.add_column("值", style="yellow")
@@ -239,86 +381,81 @@ def init_engine_mode(engine_path_str, kb_path, skill_path, force, stage, workers
     if stage:
         table.add_row("运行阶段", stage)
 
-    console.print(table)
+    console.print(Group("\n[bold]配置摘要:[/bold]\n", table))
 
     # 5. 使用 PipelineCoordinator 运行
+    # 先完成 Pipeline 模块导入，横幅显示后立即开始运行
+    PipelineCoordinator = _get_coordinator_cls()
     console.print("\n[bold cyan]开始 Pipeline...[/bold cyan]\n")
 
-    # 显示并行度配置
-    if workers == 0:
-        import os
-        detected_workers = os.cpu_count() or 4
-        console.print(f"[dim]自动检测并行度: {detected_workers} workers[/dim]\n")
-    else:
-        console.print(f"[dim]并行度: {workers} workers[/dim]\n")
+    _print_workers_info(workers)
 
     try:
-        from ue5_kb.pipeline.coordinator import PipelineCoordinator
-
         coordinator = PipelineCoordinator(engine_path)
 
         if stage:
             # 仅运行指定阶段
             console.print(f"运行阶段: [cyan]{stage}[/cyan]\n")
-            result = coordinator.run_stage(stage, force=force, parallel=workers, verbose=verbose)
+            result = coordinator.run_stage(stage, force=force, parallel=workers, verbose=verbose, resume=resume)
             results = {stage: result}
         else:
             # 运行完整 Pipeline
-            results = coordinator.run_all(force=force, parallel=workers, verbose=verbose)
+            results = coordinator.run_all(force=force, parallel=workers, verbose=verbose, resume=resume)
 
         # 6. 显示结果
         display_pipeline_results(results)
 
         # 7. 处理自定义路径
-        if kb_path != default_kb_path and default_kb_path.exists():
+        # 未指定 --kb-path 时两者是同一对象，无需解析路径
+        if (kb_path is not default_kb_path and not _is_same_path(kb_path, default_kb_path)
+                and default_kb_path.exists()):
             # 如果指定了自定义路径，移动知识库
             console.print(f"\n[cyan]移动知识库到自定义路径...[/cyan]")
-            import shutil
-            if kb_path.exists():
-                shutil.rmtree(kb_path)
-            shutil.move(str(default_kb_path), str(kb_path))
+            _replace_dir(default_kb_path, kb_path)
             console.print(f"[green]OK[/green] 知识库已移动到: {kb_path}")
 
         # 8. 处理自定义 Skill 路径
         if skill_path:
             skill_path = Path(skill_path)
             default_skill_dir = Path.home() / ".claude" / "skills" / f"ue5kb-{engine_version}"
-            if default_skill_dir.exists():
-                import shutil
-                if skill_path.exists():
-                    shutil.rmtree(skill_path)
-                shutil.move(str(default_skill_dir), str(skill_path))
+            if not _is_same_path(skill_path, default_skill_dir) and default_skill_dir.exists():
+                _replace_dir(default_skill_dir, skill_path)
                 console.print(f"[green]OK[/green] Skill 已移动到: {skill_path}")
 
-        # 9. 完成
-        console.print(f"\n[green]OK 全部完成![/green]")
-        console.print(f"\n[bold]生成的文件:[/bold]")
-        console.print(f"  - 知识库: {kb_path}")
+        # 9. 完成（整块一次输出）
+        lines = [
+            "\n[green]OK 全部完成![/green]",
+            "\n[bold]生成的文件:[/bold]",
+            f"  - 知识库: {kb_path}",
+        ]
 
         generate_result = results.get('generate', {})
         if 'skill_path' in generate_result:
             skill_location = skill_path if skill_path else generate_result['skill_path']
-            console.print(f"  - Skill:  {skill_location}")
+            lines.append(f"  - Skill:  {skill_location}")
 
-        console.print(f"\n[bold cyan]Next steps:[/bold cyan]")
-        console.print(f"  使用 Claude Code 时，可以直接查询关于 UE{engine_version} 源码的问题")
-        console.print(f"  [dim]提示: 使用 'ue5kb pipeline status --engine-path \"{engine_path}\"' 查看状态[/dim]")
+        lines += [
+            "\n[bold cyan]Next steps:[/bold cyan]",
+            f"  使用 Claude Code 时，可以直接查询关于 UE{engine_version} 源码的问题",
+            f"  [dim]提示: 使用 'ue5kb pipeline status --engine-path \"{engine_path}\"' 查看状态[/dim]",
+        ]
+        console.print("\n".join(lines))
 
     except Exception as e:
-        console.print(f"\n[red]X Pipeline 执行失败: {e}[/red]")
-        import traceback
-        traceback.print_exc()
+        _print_failure("[red]X Pipeline 执行失败[/red]", e, verbose)
         return
 
 
-def init_plugin_mode(plugin_path_str, kb_path, skill_path, force, stage, workers, verbose=False):
+def init_plugin_mode(plugin_path_str, kb_path, skill_path, force, stage, workers, verbose=False, resume=True):
     """插件模式：为单个插件生成知识库（使用 Pipeline 架构）"""
+    from rich.console import Group
+    from rich.table import Table
+
     console.print("\n[bold cyan]模式: 插件知识库生成[/bold cyan]\n")
 
     plugin_path = Path(plugin_path_str) if isinstance(plugin_path_str, str) else plugin_path_str
     if not plugin_path.exists():
-        console.print(f"[red]错误: 插件路径不存在: {plugin_path}[/red]")
-        return
+        raise click.BadParameter(f"插件路径不存在: {plugin_path}", param_hint="'--plugin-path'")
 
     # 检测插件信息
     plugin_name, plugin_version = detect_plugin_info(plugin_path)
@@ -331,7 +468,6 @@ def init_plugin_mode(plugin_path_str, kb_path, skill_path, force, stage, workers
     kb_path = Path(kb_path) if kb_path else default_kb_path
 
     # 显示配置摘要
-    console.print("\n[bold]配置摘要:[/bold]\n")
     table = Table(show_header=False)
     table.add_column("项", style="cyan", width=20)
     table.add_column("值", style="yellow")
@@ -345,95 +481,164 @@ def init_plugin_mode(plugin_path_str, kb_path, skill_path, force, stage, workers
     if stage:
         table.add_row("运行阶段", stage)
 
-    console.print(table)
+    console.print(Group("\n[bold]配置摘要:[/bold]\n", table))
 
     # 运行 Pipeline
+    # 先完成 Pipeline 模块导入，横幅显示后立即开始运行
+    PipelineCoordinator = _get_coordinator_cls()
     console.print("\n[bold cyan]开始 Pipeline...[/bold cyan]\n")
 
-    # 显示并行度配置
-    if workers == 0:
-        import os
-        detected_workers = os.cpu_count() or 4
-        console.print(f"[dim]自动检测并行度: {detected_workers} workers[/dim]\n")
-    else:
-        console.print(f"[dim]并行度: {workers} workers[/dim]\n")
+    _print_workers_info(workers)
 
     try:
-        from ue5_kb.pipeline.coordinator import PipelineCoordinator
-
         coordinator = PipelineCoordinator(plugin_path, is_plugin=True, plugin_name=plugin_name)
 
         if stage:
             console.print(f"运行阶段: [cyan]{stage}[/cyan]\n")
-            result = coordinator.run_stage(stage, force=force, parallel=workers, verbose=verbose)
+            result = coordinator.run_stage(stage, force=force, parallel=workers, verbose=verbose, resume=resume)
             results = {stage: result}
         else:
-            results = coordinator.run_all(force=force, parallel=workers, verbose=verbose)
+            results = coordinator.run_all(force=force, parallel=workers, verbose=verbose, resume=resume)
 
         # 显示结果
         display_pipeline_results(results)
 
         # 处理自定义路径
-        if kb_path != default_kb_path and default_kb_path.exists():
+        # 未指定 --kb-path 时两者是同一对象，无需解析路径
+        if (kb_path is not default_kb_path and not _is_same_path(kb_path, default_kb_path)
+                and default_kb_path.exists()):
             console.print(f"\n[cyan]移动知识库到自定义路径...[/cyan]")
-            import shutil
-            if kb_path.exists():
-                shutil.rmtree(kb_path)
-            shutil.move(str(default_kb_path), str(kb_path))
+            _replace_dir(default_kb_path, kb_path)
             console.print(f"[green]OK[/green] 知识库已移动到: {kb_path}")
 
-        # 完成
-        console.print(f"\n[green]OK 全部完成![/green]")
-        console.print(f"\n[bold]生成的文件:[/bold]")
-        console.print(f"  - 知识库: {kb_path}")
-
-        console.print(f"\n[bold cyan]Next steps:[/bold cyan]")
-        console.print(f"  使用 Claude Code 时，可以直接查询关于 {plugin_name} 插件的问题")
+        # 完成（整块一次输出）
+        console.print("\n".join([
+            "\n[green]OK 全部完成![/green]",
+            "\n[bold]生成的文件:[/bold]",
+            f"  - 知识库: {kb_path}",
+            "\n[bold cyan]Next steps:[/bold cyan]",
+            f"  使用 Claude Code 时，可以直接查询关于 {plugin_name} 插件的问题",
+        ]))
 
     except Exception as e:
-        console.print(f"\n[red]X Pipeline 执行失败: {e}[/red]")
-        import traceback
-        traceback.print_exc()
+        _print_failure("[red]X Pipeline 执行失败[/red]", e, verbose)
         return
 
 
-def display_pipeline_results(results: dict) -> None:
-    """显示 Pipeline 执行结果"""
-    console.print(f"\n[bold cyan]=== Pipeline 结果 ===[/bold cyan]\n")
+# 成功阶段的详情：按顺序取第一个存在的结果字段
+_RESULT_DETAILS = (
+    ('total_count', '{} 个模块'),
+    ('success_count', '{} 个成功'),
+    ('analyzed_count', '{} 个模块'),
+    ('skill_name', 'Skill: {}'),
+    ('kb_path', '知识库已创建'),
+)
+
+
+def _stage_status_details(result: dict) -> tuple:
+    """
+    生成阶段结果的状态与详情文本
+
+    Args:
+        result: 阶段结果
+
+    Returns:
+        (状态, 详情)
+    """
+    if result.get('skipped'):
+        return "[yellow]跳过[/yellow]", result.get('reason', '')
+    if result.get('error'):
+        return "[red]失败[/red]", result['error'][:50]
+
+    for key, fmt in _RESULT_DETAILS:
+        if key in result:
+            return "[green]成功[/green]", fmt.format(result[key])
+    return "[green]成功[/green]", "OK"
+
+
+def _make_table(columns: tuple):
+    """
+    创建带表头的 rich Table
+
+    Args:
+        columns: 列标题
+
+    Returns:
+        rich Table
+    """
+    from rich.table import Table
 
     table = Table()
-    table.add_column("阶段")
-    table.add_column("状态")
-    table.add_column("详情")
+    for column in columns:
+        table.add_column(column)
+    return table
+
+
+def _make_result_table(results: dict):
+    """
+    生成 Pipeline 各阶段结果表格
+
+    Args:
+        results: 阶段名称 -> 阶段结果
+
+    Returns:
+        rich Table
+    """
+    table = _make_table(_RESULT_TABLE_COLUMNS)
 
     for stage_name, result in results.items():
-        if result.get('skipped'):
-            status = "[yellow]跳过[/yellow]"
-            details = result.get('reason', '')
-        elif result.get('error'):
-            status = "[red]失败[/red]"
-            details = result.get('error', '')[:50]
+        table.add_row(stage_name, *_stage_status_details(result))
+
+    return table
+
+
+def _partition_result_rows(partitions: dict) -> list:
+    """
+    生成分区构建结果的表格行
+
+    Args:
+        partitions: 分区名称 -> 分区构建结果
+
+    Returns:
+        (分区, 状态, 模块数) 列表
+    """
+    rows = []
+    for partition_name, partition_result in partitions.items():
+        if 'error' in partition_result:
+            rows.append((partition_name, "[red]失败[/red]", "N/A"))
         else:
-            status = "[green]成功[/green]"
-            # 提取关键统计
-            if 'total_count' in result:
-                details = f"{result['total_count']} 个模块"
-            elif 'success_count' in result:
-                details = f"{result['success_count']} 个成功"
-            elif 'analyzed_count' in result:
-                details = f"{result['analyzed_count']} 个模块"
-            elif 'skill_name' in result:
-                details = f"Skill: {result['skill_name']}"
-            elif 'kb_path' in result:
-                details = f"知识库已创建"
-            else:
-                details = "OK"
+            module_count = str(partition_result.get('module_count', 0))
+            rows.append((partition_name, "[green]成功[/green]", module_count))
+    return rows
+
+
+def display_partition_results(partitions: dict) -> None:
+    """
+    显示分区构建结果
 
-        table.add_row(stage_name, status, details)
+    Args:
+        partitions: 分区名称 -> 分区构建结果
+    """
+    rows = _partition_result_rows(partitions)
 
+    table = _make_table(_PARTITION_RESULT_COLUMNS)
+    for row in rows:
+        table.add_row(*row)
     console.print(table)
 
 
+def display_pipeline_results(results: dict, title: str = "[bold cyan]=== Pipeline 结果 ===[/bold cyan]") -> None:
+    """
+    显示 Pipeline 执行结果
+
+    Args:
+        results: 阶段名称 -> 阶段结果
+        title: 表格上方的标题（含 rich 样式标记）
+    """
+    from rich.console import Group
+
+    # 标题与表格合并为一次输出
+    console.print(Group(f"\n{title}\n", _make_result_table(results)))
 
 
 @cli.command()
@@ -462,7 +667,9 @@ def status():
               help='强制完全重建（不使用增量更新）')
 @click.option('--check', is_flag=True,
               help='仅检查更新，不执行')
-def update(engine_path, plugin_path, full, check):
+@click.option('--workers', '-j', type=int, default=0,
+              help='计算文件哈希的并行进程数（0=自动检测 CPU 核心数，默认: 0）')
+def update(engine_path, plugin_path, full, check, workers):
     """增量更新知识库
 
     \b
@@ -479,13 +686,14 @@ def update(engine_path, plugin_path, full, check):
       ue5kb update --engine-path "D:\\UE5"
       ue5kb update --plugin-path "F:\\MyProject\\Plugins\\MyPlugin"
       ue5kb update --check
+      ue5kb update --check --workers 8
       ue5kb update --full
     """
     if full:
         console.print("[yellow]执行完全重建...[/yellow]")
         # 调用 init 命令
         ctx = click.get_current_context()
-        ctx.invoke(init, engine_path=engine_path, plugin_path=plugin_path, force=True)
+        ctx.invoke(init, engine_path=engine_path, plugin_path=plugin_path, force=True, workers=workers)
         return
 
     # 检测路径
@@ -510,26 +718,28 @@ def update(engine_path, plugin_path, full, check):
     # 运行增量更新
     from .pipeline.update import UpdateStage
 
-    updater = UpdateStage(base_path)
+    updater = UpdateStage(base_path, workers=workers)
 
     console.print(f"\n[bold cyan]增量更新检查[/bold cyan]")
     console.print(f"目标路径: [yellow]{base_path}[/yellow]\n")
 
     if check:
         # 仅检查
-        result = updater.check()
+        result = updater.check(workers=workers)
         if 'error' in result:
             console.print(f"[red]{result['error']}[/red]")
             console.print(f"[dim]{result.get('reason', '')}[/dim]")
         else:
-            console.print("[green]变更检测结果:[/green]")
-            console.print(f"  新增模块: {result['added_count']}")
-            console.print(f"  修改模块: {result['modified_count']}")
-            console.print(f"  删除模块: {result['removed_count']}")
-            console.print(f"  未变更模块: {result['unchanged_count']}")
+            console.print("\n".join([
+                "[green]变更检测结果:[/green]",
+                f"  新增模块: {result['added_count']}",
+                f"  修改模块: {result['modified_count']}",
+                f"  删除模块: {result['removed_count']}",
+                f"  未变更模块: {result['unchanged_count']}",
+            ]))
     else:
         # 执行更新
-        result = updater.run()
+        result = updater.run(workers=workers)
         if 'error' in result:
             console.print(f"[red]{result['error']}[/red]")
             console.print(f"[dim]{result.get('reason', '')}[/dim]")
@@ -543,54 +753,71 @@ def update(engine_path, plugin_path, full, check):
                 console.print(f"  移除模块数: {result['modules_removed']}")
 
 
-def detect_engine_version(engine_path: Path) -> str:
-    """从引擎路径检测版本号"""
-    # 方法1: 读取 Engine/Build/Build.version 文件 (最准确)
+@lru_cache(maxsize=32)
+def _read_build_version(engine_path: Path) -> Optional[str]:
+    """读取 Engine/Build/Build.version 中的版本号，文件不存在或无版本信息时返回 None"""
     build_version_file = engine_path / "Engine" / "Build" / "Build.version"
-    if build_version_file.exists():
-        try:
-            import json
-            content = build_version_file.read_text()
-            version_data = json.loads(content)
-
-            major = version_data.get("MajorVersion")
-            minor = version_data.get("MinorVersion")
-            patch = version_data.get("PatchVersion")
-
-            if major and minor:
-                if patch:
-                    return f"{major}.{minor}.{patch}"
-                else:
-                    return f"{major}.{minor}.0"
-        except Exception as e:
-            console.print(f"[dim]读取 Build.version 失败: {e}[/dim]")
+    try:
+        # 直接读取而不先 exists()，文件不存在时由异常分支处理
+        data = build_version_file.read_bytes()
+    except OSError:
+        return None
+
+    from ue5_kb.utils.fast_json import json_loads
+
+    try:
+        # 直接解析字节，省去一次 UTF-8 解码
+        version_data = json_loads(data)
+
+        major = version_data.get("MajorVersion")
+        minor = version_data.get("MinorVersion")
+        patch = version_data.get("PatchVersion")
+
+        if major and minor:
+            if patch:
+                return f"{major}.{minor}.{patch}"
+            else:
+                return f"{major}.{minor}.0"
+    except Exception as e:
+        console.print(f"[dim]读取 Build.version 失败: {e}[/dim]")
+
+    return None
+
 
-    # 方法2: 从文件夹名称解析 (如 UnrealEngine51_500 -> 5.1.500)
-    path_name = engine_path.name
-    match = re.search(r'(\d+)\.(\d+)\.(\d+)', path_name)
+def _engine_version_from_dir_name(engine_path: Path) -> str:
+    """从文件夹名称解析版本号 (如 UnrealEngine51_500 -> 5.1.500)，失败时返回 unknown"""
+    match = _ENGINE_VERSION_RE.search(engine_path.name)
     if match:
         major, minor, patch = match.groups()
         return f"{major}.{minor}.{patch}"
 
-    # 默认返回 unknown
     return "unknown"
 
 
+def detect_engine_version(engine_path: Path) -> str:
+    """从引擎路径检测版本号"""
+    # 方法1: 读取 Engine/Build/Build.version 文件 (最准确)
+    # 方法2: 从文件夹名称解析
+    return _read_build_version(engine_path) or _engine_version_from_dir_name(engine_path)
+
+
+@lru_cache(maxsize=32)
 def detect_plugin_info(plugin_path: Path) -> tuple[str, str]:
     """从插件路径检测插件名称和版本
 
     Returns:
         (plugin_name, plugin_version)
     """
+    from ue5_kb.utils.auto_detect import find_uplugin
+    from ue5_kb.utils.fast_json import json_loads
+
     # 方法1: 读取 .uplugin 文件
-    uplugin_files = list(plugin_path.glob('*.uplugin'))
-    if uplugin_files:
-        uplugin_file = uplugin_files[0]
+    uplugin_file = find_uplugin(plugin_path)
+    if uplugin_file is not None:
         plugin_name = uplugin_file.stem
 
         try:
-            content = uplugin_file.read_text(encoding='utf-8')
-            plugin_data = json.loads(content)
+            plugin_data = json_loads(uplugin_file.read_bytes())
 
             # 读取版本信息
             version = plugin_data.get("VersionName") or plugin_data.get("Version")
@@ -606,7 +833,7 @@ def detect_plugin_info(plugin_path: Path) -> tuple[str, str]:
     plugin_name = plugin_path.name
 
     # 尝试从文件夹名称中提取版本 (例如: MyPlugin_1.2.3 -> MyPlugin, 1.2.3)
-    match = re.search(r'(.+?)[-_](\d+\.\d+(?:\.\d+)?)', plugin_name)
+    match = _PLUGIN_NAMEVER_RE.search(plugin_name)
     if match:
         name, version = match.groups()
         return name, version
@@ -674,7 +901,8 @@ def pipeline():
               help='UE5 引擎路径')
 @click.option('--force', is_flag=True, help='强制重新运行所有阶段')
 @click.option('--workers', '-j', type=int, default=0, help='并行工作线程数（0=自动检测，默认: 0）')
-def pipeline_run(engine_path, force, workers):
+@click.option('--verbose', '-v', is_flag=True, help='失败时显示完整堆栈')
+def pipeline_run(engine_path, force, workers, verbose):
     """运行完整 Pipeline
 
     \b
@@ -688,7 +916,7 @@ def pipeline_run(engine_path, force, workers):
       ue5kb pipeline run --engine-path "D:\\UE5" --workers 4
       ue5kb pipeline run --engine-path "D:\\UE5" -j 0
     """
-    from ue5_kb.pipeline.coordinator import PipelineCoordinator
+    PipelineCoordinator = _get_coordinator_cls()
 
     console.print(f"\n[bold cyan]=== Pipeline 运行 ===[/bold cyan]")
     console.print(f"引擎路径: {engine_path}")
@@ -701,43 +929,10 @@ def pipeline_run(engine_path, force, workers):
         results = coordinator.run_all(force=force, parallel=workers)
 
         # 显示结果摘要
-        console.print(f"\n[bold green]=== Pipeline 完成 ===[/bold green]\n")
-
-        table = Table()
-        table.add_column("阶段")
-        table.add_column("状态")
-        table.add_column("详情")
-
-        for stage_name, result in results.items():
-            if result.get('skipped'):
-                status = "[yellow]跳过[/yellow]"
-                details = result.get('reason', '')
-            elif result.get('error'):
-                status = "[red]失败[/red]"
-                details = result.get('error', '')[:50]
-            else:
-                status = "[green]成功[/green]"
-                # 提取关键统计
-                if 'total_count' in result:
-                    details = f"{result['total_count']} 个模块"
-                elif 'success_count' in result:
-                    details = f"{result['success_count']} 个成功"
-                elif 'analyzed_count' in result:
-                    details = f"{result['analyzed_count']} 个模块"
-                elif 'skill_name' in result:
-                    details = f"Skill: {result['skill_name']}"
-                else:
-                    details = "OK"
-
-            table.add_row(stage_name, status, details)
-
-        console.print(table)
+        display_pipeline_results(results, "[bold green]=== Pipeline 完成 ===[/bold green]")
 
     except Exception as e:
-        console.print(f"\n[bold red]Pipeline 失败: {e}[/bold red]")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+        raise _failure_exception("Pipeline 失败", e, verbose) from e
 
 
 @pipeline.command('status')
@@ -753,20 +948,14 @@ def pipeline_status(engine_path):
     示例：
       ue5kb pipeline status --engine-path "D:\\UE5"
     """
-    from ue5_kb.pipeline.coordinator import PipelineCoordinator
+    from rich.console import Group
+    PipelineCoordinator = _get_coordinator_cls()
 
     coordinator = PipelineCoordinator(Path(engine_path))
     status = coordinator.get_status()
 
-    console.print(f"\n[bold cyan]=== Pipeline 状态 ===[/bold cyan]")
-    console.print(f"引擎路径: {status['base_path']}\n")
-
     # 创建表格
-    table = Table()
-    table.add_column("阶段")
-    table.add_column("已完成")
-    table.add_column("完成时间")
-    table.add_column("摘要")
+    table = _make_table(_STATUS_TABLE_COLUMNS)
 
     for stage_name, stage_info in status['stages'].items():
         completed = "✓" if stage_info.get('completed') else "✗"
@@ -780,15 +969,22 @@ def pipeline_status(engine_path):
         # 提取摘要
         summary = state.get('result_summary', {}) if state else {}
         if summary:
-            summary_str = ', '.join([f"{k}: {v}" for k, v in list(summary.items())[:2]])
-            summary_str = summary_str[:40] + ('...' if len(summary_str) > 40 else '')
+            # 只取前两项，不复制整个 summary
+            summary_str = ', '.join(f"{k}: {v}" for k, v in islice(summary.items(), 2))
+            if len(summary_str) > 40:
+                summary_str = summary_str[:40] + '...'
         else:
             summary_str = ''
 
         table.add_row(stage_name, completed, completed_at, summary_str)
 
-    console.print(table)
-    console.print()
+    # 标题、表格与结尾空行合并为一次输出
+    console.print(Group(
+        "\n[bold cyan]=== Pipeline 状态 ===[/bold cyan]",
+        f"引擎路径: {status['base_path']}\n",
+        table,
+        "",
+    ))
 
 
 @pipeline.command('clean')
@@ -808,7 +1004,7 @@ def pipeline_clean(engine_path, stage_name, all):
       ue5kb pipeline clean --engine-path "D:\\UE5" discover
       ue5kb pipeline clean --engine-path "D:\\UE5" --all
     """
-    from ue5_kb.pipeline.coordinator import PipelineCoordinator
+    PipelineCoordinator = _get_coordinator_cls()
 
     coordinator = PipelineCoordinator(Path(engine_path))
 
@@ -821,12 +1017,11 @@ def pipeline_clean(engine_path, stage_name, all):
             coordinator.clean_stage(stage_name)
             console.print(f"[green]已清除阶段: {stage_name}[/green]")
         except ValueError as e:
-            console.print(f"[red]错误: {e}[/red]")
-            sys.exit(1)
+            raise click.BadParameter(str(e), param_hint="'STAGE_NAME'") from e
     else:
-        console.print(f"[red]错误: 请指定阶段名称或使用 --all[/red]")
-        console.print(f"可用阶段: discover, extract, analyze, build, generate")
-        sys.exit(1)
+        raise click.UsageError(
+            "请指定阶段名称或使用 --all（可用阶段: discover, extract, analyze, build, generate）"
+        )
 
 
 # ============================================================================
@@ -838,8 +1033,10 @@ def pipeline_clean(engine_path, stage_name, all):
               help='UE5 引擎路径')
 @click.option('--partition', type=str, multiple=True,
               help='要处理的分区（可多次指定）。可选：runtime, editor, plugins, developer, platforms, programs')
-@click.option('--parallel', is_flag=True, help='并行处理（暂未实现）')
-def pipeline_partitioned(engine_path, partition, parallel):
+@click.option('--parallel', is_flag=True, help='按分区多进程并行处理')
+@click.option('--no-resume', is_flag=True, help='重新处理所有分区（不复用已完成的分区结果）')
+@click.option('--verbose', '-v', is_flag=True, help='失败时显示完整堆栈')
+def pipeline_partitioned(engine_path, partition, parallel, no_resume, verbose):
     """使用分区模式构建（适用于大型引擎）
 
     \b
@@ -855,6 +1052,8 @@ def pipeline_partitioned(engine_path, partition, parallel):
     示例：
       ue5kb pipeline partitioned --engine-path "D:\\UE5"  # 处理所有分区
       ue5kb pipeline partitioned --engine-path "D:\\UE5" --partition runtime --partition editor  # 仅处理指定分区
+      ue5kb pipeline partitioned --engine-path "D:\\UE5" --no-resume  # 重新处理已完成的分区
+      ue5kb pipeline partitioned --engine-path "D:\\UE5" --parallel  # 多个分区并行处理
     """
     from ue5_kb.builders.partitioned_builder import PartitionedBuilder
 
@@ -874,28 +1073,14 @@ def pipeline_partitioned(engine_path, partition, parallel):
     try:
         result = builder.build_partitioned(
             partitions=partitions_to_process,
-            parallel=parallel
+            parallel=parallel,
+            resume=not no_resume
         )
 
         # 显示结果
         console.print(f"\n[bold green]=== 分区构建完成 ===[/bold green]\n")
 
-        table = Table()
-        table.add_column("分区")
-        table.add_column("状态")
-        table.add_column("模块数")
-
-        for partition_name, partition_result in result['partitions'].items():
-            if 'error' in partition_result:
-                status = "[red]失败[/red]"
-                module_count = "N/A"
-            else:
-                status = "[green]成功[/green]"
-                module_count = str(partition_result.get('module_count', 0))
-
-            table.add_row(partition_name, status, module_count)
-
-        console.print(table)
+        display_partition_results(result['partitions'])
 
         # 显示合并统计
         merged = result.get('merged', {})
@@ -904,10 +1089,7 @@ def pipeline_partitioned(engine_path, partition, parallel):
         console.print(f"  成功分区: {result.get('successful_partitions', 0)}/{result.get('total_partitions', 0)}")
 
     except Exception as e:
-        console.print(f"\n[bold red]分区构建失败: {e}[/bold red]")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+        raise _failure_exception("分区构建失败", e, verbose) from e
 
 
 @pipeline.command('partition-status')
@@ -930,10 +1112,7 @@ def pipeline_partition_status(engine_path):
 
     console.print(f"\n[bold cyan]=== 分区状态 ===[/bold cyan]\n")
 
-    table = Table()
-    table.add_column("分区")
-    table.add_column("已完成")
-    table.add_column("说明")
+    table = _make_table(_PARTITION_STATUS_COLUMNS)
 
     for partition_name, config in PartitionConfig.PARTITIONS.items():
         partition_status = status.get(partition_name, {})
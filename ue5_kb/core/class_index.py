@@ -4,10 +4,165 @@ UE5 知识库系统 - 类快速索引
 提供基于 SQLite 的类快速查找和模糊搜索能力
 """
 
+import os
 import sqlite3
-import json
+import threading
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+from ..utils.fast_json import json_loads
+
+
+# 每个连接的性能参数：64 MiB 页缓存、256 MiB mmap、临时表放内存、锁等待 5 秒
+_CONNECTION_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=5000;
+"""
+
+# trigram 分词至少需要 3 个字符，更短的关键字直接对主表 LIKE
+_FTS_MIN_CHARS = 3
+
+# 查询返回的列（按位置读取元组行，顺序与 _row_to_dict 对应；旧版本的 JSON 列不再读取）
+_CLASS_COLUMNS = (
+    'id', 'name', 'module', 'namespace', 'file_path', 'line_number',
+    'is_uclass', 'is_struct', 'is_interface', 'is_blueprintable',
+    'method_count', 'property_count',
+)
+_CLASS_SELECT = ', '.join(f'c.{column}' for column in _CLASS_COLUMNS)
+
+# 写入类行：唯一键冲突时就地更新（保留 id），而不是 INSERT OR REPLACE 的删除后重新插入，
+# 各二级索引只需更新变化的列，也不会留下指向旧 id 的边和全文索引行
+_UPSERT_CLASS_SQL = """
+    INSERT INTO class_index (
+        name, module, namespace,
+        file_path, line_number,
+        is_uclass, is_struct, is_interface, is_blueprintable,
+        method_count, property_count
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(name, module, file_path, line_number) DO UPDATE SET
+        namespace = excluded.namespace,
+        parent_classes = NULL,
+        interfaces = NULL,
+        is_uclass = excluded.is_uclass,
+        is_struct = excluded.is_struct,
+        is_interface = excluded.is_interface,
+        is_blueprintable = excluded.is_blueprintable,
+        method_count = excluded.method_count,
+        property_count = excluded.property_count
+"""
+
+# 按唯一键找到刚写入的类行并记录一条继承边 / 接口边
+# （参数: 父类或接口名, 在列表中的位置, name, module, file_path, line_number）
+_INSERT_PARENT_EDGE_SQL = """
+    INSERT OR IGNORE INTO class_parent_edge (child_id, parent_name, position)
+    SELECT id, ?, ? FROM class_index
+    WHERE name = ? AND module = ? AND file_path = ? AND line_number = ?
+"""
+_INSERT_INTERFACE_EDGE_SQL = """
+    INSERT OR IGNORE INTO class_interface_edge (child_id, interface_name, position)
+    SELECT id, ?, ? FROM class_index
+    WHERE name = ? AND module = ? AND file_path = ? AND line_number = ?
+"""
+
+# 删除已存在类行的继承边 / 接口边（upsert 保留原 id，重新写入前需先清掉旧边）
+# （参数: name, module, file_path, line_number）
+_DELETE_PARENT_EDGES_SQL = """
+    DELETE FROM class_parent_edge WHERE child_id = (
+        SELECT id FROM class_index
+        WHERE name = ? AND module = ? AND file_path = ? AND line_number = ?
+    )
+"""
+_DELETE_INTERFACE_EDGES_SQL = """
+    DELETE FROM class_interface_edge WHERE child_id = (
+        SELECT id FROM class_index
+        WHERE name = ? AND module = ? AND file_path = ? AND line_number = ?
+    )
+"""
+
+# 将 class_index 中 id 大于全文索引最大 rowid 的新行补入 class_fts
+# （upsert 保留已有行的 id 且不修改 name，只有新插入的行需要同步）
+_SYNC_FTS_SQL = """
+    INSERT INTO class_fts (rowid, name)
+    SELECT id, name FROM class_index
+    WHERE id > COALESCE((SELECT rowid FROM class_fts ORDER BY rowid DESC LIMIT 1), 0)
+"""
+
+# 每个连接缓存的预编译语句数：相同 SQL 文本再次执行时直接复用，不再重新解析
+_STATEMENT_CACHE_SIZE = 256
+
+# add_class 写入缓冲的条数上限，满后批量写入
+_PENDING_LIMIT = 500
+
+# 按 id 批量读取边时每条语句的 id 数（语句中出现两次，需低于 SQLite 旧版本 999 个参数的上限）
+_EDGE_QUERY_CHUNK = 400
+
+
+def _class_rows(class_infos: Iterable[Dict[str, Any]]) -> Iterator[Tuple]:
+    """
+    逐个生成类行的写入参数（executemany 直接消费，不在内存中物化整批参数）
+
+    Args:
+        class_infos: 类信息列表
+
+    Returns:
+        按 _UPSERT_CLASS_SQL 列顺序排列的参数元组迭代器
+    """
+    for cls_info in class_infos:
+        yield (
+            cls_info['name'],
+            cls_info['module'],
+            cls_info.get('namespace', ''),
+            cls_info.get('file_path', ''),
+            cls_info.get('line_number', 0),
+            cls_info.get('is_uclass', False),
+            cls_info.get('is_struct', False),
+            cls_info.get('is_interface', False),
+            cls_info.get('is_blueprintable', False),
+            cls_info.get('method_count', 0),
+            cls_info.get('property_count', 0)
+        )
+
+
+def _class_keys(class_infos: Iterable[Dict[str, Any]]) -> Iterator[Tuple]:
+    """生成类的唯一键 (name, module, file_path, line_number)"""
+    for info in class_infos:
+        yield (info['name'], info['module'], info.get('file_path', ''), info.get('line_number', 0))
+
+
+def _last_per_key(class_infos: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    按唯一键去重，同一键保留最后一次出现的类信息（与逐条写入时后写覆盖前写一致）
+
+    Args:
+        class_infos: 类信息列表
+
+    Returns:
+        去重后的类信息列表
+    """
+    latest = {}
+    for info in class_infos:
+        latest[(info['name'], info['module'], info.get('file_path', ''), info.get('line_number', 0))] = info
+    return list(latest.values())
+
+
+def _edge_rows(class_infos: Iterable[Dict[str, Any]], field: str) -> Iterator[Tuple]:
+    """
+    生成继承边 / 接口边的写入参数
+
+    Args:
+        class_infos: 类信息列表
+        field: 'parent_classes' 或 'interfaces'
+
+    Returns:
+        (目标名, 位置, name, module, file_path, line_number) 迭代器
+    """
+    for info in class_infos:
+        key = (info['name'], info['module'], info.get('file_path', ''), info.get('line_number', 0))
+        for position, target in enumerate(info.get(field, [])):
+            yield (target, position) + key
 
 
 class ClassIndex:
@@ -21,22 +176,109 @@ class ClassIndex:
     - 存储完整的类继承和属性信息
     """
 
-    def __init__(self, db_path: str):
+    # query_by_name 的查询语句（自动补全等场景高频调用，固定文本以命中语句缓存）
+    _QUERY_BY_NAME_SQL = f"""
+        SELECT {_CLASS_SELECT} FROM class_index c
+        WHERE name = ?
+        ORDER BY is_uclass DESC, module ASC
+    """
+    _QUERY_BY_NAME_MODULE_SQL = f"""
+        SELECT {_CLASS_SELECT} FROM class_index c
+        WHERE name = ? AND module LIKE ?
+        ORDER BY is_uclass DESC, module ASC
+    """
+
+    # 二级索引（批量写入完成后由 create_indexes 创建）。
+    # 布尔列不建完整索引（选择性太低，只增加写入开销）；
+    # query_blueprintable 用只包含 is_blueprintable = 1 行的部分索引
+    _INDEX_DDL = (
+        "CREATE INDEX IF NOT EXISTS idx_class_name ON class_index(name)",
+        "CREATE INDEX IF NOT EXISTS idx_class_module ON class_index(module)",
+        "CREATE INDEX IF NOT EXISTS idx_class_namespace ON class_index(namespace)",
+        "CREATE INDEX IF NOT EXISTS idx_class_blueprintable_partial "
+        "ON class_index(is_blueprintable) WHERE is_blueprintable = 1",
+        "CREATE INDEX IF NOT EXISTS idx_parent_name ON class_parent_edge(parent_name)",
+    )
+
+    def __init__(self, db_path: str, in_memory: bool = False):
         """
         初始化类索引
 
         Args:
             db_path: SQLite 数据库路径
+            in_memory: 是否在内存数据库中构建（批量构建用）。已有的数据库文件先载入内存，
+                显式调用 save() 时通过 VACUUM INTO 整体写回 db_path
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.in_memory = in_memory
+        self._closed = False
+
+        # add_class 的写入缓冲（满 _pending_limit 条或 commit() 时批量写入）
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_limit = _PENDING_LIMIT
+
+        # 自动提交模式：写事务由 _begin_write 显式开启（BEGIN IMMEDIATE）
+        self.conn = sqlite3.connect(
+            ':memory:' if in_memory else str(self.db_path),
+            isolation_level=None, cached_statements=_STATEMENT_CACHE_SIZE
+        )
+        if in_memory:
+            self._load_from_disk()
+        self._configure_pragmas()
+
+        # 查询走独立的只读连接（每线程一个），WAL 下读写互不阻塞
+        self._local = threading.local()
+        self._read_conns: List[sqlite3.Connection] = []
+
+        self._create_tables()
+
+    def _load_from_disk(self) -> None:
+        """内存模式：把已有的数据库文件复制到内存连接（增量构建在已有数据上进行）"""
+        if not self.db_path.exists():
+            return
+        source = sqlite3.connect(str(self.db_path))
+        try:
+            source.backup(self.conn)
+        finally:
+            source.close()
+
+    def save(self) -> None:
+        """
+        内存模式：将内存数据库写回 db_path
 
-        self.conn = sqlite3.connect(str(self.db_path))
-        self.conn.row_factory = sqlite3.Row
-        self._create_schema()
+        VACUUM INTO 生成紧凑、无碎片的新文件，先写到临时文件再替换，
+        中途失败不会损坏已有的数据库文件
+        """
+        self.flush()
+        self.conn.commit()
 
-    def _create_schema(self) -> None:
-        """创建数据库表结构"""
+        tmp_path = self.db_path.with_name(self.db_path.name + '.tmp')
+        if tmp_path.exists():
+            tmp_path.unlink()
+        self.conn.execute("VACUUM INTO ?", (str(tmp_path),))
+
+        # 旧文件的 WAL / 共享内存文件不属于新数据库
+        for suffix in ('-wal', '-shm'):
+            stale = self.db_path.with_name(self.db_path.name + suffix)
+            if stale.exists():
+                stale.unlink()
+        os.replace(tmp_path, self.db_path)
+
+    def _configure_pragmas(self) -> None:
+        """
+        配置连接参数
+
+        WAL 模式下读查询不阻塞写入，synchronous=NORMAL 避免每次提交都 fsync；
+        journal_mode 是持久化到数据库文件的，已是 WAL 时不再重复切换；内存数据库不使用 WAL
+        """
+        (journal_mode,) = self.conn.execute("PRAGMA journal_mode").fetchone()
+        if journal_mode.lower() != 'wal' and not self.in_memory:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_CONNECTION_PRAGMAS)
+
+    def _create_tables(self) -> None:
+        """创建数据库表结构（二级索引由 create_indexes 在批量写入后创建）"""
         cursor = self.conn.cursor()
 
         # 创建类索引表
@@ -46,8 +288,8 @@ class ClassIndex:
                 name TEXT NOT NULL,
                 module TEXT NOT NULL,
                 namespace TEXT,
-                parent_classes TEXT,              -- JSON 序列化
-                interfaces TEXT,                  -- JSON 序列化
+                parent_classes TEXT,              -- 旧版本的 JSON 列（现存于 class_parent_edge）
+                interfaces TEXT,                  -- 旧版本的 JSON 列（现存于 class_interface_edge）
                 file_path TEXT,
                 line_number INTEGER,
                 is_uclass BOOLEAN DEFAULT 0,
@@ -60,46 +302,207 @@ class ClassIndex:
             )
         """)
 
-        # 创建索引以优化查询
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_class_name ON class_index(name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_class_module ON class_index(module)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_class_namespace ON class_index(namespace)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_class_uclass ON class_index(is_uclass)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_class_blueprintable ON class_index(is_blueprintable)")
+        # 记录二级索引是否已创建
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+
+        # 父类 / 接口列表存于子表（position 保留声明顺序）：
+        # query_by_parent 按父类名走索引，读写时也无需 JSON 序列化
+        parent_columns = {
+            row[1] for row in cursor.execute("PRAGMA table_info(class_parent_edge)").fetchall()
+        }
+        has_interface_edges = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'class_interface_edge'"
+        ).fetchone()
+        if parent_columns and 'position' not in parent_columns:
+            # 早期的继承边表没有记录顺序，从 JSON 列重新生成
+            cursor.execute("DROP TABLE class_parent_edge")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS class_parent_edge (
+                child_id INTEGER NOT NULL,
+                parent_name TEXT NOT NULL,
+                position INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (child_id, parent_name)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS class_interface_edge (
+                child_id INTEGER NOT NULL,
+                interface_name TEXT NOT NULL,
+                position INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (child_id, interface_name)
+            )
+        """)
+
+        # 类名全文索引（trigram 分词）：search_by_keyword 的 LIKE '%kw%' 由 FTS5 索引完成，
+        # 不再扫描整张表。批量写入期间不逐行维护，由 _sync_fts 一次性补入新行；
+        # SQLite 不支持 FTS5/trigram 时退化为直接 LIKE
+        has_fts = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'class_fts'"
+        ).fetchone()
+        try:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS class_fts USING fts5(name, tokenize='trigram')"
+            )
+            # 早期版本用触发器逐行写入全文索引，改为批量同步
+            cursor.execute("DROP TRIGGER IF EXISTS class_fts_insert")
+            self._has_fts = True
+        except sqlite3.OperationalError:
+            self._has_fts = False
 
         self.conn.commit()
 
+        # 数据库迁移：旧版本数据库从 JSON 列回填继承边 / 接口边、从类名回填全文索引
+        if 'position' not in parent_columns or not has_interface_edges:
+            self._backfill_edges()
+        if self._has_fts and not has_fts:
+            # 新建的全文索引由 create_indexes 回填
+            cursor.execute("DELETE FROM meta WHERE key = 'indexes_built'")
+        has_bool_indexes = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_class_uclass'"
+        ).fetchone()
+        if has_bool_indexes:
+            # 旧版本在布尔列上建有完整索引，删除后由 create_indexes 补建部分索引
+            print("  [迁移] 删除 idx_class_uclass / idx_class_blueprintable 索引")
+            cursor.execute("DROP INDEX IF EXISTS idx_class_uclass")
+            cursor.execute("DROP INDEX IF EXISTS idx_class_blueprintable")
+            cursor.execute("DELETE FROM meta WHERE key = 'indexes_built'")
+
+        row = cursor.execute("SELECT value FROM meta WHERE key = 'indexes_built'").fetchone()
+        self._indexes_built = row is not None and row[0] == '1'
+        if not self._indexes_built and cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_class_name'"
+        ).fetchone():
+            # 旧版本在打开时即建索引且不写 meta 标记（或迁移清除了标记）：在打开时补齐，
+            # 查询路径从不写入（只读连接可在任意线程使用）
+            self.create_indexes()
+
+    def _backfill_edges(self) -> None:
+        """从旧版本的 parent_classes / interfaces JSON 列回填继承边和接口边"""
+        cursor = self.conn.cursor()
+        rows = cursor.execute("""
+            SELECT id, parent_classes, interfaces FROM class_index
+            WHERE parent_classes IS NOT NULL OR interfaces IS NOT NULL
+        """).fetchall()
+        parent_edges = [
+            (row[0], parent, position)
+            for row in rows
+            for position, parent in enumerate(json_loads(row[1] or '[]'))
+        ]
+        interface_edges = [
+            (row[0], interface, position)
+            for row in rows
+            for position, interface in enumerate(json_loads(row[2] or '[]'))
+        ]
+
+        self._begin_write()
+        # 新建的边表需要重新创建其二级索引
+        cursor.execute("DELETE FROM meta WHERE key = 'indexes_built'")
+        self._indexes_built = False
+        if parent_edges or interface_edges:
+            print("  [迁移] 填充 class_parent_edge / class_interface_edge 表")
+        cursor.executemany(
+            "INSERT OR IGNORE INTO class_parent_edge (child_id, parent_name, position) VALUES (?, ?, ?)",
+            parent_edges
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO class_interface_edge (child_id, interface_name, position) VALUES (?, ?, ?)",
+            interface_edges
+        )
+        self.conn.commit()
+
+    def create_indexes(self) -> None:
+        """
+        创建二级索引以优化查询
+
+        先写入数据再建索引，避免批量写入时逐行维护多棵 B-tree；
+        构建流程在写入完成后调用；查询不会补建（未建索引时查询仍可用，关键字搜索退化为 LIKE）
+        """
+        cursor = self.conn.cursor()
+        self._begin_write()
+        self._sync_fts(cursor)
+        for ddl in self._INDEX_DDL:
+            cursor.execute(ddl)
+        cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('indexes_built', '1')")
+        self.conn.commit()
+        self._indexes_built = True
+
+        # 索引与数据就绪后收集统计信息，供查询规划器选择索引
+        self.analyze()
+
+    def _sync_fts(self, cursor: sqlite3.Cursor) -> None:
+        """将尚未进入全文索引的新类行批量写入 class_fts（需在写事务内调用）"""
+        if self._has_fts:
+            cursor.execute(_SYNC_FTS_SQL)
+
+    def analyze(self) -> None:
+        """
+        收集表和索引的统计信息（ANALYZE）
+
+        批量写入后若不运行，规划器缺少统计信息，
+        带 module LIKE 条件的 query_by_name 等查询可能选错索引
+        """
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+
+    def _read_conn(self) -> sqlite3.Connection:
+        """
+        获取当前线程的只读连接（首次调用时打开）
+
+        写入走 self.conn，查询走只读连接：WAL 模式下构建写入与查询互不阻塞。
+        只读连接只能看到已提交的数据，add_class 之后需先 commit() 再查询。
+        内存模式下没有可共享的数据库文件，查询直接使用写连接
+
+        Returns:
+            只读连接
+        """
+        if self.in_memory:
+            return self.conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path.resolve().as_uri() + '?mode=ro', uri=True,
+                isolation_level=None, check_same_thread=False,
+                cached_statements=_STATEMENT_CACHE_SIZE
+            )
+            conn.executescript(_CONNECTION_PRAGMAS)
+            self._local.conn = conn
+            self._read_conns.append(conn)
+        return conn
+
+    def _begin_write(self) -> None:
+        """
+        开启写事务（已在事务中时沿用当前事务）
+
+        BEGIN IMMEDIATE 在事务开始时即取得写锁，
+        避免 DEFERRED 事务在读锁升级为写锁时与并发读者竞争导致 SQLITE_BUSY
+        """
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+
     def add_class(self, class_info: Dict[str, Any]) -> None:
         """
         添加类到索引
 
+        写入先进入缓冲，满 _pending_limit 条或调用 commit()/flush()/close() 时
+        通过 add_classes_batch 在一个事务内批量写入
+
         Args:
             class_info: 类信息字典
         """
-        cursor = self.conn.cursor()
+        self._pending.append(class_info)
+        if len(self._pending) >= self._pending_limit:
+            self.flush()
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO class_index (
-                name, module, namespace, parent_classes, interfaces,
-                file_path, line_number,
-                is_uclass, is_struct, is_interface, is_blueprintable,
-                method_count, property_count
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            class_info['name'],
-            class_info['module'],
-            class_info.get('namespace', ''),
-            json.dumps(class_info.get('parent_classes', [])),
-            json.dumps(class_info.get('interfaces', [])),
-            class_info.get('file_path', ''),
-            class_info.get('line_number', 0),
-            class_info.get('is_uclass', False),
-            class_info.get('is_struct', False),
-            class_info.get('is_interface', False),
-            class_info.get('is_blueprintable', False),
-            class_info.get('method_count', 0),
-            class_info.get('property_count', 0)
-        ))
+    def flush(self) -> None:
+        """将 add_class 缓冲中的类批量写入数据库"""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.add_classes_batch(pending)
 
     def add_classes_batch(self, class_infos: List[Dict[str, Any]]) -> None:
         """
@@ -108,34 +511,36 @@ class ClassIndex:
         Args:
             class_infos: 类信息列表
         """
+        # 先写入缓冲中较早添加的类，保证同一唯一键以最后写入的为准
+        self.flush()
+        # 同一批内的重复键也以最后一次为准：继承边 / 接口边整体替换而非合并
+        class_infos = _last_per_key(class_infos)
+
         cursor = self.conn.cursor()
 
-        data = []
-        for cls_info in class_infos:
-            data.append((
-                cls_info['name'],
-                cls_info['module'],
-                cls_info.get('namespace', ''),
-                json.dumps(cls_info.get('parent_classes', [])),
-                json.dumps(cls_info.get('interfaces', [])),
-                cls_info.get('file_path', ''),
-                cls_info.get('line_number', 0),
-                cls_info.get('is_uclass', False),
-                cls_info.get('is_struct', False),
-                cls_info.get('is_interface', False),
-                cls_info.get('is_blueprintable', False),
-                cls_info.get('method_count', 0),
-                cls_info.get('property_count', 0)
-            ))
-
-        cursor.executemany("""
-            INSERT OR REPLACE INTO class_index (
-                name, module, namespace, parent_classes, interfaces,
-                file_path, line_number,
-                is_uclass, is_struct, is_interface, is_blueprintable,
-                method_count, property_count
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, data)
+        self._begin_write()
+        try:
+            # 记录写入前的最大 id：upsert 后 id 不超过它的行是就地更新的已有类
+            (max_id,) = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM class_index").fetchone()
+
+            cursor.executemany(_UPSERT_CLASS_SQL, _class_rows(class_infos))
+
+            # 全部为新插入的行时没有旧边需要清理（常见的全量构建路径）
+            (inserted,) = cursor.execute(
+                "SELECT COUNT(*) FROM class_index WHERE id > ?", (max_id,)
+            ).fetchone()
+            if inserted < len(class_infos):
+                cursor.executemany(_DELETE_PARENT_EDGES_SQL, _class_keys(class_infos))
+                cursor.executemany(_DELETE_INTERFACE_EDGES_SQL, _class_keys(class_infos))
+
+            cursor.executemany(_INSERT_PARENT_EDGE_SQL, _edge_rows(class_infos, 'parent_classes'))
+            cursor.executemany(_INSERT_INTERFACE_EDGE_SQL, _edge_rows(class_infos, 'interfaces'))
+            # 已建好索引的库（增量写入）立即同步全文索引，否则留给 create_indexes 一次完成
+            if self._indexes_built:
+                self._sync_fts(cursor)
+        except BaseException:
+            self.conn.rollback()
+            raise
 
         self.conn.commit()
 
@@ -150,22 +555,15 @@ class ClassIndex:
         Returns:
             类信息列表
         """
-        cursor = self.conn.cursor()
+        conn = self._read_conn()
 
+        # 直接用 conn.execute：复用连接的内部游标和已缓存的预编译语句
         if module_hint:
-            cursor.execute("""
-                SELECT * FROM class_index
-                WHERE name = ? AND module LIKE ?
-                ORDER BY is_uclass DESC, module ASC
-            """, (name, f'%{module_hint}%'))
+            rows = conn.execute(self._QUERY_BY_NAME_MODULE_SQL, (name, f'%{module_hint}%')).fetchall()
         else:
-            cursor.execute("""
-                SELECT * FROM class_index
-                WHERE name = ?
-                ORDER BY is_uclass DESC, module ASC
-            """, (name,))
+            rows = conn.execute(self._QUERY_BY_NAME_SQL, (name,)).fetchall()
 
-        return [self._row_to_dict(row) for row in cursor.fetchall()]
+        return self._rows_to_dicts(rows)
 
     def search_by_keyword(self, keyword: str, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -178,15 +576,25 @@ class ClassIndex:
         Returns:
             类信息列表
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM class_index
-            WHERE name LIKE ?
-            ORDER BY is_uclass DESC, name ASC
-            LIMIT ?
-        """, (f'%{keyword}%', limit))
+        conn = self._read_conn()
+        # 全文索引在 create_indexes 时才补入新行，之前直接 LIKE
+        if self._has_fts and self._indexes_built and len(keyword) >= _FTS_MIN_CHARS:
+            rows = conn.execute(f"""
+                SELECT {_CLASS_SELECT} FROM class_fts f
+                JOIN class_index c ON c.id = f.rowid
+                WHERE f.name LIKE ?
+                ORDER BY c.is_uclass DESC, c.name ASC, c.id ASC
+                LIMIT ?
+            """, (f'%{keyword}%', limit)).fetchall()
+        else:
+            rows = conn.execute(f"""
+                SELECT {_CLASS_SELECT} FROM class_index c
+                WHERE name LIKE ?
+                ORDER BY is_uclass DESC, name ASC
+                LIMIT ?
+            """, (f'%{keyword}%', limit)).fetchall()
 
-        return [self._row_to_dict(row) for row in cursor.fetchall()]
+        return self._rows_to_dicts(rows)
 
     def query_by_module(self, module: str) -> List[Dict[str, Any]]:
         """
@@ -198,12 +606,11 @@ class ClassIndex:
         Returns:
             类信息列表
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM class_index WHERE module = ?
-        """, (module,))
+        rows = self._read_conn().execute(f"""
+            SELECT {_CLASS_SELECT} FROM class_index c WHERE module = ?
+        """, (module,)).fetchall()
 
-        return [self._row_to_dict(row) for row in cursor.fetchall()]
+        return self._rows_to_dicts(rows)
 
     def query_by_parent(self, parent_class: str, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -216,15 +623,15 @@ class ClassIndex:
         Returns:
             子类信息列表
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM class_index
-            WHERE parent_classes LIKE ?
-            ORDER BY name ASC
+        rows = self._read_conn().execute(f"""
+            SELECT {_CLASS_SELECT} FROM class_parent_edge e
+            JOIN class_index c ON c.id = e.child_id
+            WHERE e.parent_name = ?
+            ORDER BY c.name ASC
             LIMIT ?
-        """, (f'%"{parent_class}"%', limit))
+        """, (parent_class, limit)).fetchall()
 
-        return [self._row_to_dict(row) for row in cursor.fetchall()]
+        return self._rows_to_dicts(rows)
 
     def query_blueprintable(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -236,53 +643,86 @@ class ClassIndex:
         Returns:
             类信息列表
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM class_index
+        rows = self._read_conn().execute(f"""
+            SELECT {_CLASS_SELECT} FROM class_index c
             WHERE is_blueprintable = 1
             LIMIT ?
-        """, (limit,))
+        """, (limit,)).fetchall()
+
+        return self._rows_to_dicts(rows)
+
+    def _rows_to_dicts(self, rows: List[Tuple]) -> List[Dict[str, Any]]:
+        """
+        将查询结果转换为字典列表，并填充父类 / 接口列表
+
+        所有结果行的继承边和接口边通过一条按 id 批量查询的语句取回并在 Python 中分组，
+        而不是逐行反序列化 JSON
+
+        Args:
+            rows: class_index 查询结果（按 _CLASS_COLUMNS 排列的元组）
 
-        return [self._row_to_dict(row) for row in cursor.fetchall()]
+        Returns:
+            类信息列表
+        """
+        results = [self._row_to_dict(row) for row in rows]
+        by_id = {info['id']: info for info in results}
+        ids = list(by_id)
+        conn = self._read_conn()
+
+        for start in range(0, len(ids), _EDGE_QUERY_CHUNK):
+            chunk = ids[start:start + _EDGE_QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            edges = conn.execute(f"""
+                SELECT child_id, parent_name, 'parent_classes', position
+                FROM class_parent_edge WHERE child_id IN ({placeholders})
+                UNION ALL
+                SELECT child_id, interface_name, 'interfaces', position
+                FROM class_interface_edge WHERE child_id IN ({placeholders})
+                ORDER BY position
+            """, chunk + chunk)
+            for child_id, target, field, _ in edges:
+                by_id[child_id][field].append(target)
+
+        return results
+
+    def _row_to_dict(self, row: Tuple) -> Dict[str, Any]:
+        """
+        将数据库行转换为字典（父类 / 接口列表由 _rows_to_dicts 填充）
 
-    def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
-        """将数据库行转换为字典"""
+        行是按 _CLASS_COLUMNS 排列的普通元组，按位置取值，
+        不经过 sqlite3.Row 的按列名查找
+        """
         return {
-            'id': row['id'],
-            'name': row['name'],
-            'module': row['module'],
-            'namespace': row['namespace'],
-            'parent_classes': json.loads(row['parent_classes']) if row['parent_classes'] else [],
-            'interfaces': json.loads(row['interfaces']) if row['interfaces'] else [],
-            'file_path': row['file_path'],
-            'line_number': row['line_number'],
-            'is_uclass': bool(row['is_uclass']),
-            'is_struct': bool(row['is_struct']),
-            'is_interface': bool(row['is_interface']),
-            'is_blueprintable': bool(row['is_blueprintable']),
-            'method_count': row['method_count'],
-            'property_count': row['property_count']
+            'id': row[0],
+            'name': row[1],
+            'module': row[2],
+            'namespace': row[3],
+            'parent_classes': [],
+            'interfaces': [],
+            'file_path': row[4],
+            'line_number': row[5],
+            'is_uclass': bool(row[6]),
+            'is_struct': bool(row[7]),
+            'is_interface': bool(row[8]),
+            'is_blueprintable': bool(row[9]),
+            'method_count': row[10],
+            'property_count': row[11]
         }
 
     def get_statistics(self) -> Dict[str, Any]:
         """获取索引统计信息"""
-        cursor = self.conn.cursor()
-
-        # 总类数
-        cursor.execute("SELECT COUNT(*) FROM class_index")
-        total = cursor.fetchone()[0]
-
-        # UClass 数量
-        cursor.execute("SELECT COUNT(*) FROM class_index WHERE is_uclass = 1")
-        uclass_count = cursor.fetchone()[0]
+        cursor = self._read_conn().cursor()
 
-        # UStruct 数量
-        cursor.execute("SELECT COUNT(*) FROM class_index WHERE is_struct = 1")
-        struct_count = cursor.fetchone()[0]
-
-        # Blueprintable 类数量
-        cursor.execute("SELECT COUNT(*) FROM class_index WHERE is_blueprintable = 1")
-        blueprintable_count = cursor.fetchone()[0]
+        # 总类数与各类型数量：一次扫描中用条件计数同时得到（空表时 SUM 为 NULL）
+        cursor.execute("""
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(is_uclass = 1), 0),
+                COALESCE(SUM(is_struct = 1), 0),
+                COALESCE(SUM(is_blueprintable = 1), 0)
+            FROM class_index
+        """)
+        total, uclass_count, struct_count, blueprintable_count = cursor.fetchone()
 
         # 按模块统计
         cursor.execute("""
@@ -303,14 +743,26 @@ class ClassIndex:
         }
 
     def commit(self) -> None:
-        """提交事务"""
+        """写入缓冲并提交事务"""
+        self.flush()
         self.conn.commit()
 
     def close(self) -> None:
-        """关闭数据库连接"""
+        """
+        写入缓冲并关闭数据库连接（先关闭只读连接，最后关闭写连接以便 WAL 检查点落盘）
+
+        内存模式下不会自动写回，需要保留的数据应在关闭前显式调用 save()
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if not self.in_memory:
+            self.flush()
+        for conn in getattr(self, '_read_conns', ()):
+            conn.close()
         self.conn.close()
 
     def __del__(self):
         """析构时关闭连接"""
         if hasattr(self, 'conn'):
-            self.conn.close()
+            self.close()
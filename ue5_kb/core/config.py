@@ -6,9 +6,17 @@ UE5 知识库系统 - 配置管理模块
 
 import os
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# 优先使用 libyaml 的 C 实现，未编译 libyaml 时回退到纯 Python 实现
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# 点分隔键查找结果的缓存条数（便捷属性在构建循环中被反复读取）
+_GET_CACHE_SIZE = 128
+
 
 class Config:
     """配置管理器"""
@@ -38,6 +46,9 @@ class Config:
 
         self.config_path = Path(config_path)
 
+        # 按实例缓存点分隔键的查找结果，set() / _load_config() 时清空
+        self._get_cached = lru_cache(maxsize=_GET_CACHE_SIZE)(self._lookup)
+
         # 如果配置文件不存在，创建默认配置
         if not self.config_path.exists():
             self._create_default_config(base_path)
@@ -100,25 +111,31 @@ class Config:
             default_config['module_categories'] = ['Runtime', 'Editor', 'Developer', 'Programs']
 
         with open(self.config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(default_config, f, allow_unicode=True, default_flow_style=False)
+            yaml.dump(default_config, f, Dumper=_YAML_DUMPER, allow_unicode=True, default_flow_style=False)
 
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件"""
         if not self.config_path.exists():
             raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
 
+        self._get_cached.cache_clear()
+
         with open(self.config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
 
         # 转换路径为绝对路径
         storage = config.get('storage', {})
         base_path = storage.get('base_path', '')
 
-        # 确保所有路径都是绝对路径
+        # 基础路径只做一次 abspath（读取一次当前目录），其余路径在其上做纯字符串的 join + normpath；
+        # 同时保存 Path 对象，storage_path() 无需每次重新构造
+        base_abs = os.path.abspath(base_path)
+        self._storage_paths: Dict[str, Path] = {'base_path': Path(base_abs)}
         for key, value in storage.items():
             if key != 'base_path' and isinstance(value, str):
-                full_path = os.path.join(base_path, value)
-                storage[key] = os.path.abspath(full_path)
+                full_path = os.path.normpath(os.path.join(base_abs, value))
+                storage[key] = full_path
+                self._storage_paths[key] = Path(full_path)
 
         return config
 
@@ -133,16 +150,28 @@ class Config:
         Returns:
             配置值
         """
-        keys = key.split('.')
+        value = self._get_cached(key)
+        return value if value is not None else default
+
+    def _lookup(self, key: str) -> Any:
+        """
+        按点分隔的路径查找配置值（结果由 _get_cached 缓存）
+
+        Args:
+            key: 配置键
+
+        Returns:
+            配置值，路径不存在时为 None
+        """
         value = self._config
 
-        for k in keys:
+        for k in key.split('.'):
             if isinstance(value, dict):
                 value = value.get(k)
             else:
-                return default
+                return None
 
-        return value if value is not None else default
+        return value
 
     def set(self, key: str, value: Any) -> None:
         """
@@ -161,11 +190,30 @@ class Config:
             config = config[k]
 
         config[keys[-1]] = value
+        self._get_cached.cache_clear()
+        if keys[0] == 'storage':
+            # 已解析的存储路径失效，storage_path() 改为按新值计算
+            self._storage_paths.clear()
 
     def save(self) -> None:
         """保存配置到文件"""
         with open(self.config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(self._config, f, allow_unicode=True, default_flow_style=False)
+            yaml.dump(self._config, f, Dumper=_YAML_DUMPER, allow_unicode=True, default_flow_style=False)
+
+    def storage_path(self, key: str) -> Path:
+        """
+        获取存储目录的绝对路径（Path 对象，加载配置时已解析）
+
+        Args:
+            key: storage 下的键，如 'global_index'、'module_graphs'
+
+        Returns:
+            绝对路径
+        """
+        path = self._storage_paths.get(key)
+        if path is None:
+            path = Path(os.path.abspath(self.get(f'storage.{key}', '')))
+        return path
 
     # 便捷属性访问器
     @property
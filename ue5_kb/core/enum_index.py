@@ -5,9 +5,67 @@ UE5 知识库系统 - 枚举快速索引 (v2.14.0 新增)
 """
 
 import sqlite3
-import json
+import threading
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+from ..utils.fast_json import json_dumps, json_loads
+
+
+# 每个连接的性能参数：64 MiB 页缓存、256 MiB mmap、临时表放内存、锁等待 5 秒
+_CONNECTION_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=5000;
+"""
+
+# add_enum 写入缓冲的条数上限，满后批量写入
+_PENDING_LIMIT = 500
+
+# trigram 分词至少需要 3 个字符，更短的关键字直接对主表 LIKE
+_FTS_MIN_CHARS = 3
+
+# 查询返回的列（按位置读取元组行，顺序与 _row_to_dict 对应）
+_ENUM_COLUMNS = (
+    'id', 'name', 'module', 'namespace', 'values_json', 'is_uenum',
+    'file_path', 'line_number', 'doc_comment', 'specifiers',
+)
+_ENUM_SELECT = ', '.join(f'e.{column}' for column in _ENUM_COLUMNS)
+
+# 写入枚举行（唯一键冲突时就地更新，保留 id）
+_UPSERT_ENUM_SQL = """
+    INSERT INTO enum_index (
+        name, module, namespace, values_json, is_uenum,
+        file_path, line_number, doc_comment, specifiers
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(name, module, file_path, line_number) DO UPDATE SET
+        namespace = excluded.namespace,
+        values_json = excluded.values_json,
+        is_uenum = excluded.is_uenum,
+        doc_comment = excluded.doc_comment,
+        specifiers = excluded.specifiers
+"""
+
+# 每个连接缓存的预编译语句数（相同 SQL 文本复用已编译语句）
+_STATEMENT_CACHE_SIZE = 256
+
+
+def _enum_rows(enum_infos: Iterable[Dict[str, Any]]) -> Iterator[Tuple]:
+    """
+    逐个生成枚举行的写入参数（executemany 直接消费，不物化整批参数）
+
+    枚举值 / 说明符用 fast_json 序列化后解码为 TEXT 存储：
+    与已有数据库的列内容一致，LIKE 与 trigram 全文索引按文本匹配
+    """
+    for e in enum_infos:
+        yield (
+            e['name'], e['module'], e.get('namespace', ''),
+            json_dumps(e.get('values', [])).decode('utf-8'), e.get('is_uenum', False),
+            e.get('file_path', ''), e.get('line_number', 0),
+            e.get('doc_comment', ''), json_dumps(e.get('specifiers', {})).decode('utf-8')
+        )
 
 
 class EnumIndex:
@@ -21,14 +79,49 @@ class EnumIndex:
     - 存储枚举值列表和 UENUM 说明符
     """
 
+    _QUERY_BY_NAME_SQL = f"""
+        SELECT {_ENUM_SELECT} FROM enum_index e WHERE name = ?
+        ORDER BY is_uenum DESC, module ASC
+    """
+    _QUERY_BY_NAME_MODULE_SQL = f"""
+        SELECT {_ENUM_SELECT} FROM enum_index e WHERE name = ? AND module LIKE ?
+        ORDER BY is_uenum DESC, module ASC
+    """
+
+    _INDEX_DDL = (
+        "CREATE INDEX IF NOT EXISTS idx_enum_name ON enum_index(name)",
+        "CREATE INDEX IF NOT EXISTS idx_enum_module ON enum_index(module)",
+        "CREATE INDEX IF NOT EXISTS idx_enum_uenum ON enum_index(is_uenum)",
+    )
+
     def __init__(self, db_path: str):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(self.db_path))
-        self.conn.row_factory = sqlite3.Row
-        self._create_schema()
 
-    def _create_schema(self) -> None:
+        # add_enum 的写入缓冲（满 _pending_limit 条或 commit() 时批量写入）
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_limit = _PENDING_LIMIT
+
+        # 自动提交模式：写事务由 _begin_write 显式开启（BEGIN IMMEDIATE）
+        self.conn = sqlite3.connect(
+            str(self.db_path), isolation_level=None, cached_statements=_STATEMENT_CACHE_SIZE
+        )
+        self._configure_pragmas()
+
+        # 查询走独立的只读连接（每线程一个），WAL 下读写互不阻塞
+        self._local = threading.local()
+        self._read_conns: List[sqlite3.Connection] = []
+        self._create_tables()
+
+    def _configure_pragmas(self) -> None:
+        """配置连接参数（WAL + synchronous=NORMAL 等，已是 WAL 时不再切换）"""
+        (journal_mode,) = self.conn.execute("PRAGMA journal_mode").fetchone()
+        if journal_mode.lower() != 'wal':
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_CONNECTION_PRAGMAS)
+
+    def _create_tables(self) -> None:
+        """创建表结构（二级索引由 create_indexes 在批量写入后创建）"""
         cursor = self.conn.cursor()
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS enum_index (
@@ -45,99 +138,171 @@ class EnumIndex:
                 UNIQUE(name, module, file_path, line_number)
             )
         """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_enum_name ON enum_index(name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_enum_module ON enum_index(module)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_enum_uenum ON enum_index(is_uenum)")
+        cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        # 枚举名与枚举值的全文索引（trigram），供 search_by_keyword / search_by_value 使用；
+        # 不支持 FTS5/trigram 时退化为直接 LIKE
+        has_fts = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'enum_fts'"
+        ).fetchone()
+        try:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS enum_fts "
+                "USING fts5(name, values_json, tokenize='trigram')"
+            )
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS enum_fts_insert AFTER INSERT ON enum_index
+                BEGIN
+                    INSERT INTO enum_fts (rowid, name, values_json)
+                    VALUES (new.id, new.name, new.values_json);
+                END
+            """)
+            # upsert 就地更新已有行（id、name 不变），只需同步枚举值
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS enum_fts_update AFTER UPDATE OF values_json ON enum_index
+                BEGIN
+                    UPDATE enum_fts SET values_json = new.values_json WHERE rowid = new.id;
+                END
+            """)
+            self._has_fts = True
+        except sqlite3.OperationalError:
+            self._has_fts = False
         self.conn.commit()
 
-    def add_enum(self, enum_info: Dict[str, Any]) -> None:
+        if self._has_fts and not has_fts:
+            cursor.execute(
+                "INSERT INTO enum_fts (rowid, name, values_json) "
+                "SELECT id, name, values_json FROM enum_index"
+            )
+        row = cursor.execute("SELECT value FROM meta WHERE key = 'indexes_built'").fetchone()
+        self._indexes_built = row is not None and row[0] == '1'
+        if not self._indexes_built and cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_enum_name'"
+        ).fetchone():
+            # 旧版本在打开时即建索引且不写 meta 标记（或迁移清除了标记）：在打开时补齐，
+            # 查询路径从不写入（只读连接可在任意线程使用）
+            self.create_indexes()
+
+    def create_indexes(self) -> None:
+        """创建二级索引（先写入数据再建索引；查询不会补建，未建索引时查询仍可用）"""
         cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO enum_index (
-                name, module, namespace, values_json, is_uenum,
-                file_path, line_number, doc_comment, specifiers
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            enum_info['name'],
-            enum_info['module'],
-            enum_info.get('namespace', ''),
-            json.dumps(enum_info.get('values', [])),
-            enum_info.get('is_uenum', False),
-            enum_info.get('file_path', ''),
-            enum_info.get('line_number', 0),
-            enum_info.get('doc_comment', ''),
-            json.dumps(enum_info.get('specifiers', {}))
-        ))
+        self._begin_write()
+        # 早期版本以 INSERT OR REPLACE 写入，清理其留下的旧全文索引行
+        if self._has_fts:
+            cursor.execute("DELETE FROM enum_fts WHERE rowid NOT IN (SELECT id FROM enum_index)")
+        for ddl in self._INDEX_DDL:
+            cursor.execute(ddl)
+        cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('indexes_built', '1')")
+        self.conn.commit()
+        self._indexes_built = True
+        self.analyze()
+
+    def analyze(self) -> None:
+        """收集统计信息（ANALYZE），供查询规划器选择索引"""
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+
+    def _read_conn(self) -> sqlite3.Connection:
+        """获取当前线程的只读连接（首次调用时打开；只能看到已提交的数据）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path.resolve().as_uri() + '?mode=ro', uri=True,
+                isolation_level=None, check_same_thread=False,
+                cached_statements=_STATEMENT_CACHE_SIZE
+            )
+            conn.executescript(_CONNECTION_PRAGMAS)
+            self._local.conn = conn
+            self._read_conns.append(conn)
+        return conn
+
+    def _begin_write(self) -> None:
+        """开启写事务（BEGIN IMMEDIATE 立即取得写锁；已在事务中时沿用）"""
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+
+    def add_enum(self, enum_info: Dict[str, Any]) -> None:
+        """添加枚举（先进入写入缓冲，满 _pending_limit 条或 commit() 时批量写入）"""
+        self._pending.append(enum_info)
+        if len(self._pending) >= self._pending_limit:
+            self.flush()
+
+    def flush(self) -> None:
+        """将 add_enum 缓冲中的枚举批量写入数据库"""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.add_enums_batch(pending)
 
     def add_enums_batch(self, enum_infos: List[Dict[str, Any]]) -> None:
-        cursor = self.conn.cursor()
-        data = []
-        for e in enum_infos:
-            data.append((
-                e['name'], e['module'], e.get('namespace', ''),
-                json.dumps(e.get('values', [])), e.get('is_uenum', False),
-                e.get('file_path', ''), e.get('line_number', 0),
-                e.get('doc_comment', ''), json.dumps(e.get('specifiers', {}))
-            ))
-        cursor.executemany("""
-            INSERT OR REPLACE INTO enum_index (
-                name, module, namespace, values_json, is_uenum,
-                file_path, line_number, doc_comment, specifiers
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, data)
+        # 先写入缓冲中较早添加的枚举，保证同一唯一键以最后写入的为准
+        self.flush()
+        self._begin_write()
+        try:
+            self.conn.executemany(_UPSERT_ENUM_SQL, _enum_rows(enum_infos))
+        except BaseException:
+            self.conn.rollback()
+            raise
         self.conn.commit()
 
     def query_by_name(self, name: str, module_hint: Optional[str] = None) -> List[Dict[str, Any]]:
-        cursor = self.conn.cursor()
+        conn = self._read_conn()
         if module_hint:
-            cursor.execute("""
-                SELECT * FROM enum_index WHERE name = ? AND module LIKE ?
-                ORDER BY is_uenum DESC, module ASC
-            """, (name, f'%{module_hint}%'))
+            rows = conn.execute(self._QUERY_BY_NAME_MODULE_SQL, (name, f'%{module_hint}%'))
         else:
-            cursor.execute("""
-                SELECT * FROM enum_index WHERE name = ?
-                ORDER BY is_uenum DESC, module ASC
-            """, (name,))
-        return [self._row_to_dict(row) for row in cursor.fetchall()]
+            rows = conn.execute(self._QUERY_BY_NAME_SQL, (name,))
+        return [self._row_to_dict(row) for row in rows.fetchall()]
 
     def search_by_keyword(self, keyword: str, limit: int = 50) -> List[Dict[str, Any]]:
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM enum_index WHERE name LIKE ?
-            ORDER BY is_uenum DESC, name ASC LIMIT ?
-        """, (f'%{keyword}%', limit))
-        return [self._row_to_dict(row) for row in cursor.fetchall()]
+        conn = self._read_conn()
+        if self._has_fts and len(keyword) >= _FTS_MIN_CHARS:
+            rows = conn.execute(f"""
+                SELECT {_ENUM_SELECT} FROM enum_fts f JOIN enum_index e ON e.id = f.rowid
+                WHERE f.name LIKE ?
+                ORDER BY e.is_uenum DESC, e.name ASC, e.id ASC LIMIT ?
+            """, (f'%{keyword}%', limit))
+        else:
+            rows = conn.execute(f"""
+                SELECT {_ENUM_SELECT} FROM enum_index e WHERE name LIKE ?
+                ORDER BY is_uenum DESC, name ASC LIMIT ?
+            """, (f'%{keyword}%', limit))
+        return [self._row_to_dict(row) for row in rows.fetchall()]
 
     def search_by_value(self, value_keyword: str, limit: int = 50) -> List[Dict[str, Any]]:
         """搜索包含特定枚举值的枚举"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM enum_index WHERE values_json LIKE ?
-            ORDER BY is_uenum DESC, name ASC LIMIT ?
-        """, (f'%{value_keyword}%', limit))
-        return [self._row_to_dict(row) for row in cursor.fetchall()]
+        conn = self._read_conn()
+        if self._has_fts and len(value_keyword) >= _FTS_MIN_CHARS:
+            rows = conn.execute(f"""
+                SELECT {_ENUM_SELECT} FROM enum_fts f JOIN enum_index e ON e.id = f.rowid
+                WHERE f.values_json LIKE ?
+                ORDER BY e.is_uenum DESC, e.name ASC, e.id ASC LIMIT ?
+            """, (f'%{value_keyword}%', limit))
+        else:
+            rows = conn.execute(f"""
+                SELECT {_ENUM_SELECT} FROM enum_index e WHERE values_json LIKE ?
+                ORDER BY is_uenum DESC, name ASC LIMIT ?
+            """, (f'%{value_keyword}%', limit))
+        return [self._row_to_dict(row) for row in rows.fetchall()]
 
-    def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+    def _row_to_dict(self, row: Tuple) -> Dict[str, Any]:
+        """将按 _ENUM_COLUMNS 排列的元组行转换为字典（按位置取值）"""
         return {
-            'id': row['id'],
-            'name': row['name'],
-            'module': row['module'],
-            'namespace': row['namespace'],
-            'values': json.loads(row['values_json']) if row['values_json'] else [],
-            'is_uenum': bool(row['is_uenum']),
-            'file_path': row['file_path'],
-            'line_number': row['line_number'],
-            'doc_comment': row['doc_comment'] or '',
-            'specifiers': json.loads(row['specifiers']) if row['specifiers'] else {}
+            'id': row[0],
+            'name': row[1],
+            'module': row[2],
+            'namespace': row[3],
+            'values': json_loads(row[4]) if row[4] else [],
+            'is_uenum': bool(row[5]),
+            'file_path': row[6],
+            'line_number': row[7],
+            'doc_comment': row[8] or '',
+            'specifiers': json_loads(row[9]) if row[9] else {}
         }
 
     def get_statistics(self) -> Dict[str, Any]:
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM enum_index")
-        total = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM enum_index WHERE is_uenum = 1")
-        uenum_count = cursor.fetchone()[0]
+        cursor = self._read_conn().cursor()
+        # 总数与 UENUM 数量一次扫描得到
+        cursor.execute("SELECT COUNT(*), COALESCE(SUM(is_uenum = 1), 0) FROM enum_index")
+        total, uenum_count = cursor.fetchone()
         cursor.execute("""
             SELECT module, COUNT(*) as count FROM enum_index
             GROUP BY module ORDER BY count DESC LIMIT 10
@@ -146,11 +311,15 @@ class EnumIndex:
         return {'total_enums': total, 'uenum_count': uenum_count, 'top_modules': top_modules}
 
     def commit(self) -> None:
+        self.flush()
         self.conn.commit()
 
     def close(self) -> None:
+        self.flush()
+        for conn in getattr(self, '_read_conns', ()):
+            conn.close()
         self.conn.close()
 
     def __del__(self):
         if hasattr(self, 'conn'):
-            self.conn.close()
+            self.close()
@@ -5,9 +5,79 @@ UE5 知识库系统 - 函数快速索引
 """
 
 import sqlite3
-import json
+import threading
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+from ..utils.fast_json import json_dumps, json_loads
+
+
+# 每个连接的性能参数：64 MiB 页缓存、256 MiB mmap、临时表放内存、锁等待 5 秒
+_CONNECTION_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=5000;
+"""
+
+# 写入函数行（固定的 SQL 文本，重复执行时命中连接的预编译语句缓存）
+_INSERT_FUNCTION_SQL = """
+    INSERT OR REPLACE INTO function_index (
+        name, module, class_name, return_type, parameters, signature,
+        file_path, line_number, impl_file_path, impl_line_number,
+        is_virtual, is_const, is_static, is_override,
+        is_blueprint_callable, ufunction_specifiers
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# 多行 VALUES 每条语句写入的行数（16 列 × 32 行 = 512 个参数，低于 SQLite 默认 999 上限）
+_MULTI_ROW_CHUNK = 32
+
+_ROW_PLACEHOLDERS = '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+
+# 一条语句写入 _MULTI_ROW_CHUNK 行，减少 Python 与 SQLite 之间的往返次数
+_INSERT_FUNCTION_CHUNK_SQL = (
+    _INSERT_FUNCTION_SQL.split('VALUES')[0]
+    + 'VALUES ' + ', '.join([_ROW_PLACEHOLDERS] * _MULTI_ROW_CHUNK)
+)
+
+# add_function 写入缓冲的条数上限，满后批量写入
+_PENDING_LIMIT = 1000
+
+
+def _function_rows(func_infos: Iterable[Dict[str, Any]]) -> Iterator[Tuple]:
+    """
+    逐个生成函数行的写入参数（按块消费，不物化整批参数）
+
+    参数列表 / UFUNCTION 说明符用 fast_json（orjson）序列化，解码为 TEXT 与已有数据保持一致
+
+    Args:
+        func_infos: 函数信息列表
+
+    Returns:
+        按 _INSERT_FUNCTION_SQL 列顺序排列的参数元组迭代器
+    """
+    for func_info in func_infos:
+        yield (
+            func_info['name'],
+            func_info['module'],
+            func_info.get('class_name'),
+            func_info.get('return_type', ''),
+            json_dumps(func_info.get('parameters', [])).decode('utf-8'),
+            func_info.get('signature', ''),
+            func_info.get('file_path', ''),
+            func_info.get('line_number', 0),
+            func_info.get('impl_file_path', ''),
+            func_info.get('impl_line_number', 0),
+            func_info.get('is_virtual', False),
+            func_info.get('is_const', False),
+            func_info.get('is_static', False),
+            func_info.get('is_override', False),
+            func_info.get('is_blueprint_callable', False),
+            json_dumps(func_info.get('ufunction_specifiers', {})).decode('utf-8')
+        )
 
 
 class FunctionIndex:
@@ -20,6 +90,14 @@ class FunctionIndex:
     - 存储完整的函数签名和参数信息
     """
 
+    # 二级索引（批量导入期间由 prepare_bulk_load 删除，finalize_bulk_load 重建）
+    _INDEX_DDL = (
+        "CREATE INDEX IF NOT EXISTS idx_func_name ON function_index(name)",
+        "CREATE INDEX IF NOT EXISTS idx_func_module ON function_index(module)",
+        "CREATE INDEX IF NOT EXISTS idx_func_class ON function_index(class_name)",
+        "CREATE INDEX IF NOT EXISTS idx_func_bp ON function_index(is_blueprint_callable)",
+    )
+
     def __init__(self, db_path: str):
         """
         初始化函数索引
@@ -29,14 +107,50 @@ class FunctionIndex:
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._closed = False
 
-        self.conn = sqlite3.connect(str(self.db_path))
+        # add_function 的写入缓冲（满 _pending_limit 条或 commit() 时批量写入）
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_limit = _PENDING_LIMIT
+
+        # 自动提交模式：写事务由 _begin_write 显式开启（BEGIN IMMEDIATE）
+        self.conn = sqlite3.connect(str(self.db_path), isolation_level=None)
         self.conn.row_factory = sqlite3.Row  # 支持字典式访问
-        self._create_schema()
+        self._configure_pragmas()
+
+        # 查询走独立的只读连接（每线程一个），WAL 下读写互不阻塞
+        self._local = threading.local()
+        self._read_conns: List[sqlite3.Connection] = []
+
+        self._create_table()
+        self._ensure_secondary_indexes()
 
-    def _create_schema(self) -> None:
-        """创建数据库表结构"""
+    def _configure_pragmas(self) -> None:
+        """
+        配置连接参数
+
+        批量写入后紧跟大量点查询：WAL 模式下读查询不阻塞写入，
+        synchronous=NORMAL 避免每次提交都 fsync；内存数据库不使用 WAL
+        """
+        if str(self.db_path) != ':memory:':
+            (journal_mode,) = self.conn.execute("PRAGMA journal_mode").fetchone()
+            if journal_mode.lower() != 'wal':
+                self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_CONNECTION_PRAGMAS)
+
+    def _create_table(self) -> None:
+        """
+        创建数据库表结构（仅表和唯一约束，二级索引见 _create_secondary_indexes）
+
+        先只读地检查表结构，仅在需要建表或迁移时才开启写事务：
+        另一进程正在批量写入时，或数据库位于只读介质上时，打开已有的库不需要写锁
+        """
         cursor = self.conn.cursor()
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(function_index)").fetchall()}
+        if columns and {'impl_file_path', 'impl_line_number'} <= columns:
+            return
+
+        self._begin_write()
 
         # 创建函数索引表
         cursor.execute("""
@@ -80,96 +194,180 @@ class FunctionIndex:
         except Exception as e:
             print(f"  警告: 数据库迁移失败: {e}")
 
-        # 创建索引以优化查询
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_name ON function_index(name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_module ON function_index(module)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_class ON function_index(class_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_func_bp ON function_index(is_blueprint_callable)")
+        self.conn.commit()
+
+    def _secondary_index_names(self) -> List[str]:
+        """已存在的二级索引名称"""
+        return [
+            row[0] for row in self.conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'function_index' AND name LIKE 'idx_func_%'"
+            ).fetchall()
+        ]
+
+    def _bulk_load_flagged(self) -> bool:
+        """prepare_bulk_load 留下的导入标记是否存在（finalize_bulk_load 时清除）"""
+        has_meta = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta'"
+        ).fetchone()
+        if not has_meta:
+            return False
+        return self.conn.execute(
+            "SELECT 1 FROM meta WHERE key = 'bulk_load'"
+        ).fetchone() is not None
+
+    def _ensure_secondary_indexes(self) -> None:
+        """
+        打开数据库时按需补建二级索引
+
+        索引齐全时只做只读检查，不取写锁。缺失且带有导入标记时（批量导入进行中，
+        或上次导入中断），保持索引删除状态，由导入方（或下次构建）的 finalize_bulk_load 重建；
+        没有导入标记（旧版本或新建的库）时补建。
+        数据库只读等无法写入时跳过（查询仍可用，只是不走索引）
+        """
+        if len(self._secondary_index_names()) == len(self._INDEX_DDL) or self._bulk_load_flagged():
+            return
+        try:
+            self._create_secondary_indexes()
+        except sqlite3.OperationalError as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            print(f"  警告: 无法创建函数索引的二级索引: {e}")
+
+    def _create_secondary_indexes(self) -> None:
+        """创建二级索引以优化查询（已存在时跳过），并清除批量导入标记"""
+        self._begin_write()
+        for ddl in self._INDEX_DDL:
+            self.conn.execute(ddl)
+        if self._bulk_load_flagged():
+            self.conn.execute("DELETE FROM meta WHERE key = 'bulk_load'")
+        self.conn.commit()
+
+    def prepare_bulk_load(self) -> None:
+        """
+        批量导入前删除二级索引
 
+        导入期间每行只需维护表本身和唯一约束的 B-tree，
+        导入完成后由 finalize_bulk_load 一次性重建索引。
+        同时写入导入标记：导入期间其他连接打开数据库时据此不会中途补建索引
+        """
+        self.flush()
+        names = self._secondary_index_names()
+        self._begin_write()
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('bulk_load', '1')")
+        for name in names:
+            self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+        self.conn.commit()
+
+    def finalize_bulk_load(self) -> None:
+        """批量导入完成后重建二级索引、清除导入标记并收集统计信息（ANALYZE）"""
+        self.commit()
+        self._create_secondary_indexes()
+        self.conn.execute("ANALYZE")
+
+    def _read_conn(self) -> sqlite3.Connection:
+        """
+        获取当前线程的只读连接（首次调用时打开）
+
+        写入走 self.conn，查询走只读连接：WAL 模式下写入提交不阻塞查询，
+        多个线程（如并发的 MCP 查询）各自使用自己的连接，互不串行。
+        只读连接只能看到已提交的数据，批量事务中的写入需 end_bulk()/commit() 后才可查询。
+        内存数据库没有可共享的文件，查询直接使用写连接
+
+        Returns:
+            只读连接
+        """
+        if str(self.db_path) == ':memory:':
+            return self.conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path.resolve().as_uri() + '?mode=ro', uri=True,
+                isolation_level=None, check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_CONNECTION_PRAGMAS)
+            self._local.conn = conn
+            self._read_conns.append(conn)
+        return conn
+
+    def _begin_write(self) -> None:
+        """
+        开启写事务（已在事务中时沿用当前事务）
+
+        BEGIN IMMEDIATE 在事务开始时即取得写锁，
+        避免 DEFERRED 事务在读锁升级为写锁时与并发读者竞争导致 SQLITE_BUSY
+        """
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+
+    def begin_bulk(self) -> None:
+        """
+        开始批量写入事务
+
+        之后的 add_function / add_functions_batch 都在同一个事务中执行，
+        由 end_bulk() 统一提交，整个导入只需一次提交（fsync）
+        """
+        self._begin_write()
+
+    def end_bulk(self) -> None:
+        """写入缓冲并提交 begin_bulk() 开始的批量写入事务"""
+        self.flush()
         self.conn.commit()
 
     def add_function(self, func_info: Dict[str, Any]) -> None:
         """
         添加函数到索引
 
+        写入先进入缓冲，满 _pending_limit 条或调用 commit()/flush()/end_bulk()/close() 时
+        通过 add_functions_batch 批量写入（缓冲中的函数在写入前查询不到）
+
         Args:
             func_info: 函数信息字典
         """
-        cursor = self.conn.cursor()
-
-        # 序列化参数列表和 UFUNCTION 参数
-        parameters_json = json.dumps(func_info.get('parameters', []))
-        ufunction_spec_json = json.dumps(func_info.get('ufunction_specifiers', {}))
+        self._pending.append(func_info)
+        if len(self._pending) >= self._pending_limit:
+            self.flush()
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO function_index (
-                name, module, class_name, return_type, parameters, signature,
-                file_path, line_number, impl_file_path, impl_line_number,
-                is_virtual, is_const, is_static, is_override,
-                is_blueprint_callable, ufunction_specifiers
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            func_info['name'],
-            func_info['module'],
-            func_info.get('class_name'),
-            func_info.get('return_type', ''),
-            parameters_json,
-            func_info.get('signature', ''),
-            func_info.get('file_path', ''),
-            func_info.get('line_number', 0),
-            func_info.get('impl_file_path', ''),
-            func_info.get('impl_line_number', 0),
-            func_info.get('is_virtual', False),
-            func_info.get('is_const', False),
-            func_info.get('is_static', False),
-            func_info.get('is_override', False),
-            func_info.get('is_blueprint_callable', False),
-            ufunction_spec_json
-        ))
+    def flush(self) -> None:
+        """将 add_function 缓冲中的函数批量写入数据库"""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.add_functions_batch(pending)
 
     def add_functions_batch(self, func_infos: List[Dict[str, Any]]) -> None:
         """
         批量添加函数（性能优化）
 
+        在 begin_bulk()/end_bulk() 之间调用时沿用批量事务，由 end_bulk() 提交；
+        否则整批在一个独立事务中写入并立即提交
+
         Args:
             func_infos: 函数信息列表
         """
-        cursor = self.conn.cursor()
+        # 先写入缓冲中较早添加的函数，保证同一唯一键以最后写入的为准
+        self.flush()
 
-        data = []
-        for func_info in func_infos:
-            parameters_json = json.dumps(func_info.get('parameters', []))
-            ufunction_spec_json = json.dumps(func_info.get('ufunction_specifiers', {}))
-
-            data.append((
-                func_info['name'],
-                func_info['module'],
-                func_info.get('class_name'),
-                func_info.get('return_type', ''),
-                parameters_json,
-                func_info.get('signature', ''),
-                func_info.get('file_path', ''),
-                func_info.get('line_number', 0),
-                func_info.get('impl_file_path', ''),
-                func_info.get('impl_line_number', 0),
-                func_info.get('is_virtual', False),
-                func_info.get('is_const', False),
-                func_info.get('is_static', False),
-                func_info.get('is_override', False),
-                func_info.get('is_blueprint_callable', False),
-                ufunction_spec_json
-            ))
-
-        cursor.executemany("""
-            INSERT OR REPLACE INTO function_index (
-                name, module, class_name, return_type, parameters, signature,
-                file_path, line_number, impl_file_path, impl_line_number,
-                is_virtual, is_const, is_static, is_override,
-                is_blueprint_callable, ufunction_specifiers
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, data)
-
-        self.conn.commit()
+        own_transaction = not self.conn.in_transaction
+        self._begin_write()
+        try:
+            rows = _function_rows(func_infos)
+            while True:
+                chunk = list(islice(rows, _MULTI_ROW_CHUNK))
+                if len(chunk) < _MULTI_ROW_CHUNK:
+                    break
+                self.conn.execute(_INSERT_FUNCTION_CHUNK_SQL, list(chain.from_iterable(chunk)))
+            # 不足一整块的尾部逐行写入
+            if chunk:
+                self.conn.executemany(_INSERT_FUNCTION_SQL, chunk)
+        except BaseException:
+            if own_transaction:
+                self.conn.rollback()
+            raise
+
+        if own_transaction:
+            self.conn.commit()
 
     def query_by_name(self, name: str, module_hint: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -182,7 +380,7 @@ class FunctionIndex:
         Returns:
             函数信息列表
         """
-        cursor = self.conn.cursor()
+        cursor = self._read_conn().cursor()
 
         if module_hint:
             # 使用模块提示加速查询
@@ -211,7 +409,7 @@ class FunctionIndex:
         Returns:
             函数信息列表
         """
-        cursor = self.conn.cursor()
+        cursor = self._read_conn().cursor()
         cursor.execute("""
             SELECT * FROM function_index WHERE module = ?
         """, (module,))
@@ -229,7 +427,7 @@ class FunctionIndex:
         Returns:
             函数信息列表
         """
-        cursor = self.conn.cursor()
+        cursor = self._read_conn().cursor()
         cursor.execute("""
             SELECT * FROM function_index
             WHERE name LIKE ?
@@ -249,7 +447,7 @@ class FunctionIndex:
         Returns:
             函数信息列表
         """
-        cursor = self.conn.cursor()
+        cursor = self._read_conn().cursor()
         cursor.execute("""
             SELECT * FROM function_index
             WHERE is_blueprint_callable = 1
@@ -266,7 +464,7 @@ class FunctionIndex:
             'module': row['module'],
             'class_name': row['class_name'],
             'return_type': row['return_type'],
-            'parameters': json.loads(row['parameters']) if row['parameters'] else [],
+            'parameters': json_loads(row['parameters']) if row['parameters'] else [],
             'signature': row['signature'],
             'file_path': row['file_path'],
             'line_number': row['line_number'],
@@ -277,12 +475,12 @@ class FunctionIndex:
             'is_static': bool(row['is_static']),
             'is_override': bool(row['is_override']),
             'is_blueprint_callable': bool(row['is_blueprint_callable']),
-            'ufunction_specifiers': json.loads(row['ufunction_specifiers']) if row['ufunction_specifiers'] else {}
+            'ufunction_specifiers': json_loads(row['ufunction_specifiers']) if row['ufunction_specifiers'] else {}
         }
 
     def get_statistics(self) -> Dict[str, Any]:
         """获取索引统计信息"""
-        cursor = self.conn.cursor()
+        cursor = self._read_conn().cursor()
 
         # 总函数数
         cursor.execute("SELECT COUNT(*) FROM function_index")
@@ -309,14 +507,22 @@ class FunctionIndex:
         }
 
     def commit(self) -> None:
-        """提交事务"""
+        """写入缓冲并提交事务"""
+        self.flush()
         self.conn.commit()
 
     def close(self) -> None:
-        """关闭数据库连接"""
+        """写入缓冲、提交未提交的写入并关闭数据库连接（先关闭只读连接，最后关闭写连接）"""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        self.conn.commit()
+        for conn in getattr(self, '_read_conns', ()):
+            conn.close()
         self.conn.close()
 
     def __del__(self):
         """析构时关闭连接"""
         if hasattr(self, 'conn'):
-            self.conn.close()
+            self.close()
@@ -5,17 +5,39 @@ UE5 知识库系统 - 全局索引模块
 """
 
 import os
-import json
 import pickle
 import hashlib
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
 from collections import defaultdict
 
-import networkx as nx
-
 from .config import Config
+from ..utils.fast_json import json_dumps
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+def _connect_index_db(db_path: str):
+    """
+    打开 index.db（WAL 模式、synchronous=NORMAL、锁等待 5 秒）
+
+    Args:
+        db_path: 数据库路径
+
+    Returns:
+        sqlite3 连接
+    """
+    import sqlite3
+
+    conn = sqlite3.connect(db_path)
+    (journal_mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+    if journal_mode.lower() != 'wal':
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
 
 
 class GlobalIndex:
@@ -38,7 +60,11 @@ class GlobalIndex:
         """
         self.config = config
         self.index: Dict[str, Dict[str, Any]] = {}
-        self.dependency_graph: Optional[nx.DiGraph] = None
+        self.dependency_graph: Optional['nx.DiGraph'] = None
+        # 反向依赖表（模块 -> 依赖它的模块），首次 get_dependents 时构建
+        self._dependents: Optional[Dict[str, List[str]]] = None
+        # analyze_layers 结果及其对应的依赖图
+        self._layers: Optional[tuple] = None
         self._load()
 
     def _load(self) -> None:
@@ -51,8 +77,14 @@ class GlobalIndex:
                 self.index = data.get('index', {})
                 self.dependency_graph = data.get('dependency_graph')
 
-    def save(self) -> None:
-        """保存索引到磁盘"""
+    def save(self, debug_json: bool = True) -> None:
+        """
+        保存索引到磁盘
+
+        Args:
+            debug_json: 是否同时写出便于查看的 global_index.json
+                （构建过程中的检查点只需 pickle，可传 False 跳过）
+        """
         os.makedirs(self.config.global_index_path, exist_ok=True)
 
         index_file = os.path.join(self.config.global_index_path, "global_index.pkl")
@@ -63,13 +95,16 @@ class GlobalIndex:
                 'last_updated': datetime.now().isoformat()
             }, f)
 
+        if not debug_json:
+            return
+
         # 同时保存 JSON 格式便于查看
         json_file = os.path.join(self.config.global_index_path, "global_index.json")
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump({
+        with open(json_file, 'wb') as f:
+            f.write(json_dumps({
                 'index': self.index,
                 'last_updated': datetime.now().isoformat()
-            }, f, indent=2, ensure_ascii=False)
+            }, indent=True))
 
     def add_module(self, module_name: str, module_info: Dict[str, Any]) -> None:
         """
@@ -83,6 +118,9 @@ class GlobalIndex:
             **module_info,
             'indexed_at': datetime.now().isoformat()
         }
+        # 依赖关系变化，缓存的依赖图 / 反向依赖表失效
+        self.dependency_graph = None
+        self._dependents = None
 
     def get_module(self, module_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -140,12 +178,16 @@ class GlobalIndex:
         Returns:
             依赖该模块的模块名称列表
         """
-        return [
-            name for name, info in self.index.items()
-            if module_name in info.get('dependencies', [])
-        ]
-
-    def build_dependency_graph(self) -> nx.DiGraph:
+        if self._dependents is None:
+            # 一次遍历建立反向依赖表，之后每次查询 O(1)
+            dependents = defaultdict(list)
+            for name, info in self.index.items():
+                for dep in dict.fromkeys(info.get('dependencies', [])):
+                    dependents[dep].append(name)
+            self._dependents = dict(dependents)
+        return list(self._dependents.get(module_name, []))
+
+    def build_dependency_graph(self) -> 'nx.DiGraph':
         """
         构建模块依赖关系图
 
@@ -155,6 +197,9 @@ class GlobalIndex:
         if self.dependency_graph is not None:
             return self.dependency_graph
 
+        # networkx 导入较重，仅在首次构建依赖图时加载
+        import networkx as nx
+
         graph = nx.DiGraph()
 
         # 添加所有模块节点
@@ -179,6 +224,10 @@ class GlobalIndex:
         """
         graph = self.build_dependency_graph()
 
+        # 依赖图未重建时直接返回上次的分析结果
+        if self._layers is not None and self._layers[0] is graph:
+            return self._layers[1]
+
         # 计算入度和出度
         degrees = {
             node: (graph.in_degree(node), graph.out_degree(node))
@@ -186,10 +235,10 @@ class GlobalIndex:
         }
 
         # 识别底层模块 (入度为 0)
-        bottom_layer = [n for n, d in degrees.items() if d[0] == 0]
+        bottom_layer = {n for n, d in degrees.items() if d[0] == 0}
 
         # 识别顶层模块 (出度为 0)
-        top_layer = [n for n, d in degrees.items() if d[1] == 0]
+        top_layer = {n for n, d in degrees.items() if d[1] == 0}
 
         # 识别中间层模块
         middle_layer = [
@@ -197,13 +246,15 @@ class GlobalIndex:
             if n not in bottom_layer and n not in top_layer
         ]
 
-        return {
+        layers = {
             'bottom_layer': sorted(bottom_layer),
             'top_layer': sorted(top_layer),
             'middle_layer': sorted(middle_layer),
             'total_modules': len(graph.nodes()),
             'total_dependencies': len(graph.edges())
         }
+        self._layers = (graph, layers)
+        return layers
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -285,10 +336,8 @@ class GlobalIndex:
         Args:
             metadata: 元数据字典，包含 kb_version, engine_version 等
         """
-        import sqlite3
-
         db_path = os.path.join(self.config.global_index_path, "index.db")
-        conn = sqlite3.connect(db_path)
+        conn = _connect_index_db(db_path)
         cursor = conn.cursor()
 
         # Create metadata table if not exists
@@ -313,13 +362,11 @@ class GlobalIndex:
         Returns:
             元数据字典
         """
-        import sqlite3
-
         db_path = os.path.join(self.config.global_index_path, "index.db")
         if not os.path.exists(db_path):
             return {}
 
-        conn = sqlite3.connect(db_path)
+        conn = _connect_index_db(db_path)
         cursor = conn.cursor()
 
         cursor.execute('SELECT key, value FROM metadata')
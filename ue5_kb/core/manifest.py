@@ -8,10 +8,15 @@ from dataclasses import dataclass, field
 from typing import Dict, Optional, List, Any
 from datetime import datetime
 from pathlib import Path
+import os
 import json
 import hashlib
 
 
+# Read size for file hashing; most sources fit in a single read
+_HASH_CHUNK_SIZE = 1 << 20
+
+
 @dataclass
 class FileInfo:
     """Information about a single source file"""
@@ -50,6 +55,7 @@ class ModuleManifest:
     module_hash: str = ""
     indexed_at: str = ""
     parser_version: str = ""
+    build_cs: Optional[FileInfo] = None  # .Build.cs stat, lets module_hash be reused
 
     def to_dict(self) -> dict:
         return {
@@ -59,7 +65,8 @@ class ModuleManifest:
             "files": {k: v.to_dict() for k, v in self.files.items()},
             "module_hash": self.module_hash,
             "indexed_at": self.indexed_at,
-            "parser_version": self.parser_version
+            "parser_version": self.parser_version,
+            "build_cs": self.build_cs.to_dict() if self.build_cs else None
         }
 
     @classmethod
@@ -68,6 +75,7 @@ class ModuleManifest:
             k: FileInfo.from_dict(v)
             for k, v in data.get("files", {}).items()
         }
+        build_cs = data.get("build_cs")
         return cls(
             module_name=data["module_name"],
             build_cs_path=data["build_cs_path"],
@@ -75,9 +83,19 @@ class ModuleManifest:
             files=files,
             module_hash=data.get("module_hash", ""),
             indexed_at=data.get("indexed_at", ""),
-            parser_version=data.get("parser_version", "")
+            parser_version=data.get("parser_version", ""),
+            build_cs=FileInfo.from_dict(build_cs) if build_cs else None
         )
 
+    @classmethod
+    def load(cls, manifest_file: Path) -> Optional["ModuleManifest"]:
+        """Load a module_manifest.json written by the extract stage"""
+        if not manifest_file.exists():
+            return None
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls.from_dict(data)
+
 
 @dataclass
 class KBManifest:
@@ -144,6 +162,26 @@ class KBManifest:
         return cls.from_dict(data)
 
 
+def _file_unchanged(prev: Optional[FileInfo], stat: os.stat_result) -> bool:
+    """True if the recorded size and mtime still match the file on disk"""
+    return (
+        prev is not None
+        and prev.size == stat.st_size
+        and abs(prev.mtime - stat.st_mtime) < 1e-6
+    )
+
+
+def _update_from_path(hasher: Any, file_path: Path) -> None:
+    """Feed a file into hasher in _HASH_CHUNK_SIZE reads (memory stays at one chunk)"""
+    # Unbuffered: each read goes straight into the bytes object handed to update()
+    with open(file_path, 'rb', buffering=0) as f:
+        while True:
+            chunk = f.read(_HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+
+
 class Hasher:
     """File hashing utilities"""
 
@@ -159,15 +197,67 @@ class Hasher:
             Hexadecimal SHA256 hash string
         """
         hasher = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
-                hasher.update(chunk)
+        _update_from_path(hasher, file_path)
         return hasher.hexdigest()
 
+    @staticmethod
+    def compute_sha256_cached(
+        file_path: Path,
+        prev: Optional[FileInfo],
+        stat: Optional[os.stat_result] = None
+    ) -> str:
+        """
+        Reuse the recorded hash when size and mtime are unchanged
+
+        Args:
+            file_path: Path to the file
+            prev: FileInfo from the previous manifest (None = always hash)
+            stat: Result of file_path.stat() if already available
+
+        Returns:
+            Hexadecimal SHA256 hash string
+        """
+        if stat is None:
+            stat = file_path.stat()
+        if _file_unchanged(prev, stat):
+            return prev.sha256
+        return Hasher.compute_sha256(file_path)
+
+    @staticmethod
+    def module_unchanged(
+        build_cs_path: Path,
+        source_files: List[Path],
+        prev_manifest: ModuleManifest,
+        base_path: Path
+    ) -> bool:
+        """
+        Check whether a module's files match its previous manifest (stat only)
+
+        Args:
+            build_cs_path: Path to the .Build.cs file
+            source_files: List of source file paths
+            prev_manifest: Manifest from the previous extract run
+            base_path: Base path the manifest file keys are relative to
+
+        Returns:
+            True if the file set, sizes and mtimes are all unchanged
+        """
+        if not prev_manifest.module_hash or len(source_files) != len(prev_manifest.files):
+            return False
+        if not _file_unchanged(prev_manifest.build_cs, build_cs_path.stat()):
+            return False
+        for file_path in source_files:
+            prev = prev_manifest.files.get(str(file_path.relative_to(base_path)))
+            if not _file_unchanged(prev, file_path.stat()):
+                return False
+        return True
+
     @staticmethod
     def compute_module_hash(
         build_cs_path: Path,
-        source_files: List[Path]
+        source_files: List[Path],
+        prev_manifest: Optional[ModuleManifest] = None,
+        base_path: Optional[Path] = None
     ) -> str:
         """
         Compute combined hash for a module
@@ -175,17 +265,26 @@ class Hasher:
         Args:
             build_cs_path: Path to the .Build.cs file
             source_files: List of source file paths
+            prev_manifest: Previous module manifest; its module_hash is returned
+                without reading any file if nothing changed
+            base_path: Base path the manifest file keys are relative to
+                (required together with prev_manifest)
 
         Returns:
             Hexadecimal SHA256 hash string
         """
+        if prev_manifest is not None and base_path is not None and Hasher.module_unchanged(
+            build_cs_path, source_files, prev_manifest, base_path
+        ):
+            return prev_manifest.module_hash
+
         hasher = hashlib.sha256()
 
         # Include build.cs
-        hasher.update(build_cs_path.read_bytes())
+        _update_from_path(hasher, build_cs_path)
 
         # Include all source files (sorted for consistency)
         for file_path in sorted(source_files):
-            hasher.update(file_path.read_bytes())
+            _update_from_path(hasher, file_path)
 
         return hasher.hexdigest()
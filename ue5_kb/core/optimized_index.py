@@ -20,8 +20,6 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 from functools import lru_cache
 
-import networkx as nx
-
 # 添加项目路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
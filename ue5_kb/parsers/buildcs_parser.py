@@ -37,6 +37,16 @@ class BuildCsParser:
         r'DynamicallyLoadedModuleNames\.Add\(\s*"([^"]+)"\s*\)',
     ]
 
+    # 预编译的正则（类级别共享，避免每次解析都经过 re 模块缓存查找）
+    _DEPENDENCY_RES = {
+        dep_type: re.compile(pattern, re.MULTILINE | re.DOTALL)
+        for dep_type, pattern in DEPENDENCY_PATTERNS.items()
+    }
+    _SINGLE_ADD_RE = re.compile('|'.join(SINGLE_ADD_PATTERNS))
+    _LINE_COMMENT_RE = re.compile(r'//.*$', re.MULTILINE)
+    _BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+    _QUOTED_RE = re.compile(r'"([^"]+)"')
+
     def __init__(self):
         """初始化解析器"""
         self.dependencies = {
@@ -60,11 +70,23 @@ class BuildCsParser:
         if not os.path.exists(file_path):
             return {k: [] for k in self.dependencies.keys()}
 
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'r', encoding='utf-8', buffering=65536) as f:
             content = f.read()
 
         return self.parse_content(content)
 
+    def parse_bytes(self, data: bytes) -> Dict[str, List[str]]:
+        """
+        解析 .Build.cs 原始字节（供预读取文件的流水线使用）
+
+        Args:
+            data: .Build.cs 文件内容（UTF-8 字节）
+
+        Returns:
+            依赖字典
+        """
+        return self.parse_content(data.decode('utf-8'))
+
     def parse_content(self, content: str) -> Dict[str, List[str]]:
         """
         解析 .Build.cs 内容
@@ -78,14 +100,14 @@ class BuildCsParser:
         self.dependencies = {k: [] for k in self.dependencies.keys()}
 
         # 使用正则表达式提取依赖
-        for dep_type, pattern in self.DEPENDENCY_PATTERNS.items():
-            matches = re.findall(pattern, content, re.MULTILINE | re.DOTALL)
+        for dep_type, pattern in self._DEPENDENCY_RES.items():
+            matches = pattern.findall(content)
             for match in matches:
                 modules = self._extract_module_names(match)
                 self.dependencies[dep_type].extend(modules)
 
         # 处理单个添加的情况
-        for match in re.finditer('|'.join(self.SINGLE_ADD_PATTERNS), content):
+        for match in self._SINGLE_ADD_RE.finditer(content):
             groups = match.groups()
             if len(groups) >= 2:
                 dep_type = 'public' if groups[0] == 'Public' else 'private'
@@ -115,11 +137,11 @@ class BuildCsParser:
             模块名称列表
         """
         # 移除注释
-        match_text = re.sub(r'//.*$', '', match_text, flags=re.MULTILINE)
-        match_text = re.sub(r'/\*.*?\*/', '', match_text, flags=re.DOTALL)
+        match_text = self._LINE_COMMENT_RE.sub('', match_text)
+        match_text = self._BLOCK_COMMENT_RE.sub('', match_text)
 
         # 提取引号内的字符串
-        modules = re.findall(r'"([^"]+)"', match_text)
+        modules = self._QUOTED_RE.findall(match_text)
 
         return modules
 
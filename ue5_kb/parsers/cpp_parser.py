@@ -197,6 +197,41 @@ class CppParser:
         r'\s*\(\s*(\w+)(?:\s*,\s*(.+?))?\s*\)'
     )
 
+    # 预编译正则（解析时逐行调用，避免每次经过 re 模块缓存查找）
+    _UCLASS_RE = re.compile(UCLASS_PATTERN)
+    _USTRUCT_RE = re.compile(USTRUCT_PATTERN)
+    _UFUNCTION_RE = re.compile(UFUNCTION_PATTERN)
+    _UPROPERTY_RE = re.compile(UPROPERTY_PATTERN)
+    _UINTERFACE_RE = re.compile(UINTERFACE_PATTERN)
+    _UENUM_RE = re.compile(UENUM_PATTERN)
+
+    _HSPACE_RE = re.compile(r'[ \t]+')
+    _LINE_COMMENT_RE = re.compile(r'//.*$', re.MULTILINE)
+    _BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+    _WHITESPACE_RE = re.compile(r'\s+')
+
+    _CATEGORY_QUOTED_RE = re.compile(r'Category\s*=\s*"([^"]*)"')
+    _CATEGORY_WORD_RE = re.compile(r'Category\s*=\s*(\w+)')
+    _META_RE = re.compile(r'meta\s*=\s*\(([^)]+)\)')
+    _META_KV_RE = re.compile(r'(\w+)\s*=\s*"([^"]*)"')
+
+    _NAMESPACE_RE = re.compile(r'namespace\s+([A-Za-z_][A-Za-z0-9_:]*)\s*\{')
+    _CLASS_DECL_RE = re.compile(r'\b(class|struct)\s+((?:[A-Z_]+_API\s+)?[A-Z][A-Za-z0-9_]*)(?:\s*:\s*(.*))?')
+    _ACCESS_SPEC_RE = re.compile(r'\b(public|private|protected)\s+')
+    _PROPERTY_RE = re.compile(r'^([A-Za-z_][A-Za-z0-9_:<>*&\s]*)\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:=\s*[^;]*)?\s*;')
+    _METHOD_RE = re.compile(
+        r'^([A-Za-z_][A-Za-z0-9_<>*&:\s]*)\s+([A-Za-z_][A-Za-z0-9_]*)\s*'
+        r'\(([^)]*)\)\s*(?:const)?\s*(?:override|final)?\s*(?:=\s*0\s*)?;'
+    )
+    _ENUM_DECL_RE = re.compile(r'\benum\s+(?:class\s+)?([A-Z][A-Za-z0-9_]*)(?:\s*:\s*\w+)?\s*(?:\{)?')
+    _UMETA_RE = re.compile(r'UMETA\s*\([^)]*\)')
+    _IDENTIFIER_RE = re.compile(r'^[A-Za-z_]\w*$')
+    _USING_RE = re.compile(r'using\s+([A-Za-z_]\w*)\s*=\s*(.+?)\s*;')
+    _TYPEDEF_RE = re.compile(r'typedef\s+(.+?)\s+([A-Za-z_]\w*)\s*;')
+    _PURE_VIRTUAL_RE = re.compile(r'\s*=\s*0\s*')
+    _FUNCTION_DECL_RE = re.compile(r'^([A-Za-z_][A-Za-z0-9_<>*&:\s]*?)\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(([^)]*)\)\s*;?$')
+    _PARAMETER_RE = re.compile(r'^(.+?)\s+(\w+)(?:\s*=\s*(.*))?$')
+
     def __init__(self):
         self.classes: Dict[str, ClassInfo] = {}
         self.functions: Dict[str, FunctionInfo] = {}
@@ -329,15 +364,15 @@ class CppParser:
                 else:
                     result += line[idx]
                     idx += 1
-            result = re.sub(r'[ \t]+', ' ', result)
+            result = self._HSPACE_RE.sub(' ', result)
             processed.append(result.rstrip())
         return processed
 
     def _preprocess_content(self, content: str) -> str:
         """预处理（保留向后兼容）"""
-        content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-        content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-        content = re.sub(r'\s+', ' ', content)
+        content = self._LINE_COMMENT_RE.sub('', content)
+        content = self._BLOCK_COMMENT_RE.sub('', content)
+        content = self._WHITESPACE_RE.sub(' ', content)
         return content.strip()
 
     # =========================================================================
@@ -353,13 +388,13 @@ class CppParser:
                      'EditInlineNew', 'NotEditInlineNew', 'HideDropdown', 'Deprecated']:
             if flag in spec_str:
                 specifiers[flag] = True
-        cat = re.search(r'Category\s*=\s*"([^"]*)"', spec_str)
+        cat = self._CATEGORY_QUOTED_RE.search(spec_str)
         if cat:
             specifiers['Category'] = cat.group(1)
-        meta = re.search(r'meta\s*=\s*\(([^)]+)\)', spec_str)
+        meta = self._META_RE.search(spec_str)
         if meta:
             specifiers['meta'] = {}
-            for kv in re.finditer(r'(\w+)\s*=\s*"([^"]*)"', meta.group(1)):
+            for kv in self._META_KV_RE.finditer(meta.group(1)):
                 specifiers['meta'][kv.group(1)] = kv.group(2)
         return specifiers
 
@@ -376,15 +411,15 @@ class CppParser:
                      'Interp', 'NoClear', 'Export', 'EditFixedSize', 'Instanced']:
             if flag in spec_str:
                 specifiers[flag] = True
-        cat = re.search(r'Category\s*=\s*"([^"]*)"', spec_str)
+        cat = self._CATEGORY_QUOTED_RE.search(spec_str)
         if not cat:
-            cat = re.search(r'Category\s*=\s*(\w+)', spec_str)
+            cat = self._CATEGORY_WORD_RE.search(spec_str)
         if cat:
             specifiers['Category'] = cat.group(1)
-        meta = re.search(r'meta\s*=\s*\(([^)]+)\)', spec_str)
+        meta = self._META_RE.search(spec_str)
         if meta:
             specifiers['meta'] = {}
-            for kv in re.finditer(r'(\w+)\s*=\s*"([^"]*)"', meta.group(1)):
+            for kv in self._META_KV_RE.finditer(meta.group(1)):
                 specifiers['meta'][kv.group(1)] = kv.group(2)
         return specifiers
 
@@ -398,13 +433,13 @@ class CppParser:
                      'BlueprintAuthorityOnly', 'WithValidation']:
             if flag in spec_str:
                 specifiers[flag] = True
-        cat = re.search(r'Category\s*=\s*"([^"]*)"', spec_str)
+        cat = self._CATEGORY_QUOTED_RE.search(spec_str)
         if cat:
             specifiers['Category'] = cat.group(1)
-        meta = re.search(r'meta\s*=\s*\(([^)]+)\)', spec_str)
+        meta = self._META_RE.search(spec_str)
         if meta:
             specifiers['meta'] = {}
-            for kv in re.finditer(r'(\w+)\s*=\s*"([^"]*)"', meta.group(1)):
+            for kv in self._META_KV_RE.finditer(meta.group(1)):
                 specifiers['meta'][kv.group(1)] = kv.group(2)
         return specifiers
 
@@ -418,7 +453,7 @@ class CppParser:
         i = 0
         while i < len(lines):
             line = lines[i].strip()
-            ns_match = re.search(r'namespace\s+([A-Za-z_][A-Za-z0-9_:]*)\s*\{', line)
+            ns_match = self._NAMESPACE_RE.search(line)
             if ns_match:
                 ns_name = ns_match.group(1)
                 namespace_stack.extend(ns_name.split('::')) if '::' in ns_name else namespace_stack.append(ns_name)
@@ -427,16 +462,16 @@ class CppParser:
                     namespace_stack.pop()
             current_ns = '::'.join(namespace_stack) if namespace_stack else ""
 
-            uclass_m = re.search(self.UCLASS_PATTERN, line)
-            ustruct_m = re.search(self.USTRUCT_PATTERN, line)
-            uiface_m = re.search(self.UINTERFACE_PATTERN, line)
+            uclass_m = self._UCLASS_RE.search(line)
+            ustruct_m = self._USTRUCT_RE.search(line)
+            uiface_m = self._UINTERFACE_RE.search(line)
             is_uclass = bool(uclass_m)
             is_ustruct = bool(ustruct_m)
             is_uiface = bool(uiface_m)
             spec_str = (uclass_m or ustruct_m or uiface_m)
             spec_str = spec_str.group(1) if spec_str else ''
 
-            class_m = re.search(r'\b(class|struct)\s+((?:[A-Z_]+_API\s+)?[A-Z][A-Za-z0-9_]*)(?:\s*:\s*(.*))?', line)
+            class_m = self._CLASS_DECL_RE.search(line)
             if class_m:
                 decl_type = class_m.group(1)
                 full_name = class_m.group(2).strip()
@@ -445,8 +480,8 @@ class CppParser:
 
                 parent_classes, interfaces = [], []
                 if inherit:
-                    for p in re.split(r',', inherit):
-                        pc = re.sub(r'\b(public|private|protected)\s+', '', p).strip()
+                    for p in inherit.split(','):
+                        pc = self._ACCESS_SPEC_RE.sub('', p).strip()
                         if pc and pc not in ['public', 'private', 'protected']:
                             parent_classes.append(pc)
                             if len(pc) > 1 and pc[0] == 'I' and pc[1].isupper():
@@ -506,7 +541,7 @@ class CppParser:
                 if brace_count <= 0:
                     return i
 
-            uprop_m = re.search(self.UPROPERTY_PATTERN, line)
+            uprop_m = self._UPROPERTY_RE.search(line)
             if uprop_m:
                 uprop_pending = True
                 uprop_spec = uprop_m.group(1)
@@ -531,10 +566,10 @@ class CppParser:
         return len(lines) - 1
 
     def _try_parse_property(self, line: str, has_uprop: bool, spec_str: str = '') -> Optional[PropertyInfo]:
-        line = re.sub(self.UPROPERTY_PATTERN, '', line).strip()
+        line = self._UPROPERTY_RE.sub('', line).strip()
         if '(' in line and ')' in line:
             return None
-        m = re.match(r'^([A-Za-z_][A-Za-z0-9_:<>*&\s]*)\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:=\s*[^;]*)?\s*;', line)
+        m = self._PROPERTY_RE.match(line)
         if m:
             ptype, pname = m.group(1).strip(), m.group(2)
             if pname in ['if', 'for', 'while', 'switch', 'return', 'class', 'struct', 'enum', 'operator']:
@@ -546,10 +581,7 @@ class CppParser:
     def _try_parse_method(self, line: str, class_name: str) -> Optional[str]:
         if ';' not in line:
             return None
-        m = re.match(
-            r'^([A-Za-z_][A-Za-z0-9_<>*&:\s]*)\s+([A-Za-z_][A-Za-z0-9_]*)\s*'
-            r'\(([^)]*)\)\s*(?:const)?\s*(?:override|final)?\s*(?:=\s*0\s*)?;', line
-        )
+        m = self._METHOD_RE.match(line)
         if m:
             rt, mn, params = m.group(1).strip(), m.group(2), m.group(3)
             if mn in ['if', 'for', 'while', 'switch', 'return', 'class', 'struct', 'enum']:
@@ -572,7 +604,7 @@ class CppParser:
         i = 0
         while i < len(lines):
             line = lines[i].strip()
-            ns_m = re.search(r'namespace\s+([A-Za-z_][A-Za-z0-9_:]*)\s*\{', line)
+            ns_m = self._NAMESPACE_RE.search(line)
             if ns_m:
                 ns = ns_m.group(1)
                 ns_stack.extend(ns.split('::')) if '::' in ns else ns_stack.append(ns)
@@ -580,15 +612,13 @@ class CppParser:
                 ns_stack.pop()
             cur_ns = '::'.join(ns_stack) if ns_stack else ""
 
-            uenum_m = re.search(self.UENUM_PATTERN, line)
+            uenum_m = self._UENUM_RE.search(line)
             is_uenum = bool(uenum_m)
             uenum_spec = uenum_m.group(1) if uenum_m else ''
 
-            enum_m = re.search(r'\benum\s+(?:class\s+)?([A-Z][A-Za-z0-9_]*)(?:\s*:\s*\w+)?\s*(?:\{)?', line)
+            enum_m = self._ENUM_DECL_RE.search(line)
             if not enum_m and is_uenum and i + 1 < len(lines):
-                enum_m = re.search(
-                    r'\benum\s+(?:class\s+)?([A-Z][A-Za-z0-9_]*)(?:\s*:\s*\w+)?\s*(?:\{)?', lines[i + 1].strip()
-                )
+                enum_m = self._ENUM_DECL_RE.search(lines[i + 1].strip())
                 if enum_m:
                     i += 1
 
@@ -624,7 +654,7 @@ class CppParser:
         return values
 
     def _parse_enum_line(self, line: str, values: List[str]) -> None:
-        line = re.sub(r'//.*$', '', line).strip()
+        line = self._LINE_COMMENT_RE.sub('', line).strip()
         if not line:
             return
         for part in line.split(','):
@@ -632,8 +662,8 @@ class CppParser:
             if not part:
                 continue
             name = part.split('=')[0].strip()
-            name = re.sub(r'UMETA\s*\([^)]*\)', '', name).strip()
-            if name and re.match(r'^[A-Za-z_]\w*$', name):
+            name = self._UMETA_RE.sub('', name).strip()
+            if name and self._IDENTIFIER_RE.match(name):
                 values.append(name)
 
     # =========================================================================
@@ -679,7 +709,7 @@ class CppParser:
     def _parse_type_aliases(self, lines: List[str], file_path: str) -> None:
         for i, line in enumerate(lines):
             ls = line.strip()
-            m = re.match(r'using\s+([A-Za-z_]\w*)\s*=\s*(.+?)\s*;', ls)
+            m = self._USING_RE.match(ls)
             if m:
                 name, underlying = m.group(1), m.group(2).strip()
                 if underlying and not underlying.startswith('namespace'):
@@ -687,7 +717,7 @@ class CppParser:
                         name=name, underlying_type=underlying, file_path=file_path, line_number=i + 1
                     )
                 continue
-            m = re.match(r'typedef\s+(.+?)\s+([A-Za-z_]\w*)\s*;', ls)
+            m = self._TYPEDEF_RE.match(ls)
             if m:
                 underlying, name = m.group(1).strip(), m.group(2)
                 self.type_aliases[name] = TypeAliasInfo(
@@ -705,7 +735,7 @@ class CppParser:
 
         for i, line in enumerate(lines, 1):
             ls = line.strip()
-            uf_m = re.search(self.UFUNCTION_PATTERN, ls)
+            uf_m = self._UFUNCTION_RE.search(ls)
             if uf_m:
                 uf_specs = self._parse_ufunction_specifiers(uf_m.group(1))
                 continue
@@ -727,9 +757,9 @@ class CppParser:
             if ' final' in wl:
                 co_part += ' final'
                 wl = wl.replace(' final', '', 1)
-            wl = re.sub(r'\s*=\s*0\s*', '', wl)
+            wl = self._PURE_VIRTUAL_RE.sub('', wl)
 
-            fm = re.match(r'^([A-Za-z_][A-Za-z0-9_<>*&:\s]*?)\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(([^)]*)\)\s*;?$', wl.strip())
+            fm = self._FUNCTION_DECL_RE.match(wl.strip())
             if fm:
                 rt, fn, params = fm.group(1).strip(), fm.group(2), fm.group(3)
                 if fn in ['if', 'for', 'while', 'switch', 'return', 'class', 'struct', 'enum', 'namespace', 'operator']:
@@ -768,7 +798,7 @@ class CppParser:
             part = part.strip()
             if not part:
                 continue
-            m = re.match(r'^(.+?)\s+(\w+)(?:\s*=\s*(.*))?$', part)
+            m = self._PARAMETER_RE.match(part)
             if m:
                 params.append(ParameterInfo(
                     type=m.group(1).strip(), name=m.group(2),
@@ -805,7 +835,7 @@ class CppParser:
         ns = []
         for line in content.split('\n'):
             line = line.strip()
-            m = re.search(r'namespace\s+([A-Za-z_][A-Za-z0-9_:]*)\s*\{', line)
+            m = self._NAMESPACE_RE.search(line)
             if m:
                 n = m.group(1)
                 ns.extend(n.split('::')) if '::' in n else ns.append(n)
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from .base import PipelineStage
 from ..parsers.cpp_parser import CppParser
+from .pathcache import get_path_cache
 import json
 import os
 
@@ -31,13 +32,14 @@ class AnalyzeStage(PipelineStage):
         summary_file = self.stage_dir / "summary.json"
         return summary_file.exists()
 
-    def run(self, parallel: int = 1, verbose: bool = False, **kwargs) -> Dict[str, Any]:
+    def run(self, parallel: int = 1, verbose: bool = False, resume: bool = True, **kwargs) -> Dict[str, Any]:
         """
         分析所有模块的代码结构
 
         Args:
             parallel: 并行度（0=自动检测，1=串行，>1=并行）
             verbose: 是否显示详细输出
+            resume: 并行模式下是否跳过 checkpoint 中已完成的模块
 
         Returns:
             包含分析统计的结果
@@ -62,7 +64,7 @@ class AnalyzeStage(PipelineStage):
             console.print(f"[cyan]使用并行模式: {parallel} workers[/cyan]")
 
             parallel_stage = ParallelAnalyzeStage(self.base_path, num_workers=parallel)
-            return parallel_stage.run(modules, force=False, verbose=verbose)
+            return parallel_stage.run(modules, force=not resume, verbose=verbose)
 
         # 否则使用原有的串行逻辑
         return self._run_serial(modules, verbose)
@@ -156,13 +158,8 @@ class AnalyzeStage(PipelineStage):
         Returns:
             源文件列表
         """
-        source_files = []
-
-        # 查找 .h 和 .cpp 文件
-        for ext in ['*.h', '*.cpp']:
-            source_files.extend(module_dir.rglob(ext))
-
-        return source_files
+        # 查找 .h 和 .cpp 文件（目录未变化时直接命中路径缓存）
+        return get_path_cache(self.data_dir).source_files(module_dir, ('*.h', '*.cpp'))
 
     def _analyze_module(
         self,
@@ -13,9 +13,47 @@ import json
 from ..parsers.cpp_parser import CppParser
 from ..utils.progress_tracker import ProgressTracker
 from ..utils.checkpoint_manager import CheckpointManager
+from .pathcache import get_path_cache
+from ..utils.fast_json import json_loads
 from rich.console import Console
 
 
+# 参与分析的源文件扩展名（与 worker 中的 rglob 模式一致）
+_SOURCE_EXTENSIONS = frozenset({'h', 'cpp'})
+
+
+def _estimate_module_cost(module_dir: str) -> int:
+    """
+    估算模块分析耗时（源文件总字节数）
+
+    只遍历目录元数据，不读取文件内容；顺带预热系统目录缓存，worker 的 rglob 可直接命中
+
+    Args:
+        module_dir: 模块目录
+
+    Returns:
+        .h/.cpp 文件总字节数
+    """
+    total_bytes = 0
+    stack = [module_dir]
+
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.rpartition('.')[2] in _SOURCE_EXTENSIONS:
+                        try:
+                            total_bytes += entry.stat().st_size
+                        except OSError:
+                            pass
+        except OSError:
+            continue
+
+    return total_bytes
+
+
 def _analyze_module_worker(args: Tuple) -> Dict[str, Any]:
     """
     Worker 函数：分析单个模块（在独立进程中执行）
@@ -34,10 +72,10 @@ def _analyze_module_worker(args: Tuple) -> Dict[str, Any]:
     module_name, module_dir, stage_dir, worker_id, verbose = args
 
     try:
-        # 查找源文件
-        source_files = []
-        for ext in ["*.h", "*.cpp"]:
-            source_files.extend(Path(module_dir).rglob(ext))
+        # 查找源文件（目录未变化时直接命中路径缓存）
+        source_files = get_path_cache(Path(stage_dir).parent).source_files(
+            Path(module_dir), ("*.h", "*.cpp")
+        )
 
         if not source_files:
             return {
@@ -166,15 +204,15 @@ class ParallelAnalyzeStage:
         """
         console = Console()
 
-        # 加载 checkpoint
-        completed_modules = self.checkpoint_manager.get_completed_tasks()
-
-        # 过滤已完成的模块
+        # 过滤已完成的模块：checkpoint 日志只读取一次，入队前按集合过滤
         if not force:
+            completed_modules = self.checkpoint_manager.get_completed_tasks()
             modules_to_process = [
                 m for m in modules if m["name"] not in completed_modules
             ]
         else:
+            # 重新分析所有模块，旧 checkpoint 不再有效
+            self.checkpoint_manager.clear()
             modules_to_process = modules
 
         if not modules_to_process:
@@ -191,16 +229,24 @@ class ParallelAnalyzeStage:
 
         tracker.start()
 
+        # 按预估耗时降序提交：进程池按提交顺序动态领取任务，
+        # 大模块先开始，避免最后只剩单个 worker 处理大模块拖长总耗时
+        module_dirs = [
+            (m["name"], str(Path(m["absolute_path"]).parent))
+            for m in modules_to_process
+        ]
+        module_dirs.sort(key=lambda item: _estimate_module_cost(item[1]), reverse=True)
+
         # 准备任务参数
         tasks = [
             (
-                m["name"],
-                str(Path(m["absolute_path"]).parent),
+                module_name,
+                module_dir,
                 str(self.stage_dir),
                 i % self.num_workers,
                 verbose,
             )
-            for i, m in enumerate(modules_to_process)
+            for i, (module_name, module_dir) in enumerate(module_dirs)
         ]
 
         # 结果收集
@@ -213,56 +259,81 @@ class ParallelAnalyzeStage:
         worker_completed = {i: 0 for i in range(self.num_workers)}
         worker_total = {i: len([t for t in tasks if t[3] == i]) for i in range(self.num_workers)}
 
-        # 使用进程池并行处理
-        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-            # 提交所有任务 - 存储 (module_name, worker_id)
-            future_to_info = {
-                executor.submit(_analyze_module_worker, task): (task[0], task[3])
-                for task in tasks
-            }
-
-            # 首次更新所有 worker 状态
-            for i in range(self.num_workers):
-                tracker.update_worker(i, "Initializing...", 0, worker_total[i])
-
-            # 收集结果
-            for future in as_completed(future_to_info):
-                module_name, worker_id = future_to_info[future]
-
-                try:
-                    result = future.result()
-                    results.append(result)
-
-                    if result["status"] == "success":
-                        total_classes += result["classes_count"]
-                        total_functions += result["functions_count"]
-                        worker_completed[worker_id] += 1
-                        tracker.increment_total()
-
-                        # 更新 worker 进度条
-                        tracker.update_worker(
-                            worker_id,
-                            module_name,
-                            worker_completed[worker_id],
-                            worker_total[worker_id]
-                        )
-
-                        # 更新 checkpoint
-                        self.checkpoint_manager.save_completed(module_name, result)
-
-                    elif result["status"] == "error":
+        # 使用进程池并行处理；无论收集循环是否中断都要停止 checkpoint 写入线程
+        try:
+            with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+                # 提交所有任务 - 存储 (module_name, worker_id)
+                future_to_info = {
+                    executor.submit(_analyze_module_worker, task): (task[0], task[3])
+                    for task in tasks
+                }
+
+                # 首次更新所有 worker 状态
+                for i in range(self.num_workers):
+                    tracker.update_worker(i, "Initializing...", 0, worker_total[i])
+
+                # 收集结果
+                for future in as_completed(future_to_info):
+                    module_name, worker_id = future_to_info[future]
+
+                    try:
+                        result = future.result()
+                        results.append(result)
+
+                        if result["status"] == "success":
+                            total_classes += result["classes_count"]
+                            total_functions += result["functions_count"]
+                            worker_completed[worker_id] += 1
+                            tracker.increment_total()
+
+                            # 更新 worker 进度条
+                            tracker.update_worker(
+                                worker_id,
+                                module_name,
+                                worker_completed[worker_id],
+                                worker_total[worker_id]
+                            )
+
+                            # 更新 checkpoint
+                            self.checkpoint_manager.save_completed(module_name, result)
+
+                        elif result["status"] == "error":
+                            worker_completed[worker_id] += 1
+                            failed_modules.append(
+                                {
+                                    "name": module_name,
+                                    "error": result["error"],
+                                    "error_type": result["error_type"],
+                                }
+                            )
+                            tracker.add_error(
+                                module=module_name,
+                                error=result["error"],
+                                error_type=result["error_type"],
+                            )
+                            tracker.increment_total()
+
+                            # 更新 worker 进度条
+                            tracker.update_worker(
+                                worker_id,
+                                f"Error: {module_name}",
+                                worker_completed[worker_id],
+                                worker_total[worker_id]
+                            )
+
+                    except Exception as e:
                         worker_completed[worker_id] += 1
                         failed_modules.append(
                             {
                                 "name": module_name,
-                                "error": result["error"],
-                                "error_type": result["error_type"],
+                                "error": str(e),
+                                "error_type": type(e).__name__,
                             }
                         )
                         tracker.add_error(
                             module=module_name,
-                            error=result["error"],
-                            error_type=result["error_type"],
+                            error=str(e),
+                            error_type=type(e).__name__,
                         )
                         tracker.increment_total()
 
@@ -273,30 +344,9 @@ class ParallelAnalyzeStage:
                             worker_completed[worker_id],
                             worker_total[worker_id]
                         )
-
-                except Exception as e:
-                    worker_completed[worker_id] += 1
-                    failed_modules.append(
-                        {
-                            "name": module_name,
-                            "error": str(e),
-                            "error_type": type(e).__name__,
-                        }
-                    )
-                    tracker.add_error(
-                        module=module_name,
-                        error=str(e),
-                        error_type=type(e).__name__,
-                    )
-                    tracker.increment_total()
-
-                    # 更新 worker 进度条
-                    tracker.update_worker(
-                        worker_id,
-                        f"Error: {module_name}",
-                        worker_completed[worker_id],
-                        worker_total[worker_id]
-                    )
+        finally:
+            # 等待 checkpoint 日志写完
+            self.checkpoint_manager.close()
 
         # 停止进度条并获取统计
         stats = tracker.stop()
@@ -335,8 +385,7 @@ class ParallelAnalyzeStage:
         summary_file = self.stage_dir / "summary.json"
         if not summary_file.exists():
             return {}
-        with open(summary_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_loads(summary_file.read_bytes())
 
     def _save_summary(self, summary: Dict[str, Any]) -> None:
         """保存摘要"""
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 import json
 from datetime import datetime
+from ..utils.fast_json import json_loads
 
 
 class PipelineStage(ABC):
@@ -109,8 +110,7 @@ class PipelineStage(ABC):
         if not result_path.exists():
             return None
 
-        with open(result_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return json_loads(result_path.read_bytes())
 
     def load_previous_stage_result(self, stage_name: str, filename: str = "result.json") -> Optional[Dict[str, Any]]:
         """
@@ -129,8 +129,7 @@ class PipelineStage(ABC):
         if not result_path.exists():
             return None
 
-        with open(result_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return json_loads(result_path.read_bytes())
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} stage='{self.stage_name}' completed={self.is_completed()}>"
@@ -5,15 +5,23 @@ Pipeline 阶段 4: Build (构建索引)
 """
 
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, TYPE_CHECKING
 import json
 import os
 import pickle
-import networkx as nx
+import re
 from .base import PipelineStage
 from ..core.config import Config
 from ..core.global_index import GlobalIndex
 from ..core.optimized_index import OptimizedGlobalIndex
+from ..utils.auto_detect import find_uplugin
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+# 从目录名解析版本号 (如 UE_5.1)
+_DIR_VERSION_RE = re.compile(r'(\d+)[._](\d+)(?:[._](\d+))?')
 
 
 class BuildStage(PipelineStage):
@@ -275,7 +283,7 @@ class BuildStage(PipelineStage):
         print(f"  构建快速索引...")
 
         # 创建索引文件路径（确保使用 Path 对象）
-        global_index_path = Path(config.global_index_path)
+        global_index_path = config.storage_path('global_index')
         class_index_db = global_index_path / "class_index.db"
         function_index_db = global_index_path / "function_index.db"
 
@@ -283,7 +291,7 @@ class BuildStage(PipelineStage):
         func_idx = FunctionIndex(str(function_index_db))
 
         # 遍历所有模块图谱，收集类和函数信息
-        graphs_dir = Path(config.module_graphs_path)
+        graphs_dir = config.storage_path('module_graphs')
 
         if not graphs_dir.exists():
             print(f"    警告: 模块图谱目录不存在，跳过快速索引构建")
@@ -292,6 +300,10 @@ class BuildStage(PipelineStage):
         classes_batch = []
         functions_batch = []
 
+        # 所有模块的函数在一个事务中写入，最后统一提交；导入期间不维护函数表的二级索引
+        func_idx.prepare_bulk_load()
+        func_idx.begin_bulk()
+
         for graph_file in graphs_dir.glob("*.pkl"):
             module_name = graph_file.stem
 
@@ -360,7 +372,11 @@ class BuildStage(PipelineStage):
             func_idx.add_functions_batch(functions_batch)
 
         class_idx.commit()
-        func_idx.commit()
+        func_idx.end_bulk()
+        func_idx.finalize_bulk_load()
+
+        # 数据写入完成后再创建类索引的二级索引
+        class_idx.create_indexes()
 
         # 输出统计
         class_stats = class_idx.get_statistics()
@@ -454,7 +470,7 @@ class BuildStage(PipelineStage):
 
         return built_count
 
-    def _create_networkx_graph(self, code_graph: Dict[str, Any]) -> nx.DiGraph:
+    def _create_networkx_graph(self, code_graph: Dict[str, Any]) -> 'nx.DiGraph':
         """
         从代码图谱创建 NetworkX 图
 
@@ -464,6 +480,9 @@ class BuildStage(PipelineStage):
         Returns:
             NetworkX 有向图
         """
+        # networkx 导入较重，仅在实际构建图谱时加载
+        import networkx as nx
+
         graph = nx.DiGraph()
 
         # 添加类节点
@@ -629,10 +648,10 @@ class BuildStage(PipelineStage):
     def _detect_version(self) -> str:
         """检测引擎或插件版本"""
         # 首先尝试从 .uplugin 文件读取（插件模式）
-        uplugin_files = list(self.base_path.glob("*.uplugin"))
-        if uplugin_files:
+        uplugin_file = find_uplugin(self.base_path)
+        if uplugin_file is not None:
             try:
-                with open(uplugin_files[0], 'r', encoding='utf-8') as f:
+                with open(uplugin_file, 'r', encoding='utf-8') as f:
                     plugin_data = json.load(f)
                     version = plugin_data.get('VersionName', '') or str(plugin_data.get('Version', '1.0'))
                     if version:
@@ -655,8 +674,7 @@ class BuildStage(PipelineStage):
 
         # 从目录名推测
         dir_name = self.base_path.name
-        import re
-        match = re.search(r'(\d+)[._](\d+)(?:[._](\d+))?', dir_name)
+        match = _DIR_VERSION_RE.search(dir_name)
         if match:
             major = match.group(1)
             minor = match.group(2)
@@ -668,10 +686,10 @@ class BuildStage(PipelineStage):
     def _get_plugin_name(self) -> str:
         """获取插件名称（仅插件模式）"""
         # 检查是否有 .uplugin 文件
-        uplugin_files = list(self.base_path.glob("*.uplugin"))
-        if uplugin_files:
+        uplugin_file = find_uplugin(self.base_path)
+        if uplugin_file is not None:
             try:
-                with open(uplugin_files[0], 'r', encoding='utf-8') as f:
+                with open(uplugin_file, 'r', encoding='utf-8') as f:
                     plugin_data = json.load(f)
                     return plugin_data.get('Name', '')
             except Exception:
@@ -20,11 +20,18 @@ from ..utils.progress_tracker import ProgressTracker
 from rich.console import Console
 
 
-def _fix_multi_json_file(file_path: Path) -> None:
+def _fix_multi_json_file(file_path: Path, quiet: bool = False) -> bool:
     """
     检测并修复包含多个 JSON 对象的文件
 
     如果文件包含多个 JSON 对象串联（如 {}{}），只保留第一个
+
+    Args:
+        file_path: JSON 文件路径
+        quiet: 不直接打印警告（worker 线程中使用，由主线程统一输出，避免打乱进度条）
+
+    Returns:
+        是否进行了修复
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -60,12 +67,15 @@ def _fix_multi_json_file(file_path: Path) -> None:
 
         # 如果找到了多余的数据，截断文件
         if first_obj_end > 0 and first_obj_end < len(content.strip()):
-            print(f"警告: 文件 {file_path} 包含多个 JSON 对象，已修复")
+            if not quiet:
+                print(f"警告: 文件 {file_path} 包含多个 JSON 对象，已修复")
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(content[:first_obj_end])
+            return True
     except Exception:
         # 如果修复失败，忽略错误，让后续代码处理
         pass
+    return False
 
 
 class ParallelBuildStage:
@@ -131,6 +141,7 @@ class ParallelBuildStage:
 
         built_count = 0
         failed_modules = []
+        repaired_files = []
 
         # 跟踪每个 worker 的完成数量
         worker_completed = {i: 0 for i in range(self.num_workers)}
@@ -156,6 +167,9 @@ class ParallelBuildStage:
 
                 try:
                     result = future.result()
+                    if result.get("repaired_file"):
+                        repaired_files.append(result["repaired_file"])
+
                     if result["status"] == "success":
                         built_count += 1
                         worker_completed[worker_id] += 1
@@ -206,6 +220,10 @@ class ParallelBuildStage:
 
         stats = tracker.stop()
 
+        # worker 线程不直接输出，进度条结束后统一显示修复警告
+        for repaired_file in repaired_files:
+            console.print(f"警告: 文件 {repaired_file} 包含多个 JSON 对象，已修复")
+
         # 3. 串行构建全局索引和 SQLite
         console.print(f"\n[cyan]构建全局索引...[/cyan]")
         global_index = self._build_global_index(config)
@@ -234,10 +252,12 @@ class ParallelBuildStage:
         这个操作是线程安全的，因为每个模块独立处理
         """
         module_name, code_graph_file, graphs_dir = task
+        repaired_file = None
 
         try:
-            # 尝试修复可能有多个 JSON 对象的文件
-            _fix_multi_json_file(code_graph_file)
+            # 尝试修复可能有多个 JSON 对象的文件（警告交由主线程输出）
+            if _fix_multi_json_file(code_graph_file, quiet=True):
+                repaired_file = str(code_graph_file)
 
             with open(code_graph_file, "r", encoding="utf-8") as f:
                 code_graph = json.load(f)
@@ -265,13 +285,14 @@ class ParallelBuildStage:
                     f,
                 )
 
-            return {"status": "success", "module": module_name}
+            return {"status": "success", "module": module_name, "repaired_file": repaired_file}
 
         except Exception as e:
             return {
                 "status": "error",
                 "module": module_name,
                 "error": str(e),
+                "repaired_file": repaired_file,
             }
 
     def _create_networkx_graph(self, code_graph: Dict[str, Any]) -> nx.DiGraph:
@@ -509,7 +530,7 @@ class ParallelBuildStage:
         from ..core.function_index import FunctionIndex
 
         # 创建索引文件路径
-        global_index_path = Path(config.global_index_path)
+        global_index_path = config.storage_path('global_index')
         class_index_db = global_index_path / "class_index.db"
         function_index_db = global_index_path / "function_index.db"
 
@@ -517,7 +538,7 @@ class ParallelBuildStage:
         func_idx = FunctionIndex(str(function_index_db))
 
         # 遍历所有模块图谱，收集类和函数信息
-        graphs_dir = Path(config.module_graphs_path)
+        graphs_dir = config.storage_path('module_graphs')
 
         if not graphs_dir.exists():
             return
@@ -525,6 +546,10 @@ class ParallelBuildStage:
         classes_batch = []
         functions_batch = []
 
+        # 所有模块的函数在一个事务中写入，最后统一提交；导入期间不维护函数表的二级索引
+        func_idx.prepare_bulk_load()
+        func_idx.begin_bulk()
+
         for graph_file in graphs_dir.glob("*.pkl"):
             module_name = graph_file.stem
 
@@ -593,4 +618,8 @@ class ParallelBuildStage:
             func_idx.add_functions_batch(functions_batch)
 
         class_idx.commit()
-        func_idx.commit()
+        func_idx.end_bulk()
+        func_idx.finalize_bulk_load()
+
+        # 数据写入完成后再创建类索引的二级索引
+        class_idx.create_indexes()
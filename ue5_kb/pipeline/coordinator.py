@@ -7,7 +7,6 @@ Pipeline 协调器
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import os
-import json
 import re
 from .discover import DiscoverStage
 from .extract import ExtractStage
@@ -16,9 +15,16 @@ from .build import BuildStage
 from .generate import GenerateStage
 from .state import PipelineState
 from ..utils.stage_timer import StageTimer
+from ..utils.fast_json import json_loads
+from ..utils.auto_detect import find_uplugin
 from rich.console import Console
 
 
+# 从目录名解析版本号 (如 UE_5.1 / MyPlugin-1.2.3)
+_DIR_VERSION_RE = re.compile(r'(\d+)[._](\d+)(?:[._](\d+))?')
+_PLUGIN_DIR_VERSION_RE = re.compile(r'[-_](\d+)[._](\d+)(?:[._](\d+))?')
+
+
 class PipelineCoordinator:
     """
     Pipeline 协调器
@@ -282,18 +288,17 @@ class PipelineCoordinator:
         build_version = self.base_path / "Engine" / "Build" / "Build.version"
         if build_version.exists():
             try:
-                with open(build_version, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    major = data.get('MajorVersion', 5)
-                    minor = data.get('MinorVersion', 0)
-                    patch = data.get('PatchVersion', 0)
-                    return f"{major}.{minor}.{patch}"
+                data = json_loads(build_version.read_bytes())
+                major = data.get('MajorVersion', 5)
+                minor = data.get('MinorVersion', 0)
+                patch = data.get('PatchVersion', 0)
+                return f"{major}.{minor}.{patch}"
             except Exception:
                 pass
 
         # 从目录名提取
         dir_name = self.base_path.name
-        match = re.search(r'(\d+)[._](\d+)(?:[._](\d+))?', dir_name)
+        match = _DIR_VERSION_RE.search(dir_name)
         if match:
             major = match.group(1)
             minor = match.group(2)
@@ -304,25 +309,24 @@ class PipelineCoordinator:
 
     def _detect_plugin_version(self) -> str:
         """从 .uplugin 文件读取版本"""
-        uplugin_files = list(self.base_path.glob("*.uplugin"))
-        if uplugin_files:
+        uplugin_file = find_uplugin(self.base_path)
+        if uplugin_file is not None:
             try:
-                with open(uplugin_files[0], 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # 优先使用 VersionName
-                    version = data.get('VersionName', '')
-                    if version:
-                        return version
-                    # 其次使用 Version
-                    version = data.get('Version', '')
-                    if version:
-                        return str(version)
+                data = json_loads(uplugin_file.read_bytes())
+                # 优先使用 VersionName
+                version = data.get('VersionName', '')
+                if version:
+                    return version
+                # 其次使用 Version
+                version = data.get('Version', '')
+                if version:
+                    return str(version)
             except Exception:
                 pass
 
         # 从目录名推测
         dir_name = self.base_path.name
-        match = re.search(r'[-_](\d+)[._](\d+)(?:[._](\d+))?', dir_name)
+        match = _PLUGIN_DIR_VERSION_RE.search(dir_name)
         if match:
             major = match.group(1)
             minor = match.group(2)
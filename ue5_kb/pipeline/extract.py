@@ -9,6 +9,7 @@ from typing import Dict, Any, List, Optional
 from .base import PipelineStage
 from ..parsers.buildcs_parser import BuildCsParser
 from ..core.manifest import FileInfo, ModuleManifest, Hasher
+from .pathcache import get_path_cache
 from datetime import datetime
 import os
 import json
@@ -166,27 +167,45 @@ class ExtractStage(PipelineStage):
         """
         build_cs_path = Path(module_info['absolute_path'])
         source_dir = build_cs_path.parent
+        manifest_file = module_dir / "module_manifest.json"
+
+        # 上次的清单：大小与修改时间未变的文件直接复用已记录的哈希
+        prev_manifest = ModuleManifest.load(manifest_file)
+        prev_files = prev_manifest.files if prev_manifest else {}
 
         # 收集所有源文件
         source_files = []
         file_info_dict = {}
 
-        for ext in ['*.h', '*.cpp', '*.inl']:
-            for source_file in source_dir.rglob(ext):
-                rel_path = str(source_file.relative_to(self.base_path))
-                stat = source_file.stat()
-                file_hash = Hasher.compute_sha256(source_file)
-
-                file_info_dict[rel_path] = FileInfo(
-                    path=rel_path,
-                    sha256=file_hash,
-                    size=stat.st_size,
-                    mtime=stat.st_mtime
-                )
-                source_files.append(source_file)
+        path_cache = get_path_cache(self.data_dir)
+        for source_file in path_cache.source_files(source_dir, ('*.h', '*.cpp', '*.inl')):
+            rel_path = str(source_file.relative_to(self.base_path))
+            stat = source_file.stat()
+            file_hash = Hasher.compute_sha256_cached(source_file, prev_files.get(rel_path), stat)
+
+            file_info_dict[rel_path] = FileInfo(
+                path=rel_path,
+                sha256=file_hash,
+                size=stat.st_size,
+                mtime=stat.st_mtime
+            )
+            source_files.append(source_file)
+
+        build_cs_rel = str(build_cs_path.relative_to(self.base_path))
+        build_cs_stat = build_cs_path.stat()
+        build_cs_info = FileInfo(
+            path=build_cs_rel,
+            sha256=Hasher.compute_sha256_cached(
+                build_cs_path, prev_manifest.build_cs if prev_manifest else None, build_cs_stat
+            ),
+            size=build_cs_stat.st_size,
+            mtime=build_cs_stat.st_mtime
+        )
 
-        # 计算模块哈希
-        module_hash = Hasher.compute_module_hash(build_cs_path, source_files)
+        # 计算模块哈希（所有文件均未变化时复用上次的结果）
+        module_hash = Hasher.compute_module_hash(
+            build_cs_path, source_files, prev_manifest, self.base_path
+        )
 
         # 获取工具版本
         from ..core.config import Config
@@ -201,10 +220,10 @@ class ExtractStage(PipelineStage):
             files=file_info_dict,
             module_hash=module_hash,
             indexed_at=datetime.now().isoformat(),
-            parser_version=tool_version
+            parser_version=tool_version,
+            build_cs=build_cs_info
         )
 
         # 保存模块清单
-        manifest_file = module_dir / "module_manifest.json"
         with open(manifest_file, 'w', encoding='utf-8') as f:
             json.dump(manifest.to_dict(), f, indent=2, ensure_ascii=False)
@@ -5,9 +5,82 @@ Pipeline 阶段 5: Generate (生成 Skill)
 """
 
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import os
+import re
 import shutil
 from .base import PipelineStage
+from ..utils.fast_json import json_loads
+from ..utils.auto_detect import find_uplugin
+
+
+# 从目录名解析版本号 (如 UE_5.1 / MyPlugin-1.2.3)
+_DIR_VERSION_RE = re.compile(r'(\d+)[._](\d+)(?:[._](\d+))?')
+_PLUGIN_DIR_VERSION_RE = re.compile(r'[-_](\d+)[._](\d+)(?:[._](\d+))?')
+
+# 模板占位符 (如 {ENGINE_VERSION})
+_PLACEHOLDER_RE = re.compile(r'\{([A-Z_]+)\}')
+
+
+# 模板目录（仓库根目录下的 templates/）
+_TEMPLATES_DIR = Path(__file__).resolve().parent.parent.parent / "templates"
+
+# 模板内容缓存（模板名 -> 内容，文件不存在时为 None），同一进程内只读取一次
+_TEMPLATE_CACHE: Dict[str, Optional[str]] = {}
+
+
+def _load_template(name: str) -> Optional[str]:
+    """
+    读取模板内容（带缓存）
+
+    Args:
+        name: 模板文件名
+
+    Returns:
+        模板内容，模板不存在时返回 None
+    """
+    if name not in _TEMPLATE_CACHE:
+        template_path = _TEMPLATES_DIR / name
+        _TEMPLATE_CACHE[name] = (
+            template_path.read_text(encoding='utf-8') if template_path.is_file() else None
+        )
+    return _TEMPLATE_CACHE[name]
+
+
+def _write_text_file(path: Path, text: str) -> None:
+    """
+    一次性编码并写入文本文件（绕过 TextIOWrapper 分块编码）
+
+    Args:
+        path: 目标文件路径
+        text: 文件内容
+    """
+    data = memoryview(text.encode('utf-8'))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def _render_template(template: str, variables: Dict[str, str]) -> str:
+    """
+    单次扫描替换模板占位符
+
+    模板中含有字面量花括号，无法使用 str.format_map；未知占位符原样保留
+
+    Args:
+        template: 模板内容
+        variables: 占位符名 -> 替换值
+
+    Returns:
+        替换后的内容
+    """
+    return _PLACEHOLDER_RE.sub(
+        lambda m: variables.get(m.group(1), m.group(0)), template
+    )
 
 
 class GenerateStage(PipelineStage):
@@ -104,18 +177,15 @@ class GenerateStage(PipelineStage):
         build_version_file = self.base_path / "Engine" / "Build" / "Build.version"
 
         if build_version_file.exists():
-            import json
-            with open(build_version_file, 'r', encoding='utf-8') as f:
-                version_data = json.load(f)
-                major = version_data.get('MajorVersion', 5)
-                minor = version_data.get('MinorVersion', 0)
-                patch = version_data.get('PatchVersion', 0)
-                return f"{major}.{minor}.{patch}"
+            version_data = json_loads(build_version_file.read_bytes())
+            major = version_data.get('MajorVersion', 5)
+            minor = version_data.get('MinorVersion', 0)
+            patch = version_data.get('PatchVersion', 0)
+            return f"{major}.{minor}.{patch}"
 
         # 从目录名推测
         dir_name = self.base_path.name
-        import re
-        match = re.search(r'(\d+)[._](\d+)(?:[._](\d+))?', dir_name)
+        match = _DIR_VERSION_RE.search(dir_name)
         if match:
             major = match.group(1)
             minor = match.group(2)
@@ -127,27 +197,24 @@ class GenerateStage(PipelineStage):
     def _detect_plugin_version(self) -> str:
         """检测插件版本（仅插件模式使用）"""
         # 从 .uplugin 文件读取插件版本
-        uplugin_files = list(self.base_path.glob("*.uplugin"))
-        if uplugin_files:
-            import json
+        uplugin_file = find_uplugin(self.base_path)
+        if uplugin_file is not None:
             try:
-                with open(uplugin_files[0], 'r', encoding='utf-8') as f:
-                    plugin_data = json.load(f)
-                    # 优先使用 VersionName
-                    version = plugin_data.get('VersionName', '')
-                    if version:
-                        return version
-                    # 其次使用 Version
-                    version = plugin_data.get('Version', '')
-                    if version:
-                        return str(version)
+                plugin_data = json_loads(uplugin_file.read_bytes())
+                # 优先使用 VersionName
+                version = plugin_data.get('VersionName', '')
+                if version:
+                    return version
+                # 其次使用 Version
+                version = plugin_data.get('Version', '')
+                if version:
+                    return str(version)
             except Exception:
                 pass
 
         # 从目录名推测
         dir_name = self.base_path.name
-        import re
-        match = re.search(r'[-_](\d+)[._](\d+)(?:[._](\d+))?', dir_name)
+        match = _PLUGIN_DIR_VERSION_RE.search(dir_name)
         if match:
             major = match.group(1)
             minor = match.group(2)
@@ -175,23 +242,16 @@ class GenerateStage(PipelineStage):
         # 创建 Skill 目录
         skill_path.mkdir(parents=True, exist_ok=True)
 
-        # 获取模板目录
-        template_dir = Path(__file__).parent.parent.parent / "templates"
-
         # 根据模式选择模板
         if self.is_plugin:
-            skill_md_template = template_dir / "skill.plugin.md.template"
-            impl_py_template = template_dir / "impl.plugin.py.template"
             # 如果插件模板不存在，回退到引擎模板
-            if not skill_md_template.exists():
-                skill_md_template = template_dir / "skill.md.template"
-            if not impl_py_template.exists():
-                impl_py_template = template_dir / "impl.py.template"
+            skill_md_template = _load_template("skill.plugin.md.template") or _load_template("skill.md.template")
+            impl_py_template = _load_template("impl.plugin.py.template") or _load_template("impl.py.template")
         else:
-            skill_md_template = template_dir / "skill.md.template"
-            impl_py_template = template_dir / "impl.py.template"
+            skill_md_template = _load_template("skill.md.template")
+            impl_py_template = _load_template("impl.py.template")
 
-        if not skill_md_template.exists() or not impl_py_template.exists():
+        if skill_md_template is None or impl_py_template is None:
             raise FileNotFoundError("模板文件不存在")
 
         # 从 manifest 加载版本信息
@@ -236,26 +296,16 @@ class GenerateStage(PipelineStage):
         }
 
         # 生成 skill.md
-        with open(skill_md_template, 'r', encoding='utf-8') as f:
-            skill_md_content = f.read()
-
-        for key, value in variables.items():
-            skill_md_content = skill_md_content.replace(f'{{{key}}}', value)
+        skill_md_content = _render_template(skill_md_template, variables)
 
-        with open(skill_path / "skill.md", 'w', encoding='utf-8') as f:
-            f.write(skill_md_content)
+        _write_text_file(skill_path / "skill.md", skill_md_content)
 
         # 生成 impl.py
-        with open(impl_py_template, 'r', encoding='utf-8') as f:
-            impl_py_content = f.read()
-
-        for key, value in variables.items():
-            impl_py_content = impl_py_content.replace(f'{{{key}}}', value)
+        impl_py_content = _render_template(impl_py_template, variables)
 
         # 修复：将模板中的 {{ 和 }} 转换为单花括号（Python 字典语法）
         impl_py_content = impl_py_content.replace('{{', '{').replace('}}', '}')
 
-        with open(skill_path / "impl.py", 'w', encoding='utf-8') as f:
-            f.write(impl_py_content)
+        _write_text_file(skill_path / "impl.py", impl_py_content)
 
         print(f"  生成 skill.md 和 impl.py")
@@ -0,0 +1,163 @@
+"""
+模块源文件路径缓存
+
+extract（模块清单）、analyze（解析）、update（变更检测）都会递归遍历同一模块目录查找源文件。
+PathCache 把遍历结果连同目录树中每个目录的 mtime 存入 SQLite：再次查询时只需逐个 stat 目录，
+任一目录的 mtime 变化（增删文件或子目录）即视为失效并重新遍历。
+
+数据库文件位于 KnowledgeBase/data 下，可被多个 worker 进程共享（WAL 模式）。
+"""
+
+import os
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from ..utils.fast_json import json_dumps, json_loads
+
+
+# 缓存数据库文件名（位于 KnowledgeBase/data 下）
+PATH_CACHE_FILE = ".path_cache.db"
+
+
+def _snapshot_dirs(root: Path) -> List[Tuple[str, int]]:
+    """
+    记录目录树中每个目录的 mtime
+
+    与 rglob 一致不进入目录符号链接（避免指向上级目录的链接造成无限递归）；无法读取的目录直接跳过
+
+    Args:
+        root: 根目录
+
+    Returns:
+        (目录路径, mtime_ns) 列表
+    """
+    snapshot = []
+    stack = [str(root)]
+
+    while stack:
+        path = stack.pop()
+        try:
+            snapshot.append((path, os.stat(path).st_mtime_ns))
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+
+    return snapshot
+
+
+def _dirs_unchanged(snapshot: List[Tuple[str, int]]) -> bool:
+    """检查快照中的目录是否都存在且 mtime 未变化"""
+    try:
+        return all(os.stat(path).st_mtime_ns == mtime for path, mtime in snapshot)
+    except OSError:
+        return False
+
+
+class PathCache:
+    """
+    模块源文件路径缓存
+
+    示例：
+        cache = get_path_cache(data_dir)
+        source_files = cache.source_files(module_dir, ('*.h', '*.cpp'))
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        打开（必要时创建）缓存数据库
+
+        数据库不可用（只读目录等）时退化为每次直接遍历
+
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.conn: Optional[sqlite3.Connection] = None
+
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS paths (
+                    key TEXT PRIMARY KEY,
+                    files BLOB NOT NULL,
+                    dirs BLOB NOT NULL
+                )
+            """)
+            conn.commit()
+            self.conn = conn
+        except (OSError, sqlite3.Error):
+            self.conn = None
+
+    def source_files(self, module_dir: Path, patterns: Sequence[str]) -> List[Path]:
+        """
+        查找模块目录下匹配的源文件
+
+        返回顺序与依次对每个 pattern 调用 rglob 相同
+
+        Args:
+            module_dir: 模块目录
+            patterns: glob 模式，如 ('*.h', '*.cpp')
+
+        Returns:
+            源文件路径列表
+        """
+        module_dir = Path(module_dir)
+        key = f"{','.join(patterns)}|{module_dir}"
+
+        if self.conn is not None:
+            try:
+                row = self.conn.execute(
+                    "SELECT files, dirs FROM paths WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+
+            if row is not None and _dirs_unchanged(json_loads(row[1])):
+                return [Path(p) for p in json_loads(row[0])]
+
+        # 先记录目录快照再遍历：遍历期间发生的变更会让快照过期，下次查询重新遍历
+        snapshot = _snapshot_dirs(module_dir) if self.conn is not None else None
+
+        files = []
+        for pattern in patterns:
+            files.extend(module_dir.rglob(pattern))
+
+        # 模块目录不存在时不写入（空快照无法检测之后的创建）
+        if snapshot:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO paths (key, files, dirs) VALUES (?, ?, ?)",
+                        (key, json_dumps([str(f) for f in files]), json_dumps(snapshot)),
+                    )
+            except sqlite3.Error:
+                pass
+
+        return files
+
+
+@lru_cache(maxsize=4)
+def _open_path_cache(db_path: str, pid: int) -> PathCache:
+    """按 (路径, 进程号) 缓存 PathCache，fork 出的子进程不会复用父进程的连接"""
+    return PathCache(Path(db_path))
+
+
+def get_path_cache(data_dir: Path) -> PathCache:
+    """
+    获取 data 目录对应的路径缓存（同一进程内共享一个连接）
+
+    Args:
+        data_dir: KnowledgeBase/data 目录
+
+    Returns:
+        PathCache 实例
+    """
+    return _open_path_cache(str(Path(data_dir) / PATH_CACHE_FILE), os.getpid())
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 import json
 from datetime import datetime
+from ..utils.fast_json import json_loads
 
 
 class PipelineState:
@@ -35,8 +36,7 @@ class PipelineState:
             return self._create_initial_state()
 
         try:
-            with open(self.state_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return json_loads(self.state_file.read_bytes())
         except Exception as e:
             print(f"警告: 加载状态文件失败: {e}，创建新状态")
             return self._create_initial_state()
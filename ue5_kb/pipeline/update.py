@@ -4,15 +4,51 @@
 检测文件变更并仅更新修改的模块
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .base import PipelineStage
-from ..core.manifest import KBManifest, Hasher
+from ..core.manifest import KBManifest, ModuleManifest, Hasher
+from .pathcache import get_path_cache
+
+
+# 每个 worker 一次领取的模块数（减少进程间往返）
+_HASH_CHUNKSIZE = 64
+
+
+def _hash_module(task: Tuple[Path, List[Path], Path, Path]) -> str:
+    """
+    计算单个模块哈希（在 worker 进程中执行，需为模块级函数以便 pickle）
+
+    extract 阶段的模块清单记录了各文件的大小与修改时间，全部未变化时
+    直接返回清单中的模块哈希，只需 stat 而不读取文件内容
+
+    Args:
+        task: (Build.cs 路径, 源文件列表, 模块清单路径, 根目录)
+
+    Returns:
+        模块哈希
+    """
+    build_cs_path, source_files, manifest_file, base_path = task
+    prev_manifest = ModuleManifest.load(manifest_file)
+    return Hasher.compute_module_hash(build_cs_path, source_files, prev_manifest, base_path)
 
 
 class UpdateStage(PipelineStage):
     """增量更新阶段"""
 
+    def __init__(self, base_path: Path, workers: int = 0):
+        """
+        初始化更新阶段
+
+        Args:
+            base_path: 引擎/插件根目录
+            workers: 计算模块哈希的进程数（0=自动检测 CPU 核心数）
+        """
+        super().__init__(base_path)
+        self.workers = workers
+
     @property
     def stage_name(self) -> str:
         return "update"
@@ -35,8 +71,13 @@ class UpdateStage(PipelineStage):
         """
         return self.get_output_path().exists()
 
-    def run(self, **kwargs) -> Dict[str, Any]:
-        """执行增量更新"""
+    def run(self, workers: Optional[int] = None, **kwargs) -> Dict[str, Any]:
+        """
+        执行增量更新
+
+        Args:
+            workers: 计算模块哈希的进程数（None=使用构造时的设置）
+        """
         kb_path = self.base_path / "KnowledgeBase"
         old_manifest = KBManifest.load(kb_path)
 
@@ -48,7 +89,7 @@ class UpdateStage(PipelineStage):
             }
 
         # 扫描当前状态
-        current_modules = self._scan_current_modules()
+        current_modules = self._scan_current_modules(workers)
 
         # 计算差异
         diff = self._compute_diff(old_manifest, current_modules)
@@ -98,8 +139,13 @@ class UpdateStage(PipelineStage):
             'results': results
         }
 
-    def check(self) -> Dict[str, Any]:
-        """仅检查变更，不执行更新"""
+    def check(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        仅检查变更，不执行更新
+
+        Args:
+            workers: 计算模块哈希的进程数（None=使用构造时的设置）
+        """
         kb_path = self.base_path / "KnowledgeBase"
         old_manifest = KBManifest.load(kb_path)
 
@@ -110,7 +156,7 @@ class UpdateStage(PipelineStage):
                 'reason': 'Knowledge base manifest not found.'
             }
 
-        current_modules = self._scan_current_modules()
+        current_modules = self._scan_current_modules(workers)
         diff = self._compute_diff(old_manifest, current_modules)
 
         return {
@@ -124,22 +170,37 @@ class UpdateStage(PipelineStage):
             'removed_modules': diff['removed'][:10]
         }
 
-    def _scan_current_modules(self) -> List[Dict[str, Any]]:
-        """扫描当前模块状态"""
+    def _scan_current_modules(self, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        扫描当前模块状态
+
+        Args:
+            workers: 计算模块哈希的进程数（None=使用构造时的设置）
+        """
         # 集成 DiscoverStage 逻辑
         from .discover import DiscoverStage
 
         discover = DiscoverStage(self.base_path)
         discover_result = discover.run()
+        modules = discover_result.get('modules', [])
+
+        # 源文件列表在主进程中查找（命中路径缓存），哈希计算分发到多进程
+        tasks = [self._module_hash_task(module) for module in modules]
+
+        if workers is None:
+            workers = self.workers
+        max_workers = min(len(tasks), workers or os.cpu_count() or 1)
 
-        # 为每个模块计算哈希
-        modules_with_hashes = []
-        for module in discover_result.get('modules', []):
-            module_hash = self._compute_module_hash(module)
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                hashes = list(executor.map(_hash_module, tasks, chunksize=_HASH_CHUNKSIZE))
+        else:
+            hashes = [_hash_module(task) for task in tasks]
+
+        for module, module_hash in zip(modules, hashes):
             module['module_hash'] = module_hash
-            modules_with_hashes.append(module)
 
-        return modules_with_hashes
+        return modules
 
     def _compute_diff(
         self,
@@ -174,17 +235,26 @@ class UpdateStage(PipelineStage):
             'unchanged': sorted(unchanged)
         }
 
-    def _compute_module_hash(self, module_info: Dict[str, Any]) -> str:
-        """计算单个模块的哈希"""
+    def _module_hash_task(self, module_info: Dict[str, Any]) -> Tuple[Path, List[Path], Path, Path]:
+        """
+        收集计算模块哈希所需的文件
+
+        Args:
+            module_info: discover 阶段输出的模块信息
+
+        Returns:
+            (Build.cs 路径, 源文件列表, 模块清单路径, 根目录)
+        """
         build_cs_path = Path(module_info['absolute_path'])
         module_dir = build_cs_path.parent
 
-        # 查找所有源文件
-        source_files = []
-        for ext in ['*.h', '*.cpp', '*.inl']:
-            source_files.extend(module_dir.rglob(ext))
+        # 查找所有源文件（目录未变化时直接命中路径缓存）
+        source_files = get_path_cache(self.data_dir).source_files(
+            module_dir, ('*.h', '*.cpp', '*.inl')
+        )
 
-        return Hasher.compute_module_hash(build_cs_path, source_files)
+        manifest_file = self.data_dir / "extract" / module_info['name'] / "module_manifest.json"
+        return build_cs_path, source_files, manifest_file, self.base_path
 
     def _update_changed_modules(self, diff: Dict[str, List[str]]) -> Dict[str, Any]:
         """对变更的模块运行 pipeline"""
@@ -1,20 +1,37 @@
 """
 UE5 Knowledge Base Maker - Utils 模块
 
-提供进度跟踪、计时、checkpoint 管理等工具
+提供进度跟踪、计时、checkpoint 管理、JSON 序列化等工具
+
+子模块按需导入（PEP 562）：progress_tracker 依赖 rich，
+只使用 fast_json 等轻量工具时无需加载 rich。
 """
 
-from .progress_tracker import ProgressTracker
-from .stage_timer import StageTimer, StageMetrics
-from .checkpoint_manager import CheckpointManager
-from .auto_detect import detect_from_cwd, DetectionInfo, DetectionResult
-
-__all__ = [
-    'ProgressTracker',
-    'StageTimer',
-    'StageMetrics',
-    'CheckpointManager',
-    'detect_from_cwd',
-    'DetectionInfo',
-    'DetectionResult',
-]
+from importlib import import_module
+
+# 导出名称 -> 所在子模块
+_EXPORTS = {
+    'ProgressTracker': '.progress_tracker',
+    'StageTimer': '.stage_timer',
+    'StageMetrics': '.stage_timer',
+    'CheckpointManager': '.checkpoint_manager',
+    'detect_from_cwd': '.auto_detect',
+    'DetectionInfo': '.auto_detect',
+    'DetectionResult': '.auto_detect',
+    'find_uplugin': '.auto_detect',
+    'json_dumps': '.fast_json',
+    'json_loads': '.fast_json',
+    'HAS_ORJSON': '.fast_json',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
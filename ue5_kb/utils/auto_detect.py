@@ -8,10 +8,12 @@ Determines whether the current working directory is:
 - None of the above (requires manual specification)
 """
 
+import os
 from pathlib import Path
 from typing import Optional, Literal
 from dataclasses import dataclass
-import json
+
+from .fast_json import json_loads
 
 DetectionResult = Literal['plugin', 'engine', 'engine_subdir', 'unknown']
 
@@ -44,8 +46,7 @@ def _read_engine_version(build_version_file: Path) -> str:
         Version string like "5.1.1" or "unknown" if failed to read
     """
     try:
-        content = build_version_file.read_text()
-        version_data = json.loads(content)
+        version_data = json_loads(build_version_file.read_bytes())
         major = version_data.get("MajorVersion")
         minor = version_data.get("MinorVersion")
         patch = version_data.get("PatchVersion")
@@ -61,6 +62,27 @@ def _read_engine_version(build_version_file: Path) -> str:
     return "unknown"
 
 
+def find_uplugin(path: Path) -> Optional[Path]:
+    """在目录中查找 .uplugin 文件（找到第一个即返回）
+
+    使用 os.scandir 直接读取目录项，不为每个条目构造 Path，也无需逐个 stat
+
+    Args:
+        path: 插件根目录
+
+    Returns:
+        .uplugin 文件路径，不存在或目录不可读时返回 None
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.endswith('.uplugin') and entry.is_file():
+                    return Path(entry.path)
+    except OSError:
+        pass
+    return None
+
+
 def _is_engine_subdirectory(path: Path) -> bool:
     """检查给定路径是否是引擎的子目录
 
@@ -141,8 +163,7 @@ def _is_valid_plugin_directory(path: Path) -> bool:
         True 如果是有效的插件目录
     """
     # 检查是否有 .uplugin 文件
-    uplugin_files = list(path.glob('*.uplugin'))
-    if not uplugin_files:
+    if find_uplugin(path) is None:
         return False
 
     # 检查是否在引擎子目录下（如果是，则不是独立的插件）
@@ -189,14 +210,13 @@ def detect_from_cwd(cwd: Optional[Path] = None) -> DetectionInfo:
 
     # 2. 检测独立插件（必须验证不是引擎子目录）
     if _is_valid_plugin_directory(cwd):
-        uplugin_files = list(cwd.glob('*.uplugin'))
-        plugin_name = uplugin_files[0].stem
+        uplugin_file = find_uplugin(cwd)
+        plugin_name = uplugin_file.stem
 
         # 尝试读取插件版本
         plugin_version = "unknown"
         try:
-            content = uplugin_files[0].read_text(encoding='utf-8')
-            plugin_data = json.loads(content)
+            plugin_data = json_loads(uplugin_file.read_bytes())
             plugin_version = plugin_data.get("VersionName") or plugin_data.get("Version", "unknown")
         except Exception:
             pass
@@ -205,7 +225,7 @@ def detect_from_cwd(cwd: Optional[Path] = None) -> DetectionInfo:
             mode='plugin',
             detected_path=cwd,
             confidence='high',
-            reason=f'在当前目录找到插件文件: {uplugin_files[0].name}（独立插件）',
+            reason=f'在当前目录找到插件文件: {uplugin_file.name}（独立插件）',
             suggested_name=f"{plugin_name} v{plugin_version}" if plugin_version != "unknown" else plugin_name
         )
 
@@ -2,13 +2,29 @@
 Checkpoint 管理器
 
 支持保存已完成任务的 checkpoint，支持从 checkpoint 恢复
+
+每个任务完成后向 JSONL 日志追加一行，而不是重写整个 checkpoint 文件，
+中断时最多丢失正在处理的任务，且每次写入只有一行的开销
+
+日志由后台线程写入：调用方只负责入队，fsync 按条数/时间间隔批量执行，
+磁盘延迟（机械盘、网络盘）不再阻塞结果收集循环
 """
 
 from typing import Dict, List, Optional, Any
 from pathlib import Path
-import json
+import os
+import queue
+import threading
+import time
 from datetime import datetime
 
+from .fast_json import json_dumps, json_loads
+
+
+# 累计多少条记录或距上次 fsync 多久（秒）后执行一次 fsync
+_FSYNC_BATCH = 32
+_FSYNC_INTERVAL = 0.5
+
 
 class CheckpointManager:
     """
@@ -24,6 +40,7 @@ class CheckpointManager:
         completed = manager.get_completed_tasks()
         # ... 跳过已完成的任务 ...
         manager.save_completed("Module1", {"classes": 10, "functions": 50})
+        manager.close()  # 等待后台线程写完并 fsync
     """
 
     def __init__(self, stage_dir: Path, stage_name: str):
@@ -36,58 +53,204 @@ class CheckpointManager:
         """
         self.stage_dir = Path(stage_dir)
         self.stage_name = stage_name
+        # 旧版整文件 checkpoint（只读，兼容升级前的中断现场）
         self.checkpoint_file = self.stage_dir / f".{stage_name}_checkpoint"
+        # 追加写入的任务日志，每行一条任务记录
+        self.journal_file = self.stage_dir / f".{stage_name}_checkpoint.jsonl"
+        # 后台写入线程（首次写入时启动）
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        # 后台线程写入失败时记录的异常，在下一次 _append/flush/close 时抛出
+        self._writer_error: Optional[BaseException] = None
 
     def load(self) -> Dict[str, Any]:
         """
-        加载 checkpoint
+        加载 checkpoint（旧版 checkpoint 文件 + 按顺序回放任务日志）
 
         Returns:
             Checkpoint 数据字典
         """
-        if not self.checkpoint_file.exists():
-            return {
-                "completed": [],
-                "failed": [],
-                "created_at": None,
-                "updated_at": None,
-            }
+        self.flush()
+        checkpoint = self._load_legacy()
 
-        try:
-            with open(self.checkpoint_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {
-                "completed": [],
-                "failed": [],
-                "created_at": None,
-                "updated_at": None,
-            }
+        for record in self._read_journal():
+            self._apply_record(checkpoint, record)
 
-    def save_completed(self, task_id: str, result: Dict[str, Any]) -> None:
+        return checkpoint
+
+    def _load_legacy(self) -> Dict[str, Any]:
+        """加载旧版整文件 checkpoint"""
+        if self.checkpoint_file.exists():
+            try:
+                return json_loads(self.checkpoint_file.read_bytes())
+            except Exception:
+                pass
+
+        return {
+            "completed": [],
+            "failed": [],
+            "created_at": None,
+            "updated_at": None,
+        }
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
         """
-        保存已完成的任务
+        读取任务日志
 
-        Args:
-            task_id: 任务 ID（通常是模块名）
-            result: 任务结果摘要
+        中断时最后一行可能只写了一半，无法解析的行直接跳过
+
+        Returns:
+            任务记录列表（按写入顺序）
         """
-        checkpoint = self.load()
+        try:
+            with open(self.journal_file, "rb") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                records.append(json_loads(line))
+            except ValueError:
+                continue
+        return records
+
+    @staticmethod
+    def _apply_record(checkpoint: Dict[str, Any], record: Dict[str, Any]) -> None:
+        """将一条任务记录合并到 checkpoint 数据中"""
+        task_id = record["task_id"]
+        timestamp = record.get("completed_at") or record.get("failed_at")
 
         if checkpoint["created_at"] is None:
-            checkpoint["created_at"] = datetime.now().isoformat()
-
-        checkpoint["updated_at"] = datetime.now().isoformat()
+            checkpoint["created_at"] = timestamp
+        checkpoint["updated_at"] = timestamp
 
         # 避免重复
-        if task_id not in checkpoint["completed"]:
-            checkpoint["completed"].append(task_id)
+        task_list = checkpoint["completed"] if record["status"] == "success" else checkpoint["failed"]
+        if task_id not in task_list:
+            task_list.append(task_id)
+
+        checkpoint.setdefault("results", {})[task_id] = {
+            key: value for key, value in record.items() if key != "task_id"
+        }
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """将一条记录交给后台线程追加到任务日志"""
+        self._raise_writer_error()
+        if self._writer is None:
+            self._start_writer()
+
+        self._queue.put(json_dumps(record) + b"\n")
+
+    def _start_writer(self) -> None:
+        """打开任务日志并启动后台写入线程（打开失败时直接在调用方抛出）"""
+        self.stage_dir.mkdir(parents=True, exist_ok=True)
+        f = open(self.journal_file, "ab")
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._run_writer,
+            args=(f, self._queue),
+            name=f"{self.stage_name}-checkpoint-writer",
+            daemon=True,
+        )
+        self._writer.start()
+
+    def _run_writer(self, f, q: queue.Queue) -> None:
+        """后台线程入口：写入失败时保存异常，由调用方线程重新抛出"""
+        try:
+            self._write_loop(f, q)
+        except BaseException as e:
+            self._writer_error = e
+
+    def _raise_writer_error(self) -> None:
+        """后台线程写入失败时在调用方线程抛出该异常（只抛出一次）"""
+        error = self._writer_error
+        if error is not None:
+            self._writer_error = None
+            raise error
+
+    @staticmethod
+    def _write_loop(f, q: queue.Queue) -> None:
+        """
+        后台写入循环
 
-        # 保存任务结果摘要
-        if "results" not in checkpoint:
-            checkpoint["results"] = {}
+        每条记录写入后立即 flush 到操作系统（进程中断不丢数据），
+        fsync 按批执行；收到 Event 时强制 fsync 并通知等待方，收到 None 时退出
+
+        Args:
+            f: 以追加模式打开的任务日志
+            q: 记录队列
+        """
+        unsynced = 0
+        last_sync = time.monotonic()
+
+        with f:
+            while True:
+                try:
+                    item = q.get(timeout=_FSYNC_INTERVAL)
+                except queue.Empty:
+                    item = b""
+
+                if isinstance(item, bytes):
+                    if item:
+                        f.write(item)
+                        f.flush()
+                        unsynced += 1
+                    if not unsynced or (
+                        unsynced < _FSYNC_BATCH
+                        and time.monotonic() - last_sync < _FSYNC_INTERVAL
+                    ):
+                        continue
+
+                if unsynced:
+                    os.fsync(f.fileno())
+                    unsynced = 0
+                last_sync = time.monotonic()
+
+                if item is None:
+                    return
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def flush(self) -> None:
+        """等待已入队的记录全部写入并 fsync"""
+        if self._writer is None:
+            return
+
+        done = threading.Event()
+        self._queue.put(done)
+        # 写入线程异常退出时不再等待
+        while not done.wait(0.1):
+            if not self._writer.is_alive():
+                break
+
+        self._raise_writer_error()
+
+    def close(self) -> None:
+        """写完剩余记录并停止后台线程"""
+        if self._writer is None:
+            return
+
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        self._queue = None
+        self._raise_writer_error()
+
+    def save_completed(self, task_id: str, result: Dict[str, Any]) -> None:
+        """
+        保存已完成的任务
 
-        checkpoint["results"][task_id] = {
+        Args:
+            task_id: 任务 ID（通常是模块名）
+            result: 任务结果摘要
+        """
+        self._append({
+            "task_id": task_id,
             "status": "success",
             "completed_at": datetime.now().isoformat(),
             "summary": {
@@ -95,9 +258,7 @@ class CheckpointManager:
                 "functions": result.get("functions_count", 0),
                 "files": result.get("files_count", 0),
             },
-        }
-
-        self._save(checkpoint)
+        })
 
     def save_failed(self, task_id: str, error: str, error_type: str) -> None:
         """
@@ -108,34 +269,13 @@ class CheckpointManager:
             error: 错误信息
             error_type: 错误类型
         """
-        checkpoint = self.load()
-
-        if checkpoint["created_at"] is None:
-            checkpoint["created_at"] = datetime.now().isoformat()
-
-        checkpoint["updated_at"] = datetime.now().isoformat()
-
-        if task_id not in checkpoint["failed"]:
-            checkpoint["failed"].append(task_id)
-
-        if "results" not in checkpoint:
-            checkpoint["results"] = {}
-
-        checkpoint["results"][task_id] = {
+        self._append({
+            "task_id": task_id,
             "status": "failed",
             "failed_at": datetime.now().isoformat(),
             "error": error,
             "error_type": error_type,
-        }
-
-        self._save(checkpoint)
-
-    def _save(self, checkpoint: Dict[str, Any]) -> None:
-        """保存 checkpoint 到文件"""
-        self.stage_dir.mkdir(parents=True, exist_ok=True)
-
-        with open(self.checkpoint_file, "w", encoding="utf-8") as f:
-            json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+        })
 
     def get_completed_tasks(self) -> set:
         """
@@ -169,5 +309,7 @@ class CheckpointManager:
 
     def clear(self) -> None:
         """清除 checkpoint"""
-        if self.checkpoint_file.exists():
-            self.checkpoint_file.unlink()
+        self.close()
+        for checkpoint_file in (self.checkpoint_file, self.journal_file):
+            if checkpoint_file.exists():
+                checkpoint_file.unlink()
@@ -0,0 +1,57 @@
+"""
+JSON 序列化工具
+
+优先使用 orjson（C/Rust 实现，原生处理非 ASCII），未安装时回退到标准库 json
+"""
+
+import codecs
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    序列化为 UTF-8 字节串
+
+    Args:
+        obj: 待序列化对象
+        indent: 是否使用 2 空格缩进（便于人工查看）
+
+    Returns:
+        UTF-8 编码的 JSON 字节串
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    反序列化 JSON（接受 bytes 或 str，bytes 可跳过一次解码）
+
+    Windows 下生成的 .uplugin 等文件可能带 UTF-8 BOM，orjson 不接受 BOM，需先去除
+
+    Args:
+        data: JSON 数据
+
+    Returns:
+        解析后的对象
+    """
+    if HAS_ORJSON:
+        if isinstance(data, bytes) and data.startswith(codecs.BOM_UTF8):
+            data = data[len(codecs.BOM_UTF8):]
+        return orjson.loads(data)
+    return json.loads(data)